@@ -0,0 +1,146 @@
+"""
+Benchmark the forecasting engine (no Streamlit required).
+
+Covers exponential_smoothing_forecast, pytorch_forecast, batch_forecast and
+project_to_current_year across series lengths, country counts and horizons,
+using the bundled data/processed files. Reports latency percentiles,
+throughput (series/sec) and peak RSS, and compares against the stored
+baseline in benchmarks/baselines/forecast.json.
+
+Usage:
+    python benchmarks/bench_forecast.py                  # full grid
+    python benchmarks/bench_forecast.py --quick          # smaller grid
+    python benchmarks/bench_forecast.py --check          # fail on regressions
+    python benchmarks/bench_forecast.py --save-baseline  # update the baseline
+"""
+
+import argparse
+import os
+import platform
+import sys
+
+from bench_utils import (REPO_ROOT, add_common_arguments, finish, peak_rss_mb,
+                         run_isolated, summarize, time_calls)
+
+import pandas as pd
+
+from utils.forecast_engine import EpidemicForecaster
+
+DATA_PATH = os.path.join(REPO_ROOT, 'data', 'processed', 'unified_epidemic_data.csv')
+BENCH_DISEASE = 'COVID-19'
+BENCH_METRIC = 'new_cases'
+
+def load_data():
+    """Load the bundled unified dataset"""
+    data = pd.read_csv(DATA_PATH)
+    data['date'] = pd.to_datetime(data['date'])
+    return data
+
+def longest_series(data, forecaster):
+    """Time series of the country with the most history (benchmark input for single-series cases)"""
+    disease_data = data[data['disease'] == BENCH_DISEASE]
+    country = disease_data['country'].value_counts().idxmax()
+    return forecaster.prepare_country_data(data, BENCH_DISEASE, country, BENCH_METRIC)
+
+def bench_countries(data, count):
+    """First `count` countries (alphabetically) with enough data to forecast"""
+    disease_data = data[data['disease'] == BENCH_DISEASE]
+    counts = disease_data['country'].value_counts()
+    eligible = sorted(counts[counts >= EpidemicForecaster().min_data_points].index)
+    return eligible[:count]
+
+def run_case(case):
+    """Run one benchmark case and return its metrics (executed in a child process by default)"""
+    data = load_data()
+    # Time real training: a cached model would turn every call after warmup into a lookup
+    forecaster = EpidemicForecaster(use_model_cache=False)
+    forecaster.forecast_days = case['horizon']
+    kind = case['kind']
+    repeats = case['repeats']
+
+    if kind in ('exponential_smoothing_forecast', 'pytorch_forecast'):
+        ts_data = longest_series(data, forecaster).tail(case['length']).reset_index(drop=True)
+
+        if kind == 'exponential_smoothing_forecast':
+            samples = time_calls(lambda: forecaster.exponential_smoothing_forecast(ts_data), repeats)
+        else:
+            samples = time_calls(lambda: forecaster.pytorch_forecast(ts_data, epochs=case['epochs']), repeats, warmup=1)
+        metrics = summarize(samples)
+
+    elif kind == 'batch_forecast':
+        countries = bench_countries(data, case['countries'])
+        samples = time_calls(lambda: forecaster.batch_forecast(data, BENCH_DISEASE, countries, BENCH_METRIC), repeats)
+        metrics = summarize(samples, items_per_call=len(countries))
+
+    elif kind == 'project_to_current_year':
+        countries = bench_countries(data, case['countries'])
+        samples = time_calls(
+            lambda: [forecaster.project_to_current_year(data, BENCH_DISEASE, country, BENCH_METRIC, 2025) for country in countries],
+            repeats
+        )
+        metrics = summarize(samples, items_per_call=len(countries))
+
+    else:
+        raise ValueError(f"Unknown benchmark kind: {kind}")
+
+    metrics['peak_rss_mb'] = peak_rss_mb()
+    return metrics
+
+def build_cases(quick=False, skip_pytorch=False, epochs=100):
+    """Parameter grid: series length x horizon for single series, country count for batches"""
+    if quick:
+        lengths, horizons, country_counts, repeats = [30, 180], [30, 180], [1, 25], 5
+        torch_lengths, torch_horizons, torch_repeats = [60], [30], 2
+    else:
+        lengths, horizons, country_counts, repeats = [30, 90, 180, 264], [30, 90, 180], [1, 10, 50, 200], 20
+        torch_lengths, torch_horizons, torch_repeats = [30, 90, 264], [30, 180], 5
+
+    cases = []
+    for length in lengths:
+        for horizon in horizons:
+            cases.append({'id': f'exponential_smoothing_forecast/len={length}/horizon={horizon}',
+                          'kind': 'exponential_smoothing_forecast', 'length': length, 'horizon': horizon, 'repeats': repeats})
+
+    if not skip_pytorch:
+        for length in torch_lengths:
+            for horizon in torch_horizons:
+                cases.append({'id': f'pytorch_forecast/len={length}/horizon={horizon}/epochs={epochs}',
+                              'kind': 'pytorch_forecast', 'length': length, 'horizon': horizon,
+                              'epochs': epochs, 'repeats': torch_repeats})
+
+    for count in country_counts:
+        batch_repeats = max(3, repeats // 4)
+        cases.append({'id': f'batch_forecast/countries={count}/horizon=180',
+                      'kind': 'batch_forecast', 'countries': count, 'horizon': 180, 'repeats': batch_repeats})
+        cases.append({'id': f'project_to_current_year/countries={count}/horizon=180',
+                      'kind': 'project_to_current_year', 'countries': count, 'horizon': 180, 'repeats': batch_repeats})
+
+    return cases
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the EpidemicForecaster")
+    add_common_arguments(parser)
+    parser.add_argument('--skip-pytorch', action='store_true', help='Skip the PyTorch cases')
+    parser.add_argument('--epochs', type=int, default=100, help='Training epochs for PyTorch cases (default 100)')
+    args = parser.parse_args()
+
+    print("⏱️ FORECAST ENGINE BENCHMARK")
+    print("=" * 50)
+
+    cases = [case for case in build_cases(args.quick, args.skip_pytorch, args.epochs) if args.filter in case['id']]
+    results = {}
+    for case in cases:
+        print(f"Running {case['id']}...")
+        results[case['id']] = run_case(case) if args.no_isolate else run_isolated(run_case, case)
+
+    metadata = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'quick': args.quick
+    }
+    print()
+    return finish(args, 'forecast', results, metadata)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""
+Benchmark the data ingest and page-level data paths end to end.
+
+Builds synthetic raw inputs at 1x/10x/100x the bundled data (countries are
+replicated with a suffix and their values rescaled) in a temporary workspace,
+then times each stage against them:
+
+    create_unified_dataset, save_processed_data      (utils/data_processor.py)
+    load_epidemic_data, filter_data,
+    load_health_expenditure_data                     (utils/data_loader.py)
+    get_country_totals, compute_regional_statistics  (Disease Map page)
+    perform_health_access_clustering                 (utils/health_clustering.py)
+
+Streamlit caches are bypassed (inspect.unwrap) so every call does the full work.
+Reports latency percentiles, throughput (rows/sec) and peak RSS per stage and
+compares against the stored baseline in benchmarks/baselines/pipeline.json.
+
+Usage:
+    python benchmarks/bench_pipeline.py                  # 1x, 10x, 100x
+    python benchmarks/bench_pipeline.py --quick          # 1x, 10x
+    python benchmarks/bench_pipeline.py --scales 1 1000  # custom scales
+    python benchmarks/bench_pipeline.py --check          # fail on regressions
+    python benchmarks/bench_pipeline.py --save-baseline  # update the baseline
+"""
+
+import argparse
+import contextlib
+import inspect
+import os
+import platform
+import shutil
+import sys
+import tempfile
+
+from bench_utils import (REPO_ROOT, add_common_arguments, finish, load_page_module,
+                         peak_rss_mb, quiet_streamlit, run_isolated, summarize, time_calls)
+
+import numpy as np
+import pandas as pd
+
+from utils.data_processor import EpidemicDataProcessor, HealthExpenditureProcessor
+
+DATA_DIR = os.path.join(REPO_ROOT, 'data')
+STAGES = [
+    'create_unified_dataset',
+    'save_processed_data',
+    'load_epidemic_data',
+    'filter_data',
+    'get_country_totals',
+    'compute_regional_statistics',
+    'load_health_expenditure_data',
+    'perform_health_access_clustering'
+]
+BENCH_DISEASE = 'COVID-19'
+BENCH_METRIC = 'total_cases'
+
+def replicate(df, name_cols, value_cols, scale, seed=0):
+    """
+    Stack `scale` copies of df. Copy k > 0 gets ' k' appended to the name columns
+    and its values multiplied by a random factor, so cumulative series stay monotonic.
+    """
+    if scale == 1:
+        return df.copy()
+
+    rng = np.random.default_rng(seed)
+    copies = [df]
+    for k in range(1, scale):
+        copy = df.copy()
+        for col in name_cols:
+            copy[col] = copy[col].astype(str) + f' {k}'
+        copy[value_cols] = (copy[value_cols] * rng.uniform(0.5, 1.5)).round()
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+def build_workspace(scale, root):
+    """Write scaled raw inputs to root/data and process them once (untimed) into root/data/processed"""
+    data_dir = os.path.join(root, 'data')
+    os.makedirs(data_dir, exist_ok=True)
+
+    # COVID-19 in the OWID layout load_covid_data expects, rebuilt from the bundled processed file
+    covid = pd.read_csv(os.path.join(DATA_DIR, 'processed', 'covid_19_processed.csv'))
+    covid = covid.rename(columns={'country': 'location', 'region': 'continent'}).drop(columns='disease')
+    numeric_cols = ['total_cases', 'new_cases', 'total_deaths', 'new_deaths']
+    replicate(covid, ['location'], numeric_cols, scale).to_csv(os.path.join(data_dir, 'cleaned_covid_data.csv'), index=False)
+
+    sars = pd.read_csv(os.path.join(DATA_DIR, 'sars_2003_complete_dataset_clean.csv'))
+    sars_values = ['Cumulative number of case(s)', 'Number of deaths', 'Number recovered']
+    replicate(sars, ['Country'], sars_values, scale).to_csv(os.path.join(data_dir, 'sars_2003_complete_dataset_clean.csv'), index=False)
+
+    mpx = pd.read_csv(os.path.join(DATA_DIR, 'Daily_Country_Monkeypox_Confirmed_Cases.csv'))
+    mpx_values = [col for col in mpx.columns if col != 'Country']
+    replicate(mpx, ['Country'], mpx_values, scale).to_csv(os.path.join(data_dir, 'Daily_Country_Monkeypox_Confirmed_Cases.csv'), index=False)
+
+    health = pd.read_excel(os.path.join(DATA_DIR, 'cleaned_health_expenditure.xlsx'))
+    health_values = [col for col in health.columns if col[:4].isdigit()]
+    health = replicate(health, ['Country Name', 'Country Code'], [], scale)
+    # Rescale without rounding: % of GDP is stored as a fraction
+    health[health_values] = health[health_values] * np.random.default_rng(1).uniform(0.5, 1.5, (len(health), 1))
+    health.to_excel(os.path.join(data_dir, 'cleaned_health_expenditure.xlsx'), index=False)
+
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        processor = EpidemicDataProcessor(data_dir=data_dir)
+        processor.create_unified_dataset()
+        processor.save_processed_data(output_dir=os.path.join(data_dir, 'processed'))
+
+        health_processor = HealthExpenditureProcessor(data_dir=data_dir)
+        health_processor.create_health_table()
+        health_processor.save_processed_data(output_dir=os.path.join(data_dir, 'processed'))
+
+    return len(processor.unified_data)
+
+def run_stage(case):
+    """Run one stage against a prepared workspace and return its metrics (executed in a child process by default)"""
+    root = case['workspace']
+    stage = case['stage']
+    repeats = case['repeats']
+    warmup = 1 if repeats > 1 else 0
+    data_dir = os.path.join(root, 'data')
+
+    previous_dir = os.getcwd()
+    os.chdir(root)  # Page loaders use paths relative to the app root
+    try:
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            if stage in ('create_unified_dataset', 'save_processed_data'):
+                processor = EpidemicDataProcessor(data_dir=data_dir)
+                if stage == 'create_unified_dataset':
+                    func = processor.create_unified_dataset
+                else:
+                    processor.create_unified_dataset()
+                    output_dir = os.path.join(root, 'bench_output')
+                    func = lambda: processor.save_processed_data(output_dir=output_dir)
+                rows = case['rows']
+
+            elif stage in ('load_health_expenditure_data', 'perform_health_access_clustering'):
+                # Imported here so the ingest stages' peak RSS excludes Streamlit and scikit-learn
+                quiet_streamlit()
+                from utils.data_loader import load_health_expenditure_data
+                from utils.health_clustering import perform_health_access_clustering
+
+                load_health = inspect.unwrap(load_health_expenditure_data)
+                if stage == 'load_health_expenditure_data':
+                    func = load_health
+                else:
+                    clustering_data, _ = load_health()
+                    func = lambda: perform_health_access_clustering(clustering_data.copy())
+                rows = case['health_rows']
+
+            else:
+                quiet_streamlit()
+                from utils.data_loader import load_epidemic_data, filter_data
+
+                load_data = inspect.unwrap(load_epidemic_data)
+                rows = case['rows']
+
+                if stage == 'load_epidemic_data':
+                    func = load_data
+                else:
+                    data, _, _ = load_data()
+                    disease_data = data[data['disease'] == BENCH_DISEASE]
+
+                    if stage == 'filter_data':
+                        # A typical selection: five most affected countries over the last 180 days
+                        countries = disease_data.groupby('country')[BENCH_METRIC].max().nlargest(5).index.tolist()
+                        end_date = disease_data['date'].max()
+                        date_range = ((end_date - pd.Timedelta(days=180)).date(), end_date.date())
+                        filter_uncached = inspect.unwrap(filter_data)
+                        func = lambda: filter_uncached(data, BENCH_DISEASE, countries, date_range)
+                    else:
+                        map_page = load_page_module('Disease Map.py')
+                        rows = len(disease_data)
+                        if stage == 'get_country_totals':
+                            func = lambda: map_page.get_country_totals(data, BENCH_DISEASE, BENCH_METRIC)
+                        else:
+                            country_data = map_page.get_country_totals(data, BENCH_DISEASE, BENCH_METRIC)
+                            rows = len(country_data)
+                            func = lambda: map_page.compute_regional_statistics(country_data, BENCH_METRIC)
+
+            samples = time_calls(func, repeats, warmup)
+    finally:
+        os.chdir(previous_dir)
+
+    metrics = summarize(samples, items_per_call=rows)
+    metrics['rows'] = rows
+    metrics['peak_rss_mb'] = peak_rss_mb()
+    return metrics
+
+def repeats_for_scale(scale, quick=False):
+    """Fewer repeats as inputs grow so the 100x run finishes in minutes"""
+    if scale >= 100:
+        return 1
+    if scale >= 10:
+        return 2 if quick else 3
+    return 3 if quick else 10
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark data ingest and page data paths")
+    add_common_arguments(parser)
+    parser.add_argument('--scales', type=int, nargs='+', help='Scale factors vs the bundled data (default 1 10 100, --quick 1 10)')
+    parser.add_argument('--keep-workspace', action='store_true', help='Keep the generated synthetic datasets')
+    args = parser.parse_args()
+
+    scales = args.scales or ([1, 10] if args.quick else [1, 10, 100])
+
+    print("⏱️ DATA PIPELINE BENCHMARK")
+    print("=" * 50)
+
+    results = {}
+    for scale in scales:
+        stages = [stage for stage in STAGES if args.filter in f'{stage}/scale={scale}x']
+        if not stages:
+            continue
+
+        workspace = tempfile.mkdtemp(prefix=f'epiaccess_bench_{scale}x_')
+        print(f"Building {scale}x workspace in {workspace}...")
+        rows = build_workspace(scale, workspace)
+        health_rows = len(pd.read_excel(os.path.join(workspace, 'data', 'cleaned_health_expenditure.xlsx'), usecols=[0]))
+
+        try:
+            for stage in stages:
+                case_id = f'{stage}/scale={scale}x'
+                case = {'stage': stage, 'workspace': workspace, 'rows': rows, 'health_rows': health_rows,
+                        'repeats': repeats_for_scale(scale, args.quick)}
+                print(f"Running {case_id}...")
+                results[case_id] = run_stage(case) if args.no_isolate else run_isolated(run_stage, case)
+        finally:
+            if not args.keep_workspace:
+                shutil.rmtree(workspace, ignore_errors=True)
+
+    metadata = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'pandas': pd.__version__,
+        'scales': scales,
+        'quick': args.quick
+    }
+    print()
+    return finish(args, 'pipeline', results, metadata)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Shared helpers for the benchmark scripts: timing, latency percentiles,
+peak memory, process isolation and baseline comparison.
+"""
+
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BASELINE_DIR = os.path.join(REPO_ROOT, 'benchmarks', 'baselines')
+
+# Add repo root to path so benchmarks can import utils/
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+def peak_rss_mb():
+    """Peak resident set size of the current process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+def time_calls(func, repeats=5, warmup=1):
+    """Call func repeatedly and return the per-call latencies in seconds"""
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def summarize(samples, items_per_call=1):
+    """Latency percentiles (ms) and throughput (items/sec) for a list of timings"""
+    samples = np.asarray(samples, dtype=float)
+    return {
+        'calls': int(len(samples)),
+        'p50_ms': float(np.percentile(samples, 50) * 1000),
+        'p90_ms': float(np.percentile(samples, 90) * 1000),
+        'p99_ms': float(np.percentile(samples, 99) * 1000),
+        'mean_ms': float(samples.mean() * 1000),
+        'throughput_per_sec': float(items_per_call / samples.mean()) if samples.mean() > 0 else float('inf')
+    }
+
+def run_isolated(func, *args):
+    """
+    Run func(*args) in a fresh process so that peak RSS is measured per case
+    rather than accumulating across the whole benchmark run.
+    """
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(func, *args).result()
+
+def load_baseline(name):
+    """Load a stored baseline ({case_id: metrics}); empty if none saved yet"""
+    path = os.path.join(BASELINE_DIR, f'{name}.json')
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)['results']
+
+def save_baseline(name, results, metadata=None):
+    """Store results as the new baseline for future comparisons"""
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    path = os.path.join(BASELINE_DIR, f'{name}.json')
+    with open(path, 'w') as f:
+        json.dump({'metadata': metadata or {}, 'results': results}, f, indent=2, sort_keys=True)
+    return path
+
+def compare_to_baseline(results, baseline, tolerance=0.25, metrics=('p50_ms', 'peak_rss_mb')):
+    """
+    Compare results against a baseline. Returns a list of regression messages for
+    metrics that are worse than the baseline by more than the tolerance (0.25 = 25%).
+    """
+    regressions = []
+    for case_id, current in results.items():
+        previous = baseline.get(case_id)
+        if not previous:
+            continue
+        for metric in metrics:
+            if metric not in current or metric not in previous or previous[metric] <= 0:
+                continue
+            change = current[metric] / previous[metric] - 1
+            if change > tolerance:
+                regressions.append(f"{case_id}: {metric} {previous[metric]:.1f} -> {current[metric]:.1f} (+{change:.0%})")
+    return regressions
+
+def print_results(results, baseline=None):
+    """Print a results table, with the change vs baseline p50 when available"""
+    baseline = baseline or {}
+    header = f"{'case':<62} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'items/s':>10} {'RSS MB':>8} {'vs base':>8}"
+    print(header)
+    print('-' * len(header))
+    for case_id, metrics in results.items():
+        change = ''
+        previous = baseline.get(case_id)
+        if previous and previous.get('p50_ms'):
+            change = f"{metrics['p50_ms'] / previous['p50_ms'] - 1:+.0%}"
+        print(f"{case_id:<62} {metrics['p50_ms']:>10.2f} {metrics['p90_ms']:>10.2f} {metrics['p99_ms']:>10.2f} "
+              f"{metrics['throughput_per_sec']:>10.1f} {metrics['peak_rss_mb']:>8.0f} {change:>8}")
+
+def add_common_arguments(parser):
+    """Command-line options shared by every benchmark script"""
+    parser.add_argument('--quick', action='store_true', help='Smaller parameter grid and fewer repeats')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baseline')
+    parser.add_argument('--check', action='store_true', help='Exit with status 1 if any case regresses vs the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown before a case counts as a regression (default 0.25 = 25%%)')
+    parser.add_argument('--no-isolate', action='store_true', help='Run cases in this process (faster, but RSS accumulates)')
+    parser.add_argument('--output', help='Also write results as JSON to this path')
+    parser.add_argument('--filter', default='', help='Only run cases whose id contains this text')
+
+def finish(args, name, results, metadata=None):
+    """Print results, compare with and optionally update the baseline, and return the exit code"""
+    baseline = load_baseline(name)
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'metadata': metadata or {}, 'results': results}, f, indent=2, sort_keys=True)
+
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n⚠️ {len(regressions)} regression(s) vs baseline (tolerance {args.tolerance:.0%}):")
+        for message in regressions:
+            print(f"  {message}")
+    elif baseline:
+        print("\n✅ No regressions vs baseline")
+
+    if args.save_baseline:
+        path = save_baseline(name, results, metadata)
+        print(f"💾 Baseline saved: {path}")
+
+    return 1 if (args.check and regressions) else 0
+
+def quiet_streamlit():
+    """Silence the bare-mode warnings (no runtime, no ScriptRunContext) expected outside a server"""
+    import logging
+
+    import streamlit.config
+    import streamlit.logger
+
+    # Parse the config first; parsing applies the configured log level
+    streamlit.config.get_config_options()
+    streamlit.logger.set_log_level(logging.ERROR)
+
+def load_page_module(page_file):
+    """
+    Import a Streamlit page (e.g. 'Disease Map.py') as a module so its data
+    functions can be benchmarked outside a running Streamlit server.
+    Cached functions can be called uncached through inspect.unwrap().
+    """
+    import importlib.util
+
+    quiet_streamlit()
+
+    path = os.path.join(REPO_ROOT, 'pages', page_file)
+    module_name = 'page_' + os.path.splitext(page_file)[0].lower().replace(' ', '_')
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -5,6 +5,15 @@ import plotly.graph_objects as go
 import json
 from datetime import datetime
 import numpy as np
+import sys
+import os
+
+# Add utils to path for instrumentation
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.data_loader import load_epidemic_data
+from utils.instrumentation import timed
+from utils.perf_panel import with_perf_panel
+from utils.profiling import profile_slow_reruns, note_inputs
 
 # Set page config
 st.set_page_config(
@@ -13,37 +22,36 @@ st.set_page_config(
     layout="wide"
 )
 
-@st.cache_data
-def load_epidemic_data():
-    """Load processed epidemic data"""
-    try:
-        data = pd.read_csv("data/processed/unified_epidemic_data.csv")
-        data['date'] = pd.to_datetime(data['date'])
-        
-        with open("data/processed/disease_metadata.json", "r") as f:
-            metadata = json.load(f)
-            
-        return data, metadata
-    except Exception as e:
-        st.error(f"Error loading data: {e}")
-        return None, None
+def is_rate_metric(metric):
+    """Whether the metric is a per-100k rate (precomputed at ingest) rather than a count"""
+    return metric.endswith('_per_100k')
+
+def value_format(metric):
+    """Number format for a metric's values: whole counts, rates to two decimals"""
+    return ',.2f' if is_rate_metric(metric) else ',.0f'
 
+@timed()
 def get_country_totals(data, disease, metric='total_cases'):
     """Get latest totals by country for mapping"""
     disease_data = data[data['disease'] == disease]
     
     # Get the latest data for each country
-    latest_data = disease_data.groupby('country').agg({
+    aggregations = {
         'date': 'max',
         metric: 'max',
         'region': 'last'
-    }).reset_index()
+    }
+    if is_rate_metric(metric):
+        # Population weights the regional rates
+        aggregations['population'] = 'last'
+    latest_data = disease_data.groupby('country').agg(aggregations).reset_index()
     
     # Filter out countries with zero cases
     latest_data = latest_data[latest_data[metric] > 0]
     
     return latest_data
 
+@timed()
 def create_choropleth_map(country_data, disease, metric, title):
     """Create interactive choropleth map with enhanced styling"""
     
@@ -92,7 +100,7 @@ def create_choropleth_map(country_data, disease, metric, title):
         color=metric,
         hover_name='country',
         hover_data={
-            metric: ':,.0f', 
+            metric: f':{value_format(metric)}', 
             'region': True,
             'iso_alpha': False  # Hide ISO code from hover
         },
@@ -152,13 +160,14 @@ def create_choropleth_map(country_data, disease, metric, title):
     # Enhanced hover template
     fig.update_traces(
         hovertemplate='<b>%{hovertext}</b><br>' +
-                     f'{metric.replace("_", " ").title()}: %{{z:,.0f}}<br>' +
+                     f'{metric.replace("_", " ").title()}: %{{z:{value_format(metric)}}}<br>' +
                      'Region: %{customdata[1]}<br>' +
                      '<extra></extra>'
     )
     
     return fig
 
+@timed()
 def create_bubble_map(country_data, disease, metric, title):
     """Create enhanced bubble map as alternative visualization"""
     
@@ -230,7 +239,7 @@ def create_bubble_map(country_data, disease, metric, title):
         color=metric,
         hover_name='country',
         hover_data={
-            metric: ':,.0f', 
+            metric: f':{value_format(metric)}', 
             'region': True,
             'lat': False,
             'lon': False
@@ -290,17 +299,34 @@ def create_bubble_map(country_data, disease, metric, title):
     
     return fig
 
+@timed()
+def compute_regional_statistics(country_data, metric):
+    """
+    Aggregate country totals into per-region totals, counts and averages.
+    For per-100k metrics the region's "total" is its population-weighted rate.
+    """
+    if is_rate_metric(metric):
+        weighted = country_data.assign(_weighted=country_data[metric] * country_data['population'],
+                                       _population=country_data['population'].where(country_data[metric].notna()))
+        regional_stats = weighted.groupby('region').agg(
+            total=('_weighted', 'sum'), countries=(metric, 'count'), average=(metric, 'mean'),
+            population=('_population', 'sum'))
+        regional_stats['total'] = regional_stats['total'] / regional_stats.pop('population')
+        regional_stats = regional_stats.round(2)
+    else:
+        regional_stats = country_data.groupby('region').agg({
+            metric: ['sum', 'count', 'mean']
+        }).round(0)
+    
+    regional_stats.columns = ['Total Cases', 'Countries Affected', 'Average per Country']
+    return regional_stats.sort_values('Total Cases', ascending=False)
+
 def display_regional_statistics(country_data, disease, metric):
     """Display enhanced regional statistics with better styling"""
     if country_data.empty:
         return
     
-    regional_stats = country_data.groupby('region').agg({
-        metric: ['sum', 'count', 'mean']
-    }).round(0)
-    
-    regional_stats.columns = ['Total Cases', 'Countries Affected', 'Average per Country']
-    regional_stats = regional_stats.sort_values('Total Cases', ascending=False)
+    regional_stats = compute_regional_statistics(country_data, metric)
     
     # Enhanced styling with custom CSS
     st.markdown("""
@@ -326,18 +352,20 @@ def display_regional_statistics(country_data, disease, metric):
         
         for i, region in enumerate(regions[:6]):  # Show top 6 regions
             with cols[i % 3]:
-                total = int(regional_stats.loc[region, 'Total Cases'])
+                total = regional_stats.loc[region, 'Total Cases']
                 countries = int(regional_stats.loc[region, 'Countries Affected'])
-                avg = int(regional_stats.loc[region, 'Average per Country'])
+                avg = regional_stats.loc[region, 'Average per Country']
                 
                 # Enhanced metric display
                 st.metric(
                     label=f"🌍 {region}",
-                    value=f"{total:,}",
+                    value=f"{total:{value_format(metric)}}",
                     delta=f"{countries} countries affected",
-                    help=f"Average per country: {avg:,}"
+                    help=f"Average per country: {avg:{value_format(metric)}}"
                 )
 
+@with_perf_panel("Disease Map")
+@profile_slow_reruns("Disease Map")
 def main():
     # Enhanced header with better styling
     st.markdown("""
@@ -455,7 +483,7 @@ def main():
     """, unsafe_allow_html=True)
     
     # Load data
-    data, metadata = load_epidemic_data()
+    data, metadata, _ = load_epidemic_data()
     
     if data is None:
         st.error("Failed to load epidemic data.")
@@ -567,7 +595,11 @@ def main():
         'total_cases': 'Total Cases',
         'total_deaths': 'Total Deaths',
         'new_cases': 'Peak Daily Cases',
-        'new_deaths': 'Peak Daily Deaths'
+        'new_deaths': 'Peak Daily Deaths',
+        'total_cases_per_100k': 'Total Cases per 100k',
+        'total_deaths_per_100k': 'Total Deaths per 100k',
+        'new_cases_per_100k': 'Peak Daily Cases per 100k',
+        'new_deaths_per_100k': 'Peak Daily Deaths per 100k'
     }
     
     selected_metric = st.sidebar.selectbox(
@@ -584,6 +616,9 @@ def main():
         help="Choose visualization style"
     )
     
+    note_inputs(disease=selected_disease, regions=selected_regions, countries=selected_countries,
+                metric=selected_metric, map_type=map_type)
+    
     # Apply filters
     filtered_data = disease_data.copy()
     if selected_regions:
@@ -640,6 +675,7 @@ def main():
     # Color coding explanation
     max_cases = country_data[selected_metric].max()
     median_cases = country_data[selected_metric].median()
+    number_format = value_format(selected_metric)
     
     col1, col2 = st.columns(2)
     
@@ -647,8 +683,8 @@ def main():
         st.markdown(f"""
         <div class="callout-box">
         <h4>🎨 Color Legend</h4>
-        <p><strong>Darkest Red:</strong> Highest case counts ({max_cases:,.0f})</p>
-        <p><strong>Medium Red:</strong> Above median ({median_cases:,.0f}+)</p>
+        <p><strong>Darkest Red:</strong> Highest case counts ({max_cases:{number_format}})</p>
+        <p><strong>Medium Red:</strong> Above median ({median_cases:{number_format}}+)</p>
         <p><strong>Light Colors:</strong> Below median cases</p>
         <p><strong>Gray:</strong> No reported cases or insufficient data</p>
         </div>
@@ -661,13 +697,21 @@ def main():
         total_countries = len(country_data)
         total_cases = country_data[selected_metric].sum()
         
+        if is_rate_metric(selected_metric):
+            # Rates don't add up across countries; report the spread instead
+            top_label = "per 100k"
+            total_line = f"<p><strong>Median per Country:</strong> {median_cases:{number_format}}</p>"
+        else:
+            top_label = "cases"
+            total_line = f"<p><strong>Total Across Region:</strong> {total_cases:{number_format}}</p>"
+        
         st.markdown(f"""
         <div class="insight-box">
         <h4>📊 Key Insights</h4>
-        <p><strong>Most Affected:</strong> {top_country} ({top_cases:,.0f} cases)</p>
+        <p><strong>Most Affected:</strong> {top_country} ({top_cases:{number_format}} {top_label})</p>
         <p><strong>Countries with Data:</strong> {total_countries}</p>
-        <p><strong>Total Across Region:</strong> {total_cases:,.0f}</p>
-        <p><strong>Average per Country:</strong> {total_cases/total_countries:,.0f}</p>
+        {total_line}
+        <p><strong>Average per Country:</strong> {total_cases/total_countries:{number_format}}</p>
         </div>
         """, unsafe_allow_html=True)
     
@@ -772,7 +816,7 @@ def main():
     
     top_countries.columns = ['Country', metric_options[selected_metric], 'Region']
     top_countries[metric_options[selected_metric]] = top_countries[metric_options[selected_metric]].apply(
-        lambda x: f"{x:,.0f}"
+        lambda x: f"{x:{number_format}}"
     )
     
     st.dataframe(
@@ -11,7 +11,12 @@ import os
 
 # Add utils to path for forecasting modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from utils.forecast_engine import EpidemicForecaster, InsightGenerator
+from utils.forecast_engine import EpidemicForecaster, InsightGenerator, BackgroundForecastRunner
+from utils.model_cache import PYTORCH_MODEL_CACHE
+from utils.data_loader import load_epidemic_data, filter_data, get_forecast_store
+from utils.instrumentation import timed
+from utils.perf_panel import with_perf_panel
+from utils.profiling import profile_slow_reruns, note_inputs
 
 # Page config
 st.set_page_config(
@@ -20,214 +25,69 @@ st.set_page_config(
     layout="wide"
 )
 
-# Load data and metadata with caching
-@st.cache_data
-def load_epidemic_data():
-    """Load processed epidemic data and metadata"""
-    try:
-        # Load unified dataset
-        data = pd.read_csv("data/processed/unified_epidemic_data.csv")
-        data['date'] = pd.to_datetime(data['date'])
-        
-        # Load metadata
-        with open("data/processed/disease_metadata.json", "r") as f:
-            metadata = json.load(f)
-        
-        # Load summary stats
-        with open("data/processed/data_summary.json", "r") as f:
-            summary = json.load(f)
-        
-        return data, metadata, summary
-    except Exception as e:
-        st.error(f"Error loading data: {e}")
-        return None, None, None
+CONFIDENCE_ALPHA = 0.2
+CONFIDENCE_COLORS = [
+    f'rgba(255, 0, 0, {CONFIDENCE_ALPHA})',     # Red
+    f'rgba(0, 0, 255, {CONFIDENCE_ALPHA})',     # Blue  
+    f'rgba(0, 128, 0, {CONFIDENCE_ALPHA})',     # Green
+    f'rgba(255, 165, 0, {CONFIDENCE_ALPHA})',   # Orange
+    f'rgba(128, 0, 128, {CONFIDENCE_ALPHA})',   # Purple
+    f'rgba(255, 192, 203, {CONFIDENCE_ALPHA})', # Pink
+    f'rgba(0, 255, 255, {CONFIDENCE_ALPHA})',   # Cyan
+    f'rgba(255, 255, 0, {CONFIDENCE_ALPHA})',   # Yellow
+]
 
-@st.cache_data
-def filter_data(data, disease, countries, date_range):
-    """Filter data based on user selections"""
-    filtered = data[data['disease'] == disease].copy()
-    
-    if countries:
-        filtered = filtered[filtered['country'].isin(countries)]
-    
-    if date_range:
-        start_date, end_date = date_range
-        filtered = filtered[
-            (filtered['date'] >= pd.to_datetime(start_date)) & 
-            (filtered['date'] <= pd.to_datetime(end_date))
-        ]
-    
-    return filtered
+@st.cache_resource
+def get_forecast_runner():
+    """Shared background worker pool for forecasts (one per server process)"""
+    return BackgroundForecastRunner()
 
-def create_forecast_chart(data, metric, countries, disease, show_forecast=True, show_confidence=True, project_to_2025=False, use_pytorch=False):
-    """Create time series chart with optional forecasting and 2025 projection"""
-    if data.empty:
-        return go.Figure().add_annotation(
-            text="No data available for selected filters",
-            xref="paper", yref="paper", x=0.5, y=0.5,
-            showarrow=False, font_size=16
-        )
-    
-    # Create color palette for countries
-    colors = px.colors.qualitative.Set3
+def get_cached_object_sizes():
+    """Memory held by the forecast caches, for the performance panel"""
+    sizes = {'PyTorch models': PYTORCH_MODEL_CACHE.nbytes}
+    store = get_forecast_store()
+    if store is not None:
+        sizes['Forecast store'] = store.nbytes
+    return sizes
+
+def value_format(metric):
+    """Hover format for a metric's values: whole counts, per-100k rates and rolling averages to two decimals"""
+    return ',.2f' if metric.endswith(('_per_100k', '_avg')) else ',.0f'
+
+def get_chart_countries(data, countries):
+    """Countries plotted on the trend chart"""
+    return list(countries) if countries else list(data['country'].unique()[:5])  # Limit to 5 for performance
+
+def get_forecast_countries(data, countries):
+    """Chart countries that have data to forecast from"""
+    available = set(data['country'].unique())
+    return [country for country in get_chart_countries(data, countries) if country in available]
+
+@timed()
+def create_base_chart(data, metric, countries, disease, show_forecast=True, project_to_2025=False):
+    """Create the chart layout and historical traces (forecast traces are added separately)"""
     fig = go.Figure()
+    colors = px.colors.qualitative.Set3
     
-    # Initialize forecaster if needed
-    forecaster = EpidemicForecaster() if (show_forecast or project_to_2025) else None
-    
-    selected_countries = countries if countries else data['country'].unique()[:5]  # Limit to 5 for performance
-    
-    for i, country in enumerate(selected_countries):
-        country_data = data[data['country'] == country].sort_values('date')
-        if not country_data.empty:
-            
-            if project_to_2025 and forecaster:
-                # Use 2025 projection mode
-                try:
-                    projection_result = forecaster.project_to_current_year(data, disease, country, metric, 2025, use_pytorch)
-                    
-                    if projection_result['success']:
-                        projected_dates = projection_result['projected_dates']
-                        projected_values = projection_result['projected_values']
-                        
-                        # Projected historical data (what it would look like in 2025)
-                        fig.add_trace(go.Scatter(
-                            x=projected_dates,
-                            y=projected_values,
-                            mode='lines+markers',
-                            name=f"{country} (If in 2025)",
-                            line=dict(color=colors[i % len(colors)], width=2),
-                            marker=dict(size=4),
-                            hovertemplate=f'<b>{country} (Projected to 2025)</b><br>' +
-                                        'Date: %{x}<br>' +
-                                        f'{metric.replace("_", " ").title()}: %{{y:,.0f}}<br>' +
-                                        f'<i>Based on {projection_result["original_period"]} pattern</i><br>' +
-                                        f'<i>Forecast method: {projection_result["forecast_method"]}</i><br>' +
-                                        '<b>⚠️ Scenario planning only - Reliability: 5-6/10</b><br>' +
-                                        '<extra></extra>'
-                        ))
-                        
-                        # Add forecast if enabled
-                        if show_forecast:
-                            forecast_dates = projection_result['forecast_dates']
-                            forecast_values = projection_result['forecast_values']
-                            lower_bound = projection_result['lower_bound']
-                            upper_bound = projection_result['upper_bound']
-                            
-                            # Forecast line
-                            fig.add_trace(go.Scatter(
-                                x=forecast_dates,
-                                y=forecast_values,
-                                mode='lines',
-                                name=f"{country} (2025 Forecast)",
-                                line=dict(color=colors[i % len(colors)], width=2, dash='dash'),
-                                hovertemplate=f'<b>{country} 2025 Forecast</b><br>' +
-                                            'Date: %{x}<br>' +
-                                            f'Predicted {metric.replace("_", " ").title()}: %{{y:,.0f}}<br>' +
-                                            f'<i>Forecast method: {projection_result["forecast_method"]}</i><br>' +
-                                            '<b>⚠️ Scenario planning only - Reliability: 5-6/10</b><br>' +
-                                            '<extra></extra>'
-                            ))
-                            
-                            # Confidence intervals
-                            if show_confidence:
-                                # Use a simple semi-transparent color based on the country index
-                                alpha = 0.2
-                                confidence_colors = [
-                                    f'rgba(255, 0, 0, {alpha})',     # Red
-                                    f'rgba(0, 0, 255, {alpha})',     # Blue  
-                                    f'rgba(0, 128, 0, {alpha})',     # Green
-                                    f'rgba(255, 165, 0, {alpha})',   # Orange
-                                    f'rgba(128, 0, 128, {alpha})',   # Purple
-                                    f'rgba(255, 192, 203, {alpha})', # Pink
-                                    f'rgba(0, 255, 255, {alpha})',   # Cyan
-                                    f'rgba(255, 255, 0, {alpha})',   # Yellow
-                                ]
-                                
-                                fig.add_trace(go.Scatter(
-                                    x=forecast_dates + forecast_dates[::-1],
-                                    y=upper_bound + lower_bound[::-1],
-                                    fill='toself',
-                                    fillcolor=confidence_colors[i % len(confidence_colors)],
-                                    line=dict(color='rgba(255,255,255,0)'),
-                                    name=f"{country} (95% CI)",
-                                    showlegend=False,
-                                    hoverinfo='skip'
-                                ))
-                    else:
-                        st.warning(f"Could not project {country} to 2025: {projection_result['message']}")
-                        
-                except Exception as e:
-                    st.warning(f"Could not project {country} to 2025: {str(e)}")
+    if not project_to_2025:
+        # Regular mode: show historical data
+        for i, country in enumerate(get_chart_countries(data, countries)):
+            country_data = data[data['country'] == country].sort_values('date')
+            if country_data.empty:
+                continue
             
-            else:
-                # Regular mode: show historical data
-                fig.add_trace(go.Scatter(
-                    x=country_data['date'],
-                    y=country_data[metric],
-                    mode='lines+markers',
-                    name=f"{country} (Historical)",
-                    line=dict(color=colors[i % len(colors)], width=2),
-                    marker=dict(size=4),
-                    hovertemplate=f'<b>{country}</b><br>' +
-                                'Date: %{x}<br>' +
-                                f'{metric.replace("_", " ").title()}: %{{y:,.0f}}<br>' +
-                                '<extra></extra>'
-                ))
-                
-                # Add forecast if enabled
-                if show_forecast and forecaster:
-                    try:
-                        forecast_result = forecaster.generate_forecast(data, disease, country, metric, use_pytorch)
-                        
-                        if forecast_result['success'] and forecast_result['forecast_values']:
-                            forecast_dates = forecast_result['forecast_dates']
-                            forecast_values = forecast_result['forecast_values']
-                            lower_bound = forecast_result['lower_bound']
-                            upper_bound = forecast_result['upper_bound']
-                            
-                            # Forecast line
-                            fig.add_trace(go.Scatter(
-                                x=forecast_dates,
-                                y=forecast_values,
-                                mode='lines',
-                                name=f"{country} (Forecast)",
-                                line=dict(color=colors[i % len(colors)], width=2, dash='dash'),
-                                hovertemplate=f'<b>{country} Forecast</b><br>' +
-                                            'Date: %{x}<br>' +
-                                            f'Predicted {metric.replace("_", " ").title()}: %{{y:,.0f}}<br>' +
-                                            f'<i>Forecast method: {forecast_result["forecast_method"]}</i><br>' +
-                                            '<extra></extra>'
-                            ))
-                            
-                            # Confidence intervals
-                            if show_confidence:
-                                # Use a simple semi-transparent color based on the country index
-                                alpha = 0.2
-                                confidence_colors = [
-                                    f'rgba(255, 0, 0, {alpha})',     # Red
-                                    f'rgba(0, 0, 255, {alpha})',     # Blue  
-                                    f'rgba(0, 128, 0, {alpha})',     # Green
-                                    f'rgba(255, 165, 0, {alpha})',   # Orange
-                                    f'rgba(128, 0, 128, {alpha})',   # Purple
-                                    f'rgba(255, 192, 203, {alpha})', # Pink
-                                    f'rgba(0, 255, 255, {alpha})',   # Cyan
-                                    f'rgba(255, 255, 0, {alpha})',   # Yellow
-                                ]
-                                
-                                fig.add_trace(go.Scatter(
-                                    x=forecast_dates + forecast_dates[::-1],
-                                    y=upper_bound + lower_bound[::-1],
-                                    fill='toself',
-                                    fillcolor=confidence_colors[i % len(confidence_colors)],
-                                    line=dict(color='rgba(255,255,255,0)'),
-                                    name=f"{country} (95% CI)",
-                                    showlegend=False,
-                                    hoverinfo='skip'
-                                ))
-                    
-                    except Exception as e:
-                        st.warning(f"Could not generate forecast for {country}: {str(e)}")
+            fig.add_trace(go.Scatter(
+                x=country_data['date'],
+                y=country_data[metric],
+                mode='lines+markers',
+                name=f"{country} (Historical)",
+                line=dict(color=colors[i % len(colors)], width=2),
+                marker=dict(size=4),
+                hovertemplate=f'<b>{country}</b><br>' +
+                            'Date: %{x}<br>' +
+                            f'{metric.replace("_", " ").title()}: %{{y:{value_format(metric)}}}<br>' +
+                            '<extra></extra>'
+            ))
     
     # Update layout
     if project_to_2025:
@@ -262,10 +122,180 @@ def create_forecast_chart(data, metric, countries, disease, show_forecast=True,
     
     return fig
 
+def add_forecast_traces(fig, forecast_result, country, index, metric, show_confidence=True, project_to_2025=False):
+    """Add a forecast line and optional confidence band for one country"""
+    colors = px.colors.qualitative.Set3
+    forecast_dates = list(forecast_result['forecast_dates'])
+    forecast_values = list(forecast_result['forecast_values'])
+    lower_bound = list(forecast_result['lower_bound'])
+    upper_bound = list(forecast_result['upper_bound'])
+    
+    if project_to_2025:
+        name = f"{country} (2025 Forecast)"
+        hovertemplate = (f'<b>{country} 2025 Forecast</b><br>' +
+                         'Date: %{x}<br>' +
+                         f'Predicted {metric.replace("_", " ").title()}: %{{y:{value_format(metric)}}}<br>' +
+                         f'<i>Forecast method: {forecast_result["forecast_method"]}</i><br>' +
+                         '<b>⚠️ Scenario planning only - Reliability: 5-6/10</b><br>' +
+                         '<extra></extra>')
+    else:
+        name = f"{country} (Forecast)"
+        hovertemplate = (f'<b>{country} Forecast</b><br>' +
+                         'Date: %{x}<br>' +
+                         f'Predicted {metric.replace("_", " ").title()}: %{{y:{value_format(metric)}}}<br>' +
+                         f'<i>Forecast method: {forecast_result["forecast_method"]}</i><br>' +
+                         '<extra></extra>')
+    
+    # Forecast line
+    fig.add_trace(go.Scatter(
+        x=forecast_dates,
+        y=forecast_values,
+        mode='lines',
+        name=name,
+        line=dict(color=colors[index % len(colors)], width=2, dash='dash'),
+        hovertemplate=hovertemplate
+    ))
+    
+    # Confidence intervals
+    if show_confidence:
+        # Use a simple semi-transparent color based on the country index
+        fig.add_trace(go.Scatter(
+            x=forecast_dates + forecast_dates[::-1],
+            y=upper_bound + lower_bound[::-1],
+            fill='toself',
+            fillcolor=CONFIDENCE_COLORS[index % len(CONFIDENCE_COLORS)],
+            line=dict(color='rgba(255,255,255,0)'),
+            name=f"{country} (95% CI)",
+            showlegend=False,
+            hoverinfo='skip'
+        ))
+
+def add_projection_traces(fig, projection_result, country, index, metric, show_forecast=True, show_confidence=True):
+    """Add the 2025-shifted history (and its forecast) for one country"""
+    colors = px.colors.qualitative.Set3
+    
+    # Projected historical data (what it would look like in 2025)
+    fig.add_trace(go.Scatter(
+        x=projection_result['projected_dates'],
+        y=projection_result['projected_values'],
+        mode='lines+markers',
+        name=f"{country} (If in 2025)",
+        line=dict(color=colors[index % len(colors)], width=2),
+        marker=dict(size=4),
+        hovertemplate=f'<b>{country} (Projected to 2025)</b><br>' +
+                    'Date: %{x}<br>' +
+                    f'{metric.replace("_", " ").title()}: %{{y:{value_format(metric)}}}<br>' +
+                    f'<i>Based on {projection_result["original_period"]} pattern</i><br>' +
+                    f'<i>Forecast method: {projection_result["forecast_method"]}</i><br>' +
+                    '<b>⚠️ Scenario planning only - Reliability: 5-6/10</b><br>' +
+                    '<extra></extra>'
+    ))
+    
+    # Add forecast if enabled
+    if show_forecast:
+        add_forecast_traces(fig, projection_result, country, index, metric, show_confidence, project_to_2025=True)
+
+def add_result_traces(fig, result, country, index, metric, show_forecast, show_confidence, project_to_2025):
+    """Add traces for a finished forecast/projection; returns False if the result is unusable"""
+    if project_to_2025:
+        if not result['success']:
+            st.warning(f"Could not project {country} to 2025: {result['message']}")
+            return False
+        add_projection_traces(fig, result, country, index, metric, show_forecast, show_confidence)
+        return True
+    
+    if not result['success']:
+        if result['message'].startswith('Error'):
+            st.warning(f"Could not generate forecast for {country}: {result['message']}")
+        return False
+    if len(result['forecast_values']) == 0:
+        return False
+    add_forecast_traces(fig, result, country, index, metric, show_confidence)
+    return True
+
+@timed()
+def create_forecast_chart(data, metric, countries, disease, show_forecast=True, show_confidence=True, project_to_2025=False, use_pytorch=False):
+    """Create time series chart with optional forecasting and 2025 projection"""
+    if data.empty:
+        return go.Figure().add_annotation(
+            text="No data available for selected filters",
+            xref="paper", yref="paper", x=0.5, y=0.5,
+            showarrow=False, font_size=16
+        )
+    
+    fig = create_base_chart(data, metric, countries, disease, show_forecast, project_to_2025)
+    
+    if not (show_forecast or project_to_2025):
+        return fig
+    
+    # Compute forecasts synchronously
+    forecaster = EpidemicForecaster()
+    country_index = {country: i for i, country in enumerate(get_chart_countries(data, countries))}
+    forecast_countries = get_forecast_countries(data, countries)
+    
+    if project_to_2025:
+        results = forecaster.batch_project_to_current_year(data, disease, forecast_countries, metric, 2025, use_pytorch)
+    else:
+        results = forecaster.batch_forecast(data, disease, forecast_countries, metric, use_pytorch)
+    
+    for country in forecast_countries:
+        add_result_traces(fig, results[country], country, country_index[country], metric, show_forecast, show_confidence, project_to_2025)
+    
+    return fig
+
+@timed()
+def render_forecast_chart(placeholder, data, metric, countries, disease, show_forecast=True, show_confidence=True, project_to_2025=False, use_pytorch=False, use_store=False):
+    """
+    Render the trend chart progressively: history is drawn immediately and forecast
+    traces are added as each background forecast completes. Forecasts still running
+    from a previous rerun (e.g. the user changed filters) are cancelled first.
+    With use_store, precomputed forecasts are served from the forecast store.
+    Returns the completed forecast results keyed by country.
+    """
+    previous_jobs = st.session_state.pop('forecast_jobs', None)
+    if previous_jobs is not None:
+        previous_jobs.cancel()
+    
+    if data.empty or not (show_forecast or project_to_2025):
+        placeholder.plotly_chart(create_forecast_chart(data, metric, countries, disease, False), use_container_width=True)
+        return {}
+    
+    fig = create_base_chart(data, metric, countries, disease, show_forecast, project_to_2025)
+    placeholder.plotly_chart(fig, use_container_width=True)
+    
+    country_index = {country: i for i, country in enumerate(get_chart_countries(data, countries))}
+    target_year = 2025 if project_to_2025 else None
+    
+    store = get_forecast_store() if use_store else None
+    jobs = get_forecast_runner().submit(data, disease, get_forecast_countries(data, countries), metric, use_pytorch, target_year, store)
+    st.session_state['forecast_jobs'] = jobs
+    
+    # Updating the status between short waits gives a rerun a chance to interrupt
+    # the loop, so stale forecasts are cancelled right away
+    status = st.empty()
+    def show_progress(finished, total):
+        status.caption(f"⏳ Forecasting... {finished} of {total} countries done")
+    
+    results = {}
+    try:
+        for country, result in jobs.as_completed(on_wait=show_progress):
+            results[country] = result
+            if add_result_traces(fig, result, country, country_index[country], metric, show_forecast, show_confidence, project_to_2025):
+                placeholder.plotly_chart(fig, use_container_width=True)
+    finally:
+        # A rerun interrupts this loop; make sure abandoned work stops
+        if not jobs.done():
+            jobs.cancel()
+        st.session_state.pop('forecast_jobs', None)
+    status.empty()
+    
+    return results
+
 def create_time_series_chart(data, metric, countries, disease):
     """Create interactive time series chart"""
     return create_forecast_chart(data, metric, countries, disease, show_forecast=False)
 
+@timed()
 def create_comparison_chart(data, metric, countries, disease):
     """Create comparison bar chart for selected countries"""
     if data.empty:
@@ -347,15 +377,49 @@ def display_key_metrics(data, disease, summary):
                     help="Available data timeframe"
                 )
 
-def display_insights_panel(data, disease, countries, metric, project_to_2025=False, use_pytorch=False):
+def format_or_dash(template):
+    """Formatter for table cells that shows missing values as a dash"""
+    return lambda x: template.format(x) if pd.notna(x) else "—"
+
+@timed()
+def get_growth_indicators(data, countries):
+    """Latest precomputed growth indicators for each chart country, ready to display"""
+    chart_data = data[data['country'].isin(get_chart_countries(data, countries))]
+    latest = chart_data.loc[chart_data.groupby('country')['date'].idxmax()]
+    
+    return pd.DataFrame({
+        'Country': latest['country'],
+        'As of': latest['date'].dt.strftime('%Y-%m-%d'),
+        'Cases (7-day avg)': latest['new_cases_7d_avg'].map(format_or_dash('{:,.1f}')),
+        'Week over Week': latest['cases_wow_growth'].map(format_or_dash('{:+.0%}')),
+        'Doubling Time': latest['doubling_time'].map(format_or_dash('{:,.0f} days')),
+        'Rt Proxy': latest['rt_proxy'].map(format_or_dash('{:.2f}'))
+    })
+
+def display_growth_indicators(data, countries, disease):
+    """Show where each chart country's outbreak stood at the end of the selected period"""
+    if data.empty:
+        return
+    
+    st.subheader("📐 Growth Indicators")
+    st.dataframe(get_growth_indicators(data, countries), use_container_width=True, hide_index=True)
+    st.caption(f"Week over week compares the last 7 days of new cases with the 7 before. Rt proxy scales "
+               f"that growth to {disease}'s serial interval; above 1 means the outbreak was growing.")
+
+@timed()
+def display_insights_panel(data, disease, countries, metric, project_to_2025=False, use_pytorch=False, forecast_results=None):
     """Display insights panel with forecasting information"""
     if not data.empty and countries:
         # Initialize forecaster and insight generator
         forecaster = EpidemicForecaster()
         insight_generator = InsightGenerator()
         
-        # Get forecasts for selected countries
-        forecast_results = forecaster.batch_forecast(data, disease, countries, metric, use_pytorch)
+        # Get forecasts for selected countries, reusing any the chart already computed
+        forecast_results = dict(forecast_results or {})
+        missing_countries = [country for country in countries if country not in forecast_results]
+        if missing_countries:
+            forecast_results.update(forecaster.batch_forecast(data, disease, missing_countries, metric, use_pytorch))
+        forecast_results = {country: forecast_results[country] for country in countries}
         
         # Generate insights
         insights = insight_generator.generate_batch_insights(forecast_results, disease, metric.replace('_', ' '))
@@ -385,10 +449,17 @@ def display_insights_panel(data, disease, countries, metric, project_to_2025=Fal
             """)
         
         # Display insights for each country
+        trend_icons = {'increasing': '📈', 'decreasing': '📉', 'stable': '➡️'}
         for insight in insights:
-            with st.expander(f"**{insight['country']}** - {insight['summary']}"):
-                st.markdown(insight['details'])
+            icon = trend_icons.get(insight['trend'], 'ℹ️')
+            trend_label = insight['trend'].replace('_', ' ').title()
+            with st.expander(f"{icon} **{insight['country']}** - {trend_label} ({insight['confidence']} confidence)"):
+                st.markdown(insight['insight'])
+                if insight['trend'] in trend_icons:
+                    st.markdown(f"**1-month change:** {insight['change_1m']:+.1f}% | **3-month change:** {insight['change_3m']:+.1f}%")
 
+@with_perf_panel("Disease Trends", cached_objects=get_cached_object_sizes)
+@profile_slow_reruns("Disease Trends")
 def main():
     # Add sidebar styling for consistency
     st.markdown("""
@@ -526,7 +597,15 @@ def main():
         'total_cases': 'Total Cases',
         'new_cases': 'Daily New Cases',
         'total_deaths': 'Total Deaths',
-        'new_deaths': 'Daily New Deaths'
+        'new_deaths': 'Daily New Deaths',
+        'total_cases_per_100k': 'Total Cases per 100k',
+        'new_cases_per_100k': 'Daily New Cases per 100k',
+        'total_deaths_per_100k': 'Total Deaths per 100k',
+        'new_deaths_per_100k': 'Daily New Deaths per 100k',
+        'new_cases_7d_avg': 'Daily New Cases (7-day avg)',
+        'new_cases_14d_avg': 'Daily New Cases (14-day avg)',
+        'new_deaths_7d_avg': 'Daily New Deaths (7-day avg)',
+        'new_deaths_14d_avg': 'Daily New Deaths (14-day avg)'
     }
     
     selected_metric = st.sidebar.selectbox(
@@ -596,9 +675,16 @@ def main():
             **Use as:** Emergency drill scenarios, not predictions
             """)
     
+    note_inputs(disease=selected_disease, countries=selected_countries, date_range=date_range, metric=selected_metric,
+                show_forecast=show_forecast, show_confidence=show_confidence, project_to_2025=project_to_2025,
+                use_pytorch=use_pytorch)
+    
     # Filter data
     filtered_data = filter_data(data, selected_disease, selected_countries, date_range)
     
+    # Precomputed forecasts are built from each country's full history
+    full_date_range = tuple(date_range) == (min_date, max_date)
+    
     # Display key metrics
     display_key_metrics(filtered_data, selected_disease, summary)
     
@@ -639,23 +725,13 @@ def main():
             
             st.markdown("---")
         
-        if project_to_2025:
-            # 2025 projection mode
-            forecast_chart = create_forecast_chart(
-                filtered_data, selected_metric, selected_countries, 
-                selected_disease, show_forecast, show_confidence, project_to_2025, use_pytorch
-            )
-        elif show_forecast:
-            forecast_chart = create_forecast_chart(
-                filtered_data, selected_metric, selected_countries, 
-                selected_disease, show_forecast, show_confidence, project_to_2025, use_pytorch
-            )
-        else:
-            forecast_chart = create_time_series_chart(
-                filtered_data, selected_metric, selected_countries, selected_disease
-            )
-        
-        st.plotly_chart(forecast_chart, use_container_width=True)
+        # Forecasts run in the background and are drawn as each country finishes
+        chart_placeholder = st.empty()
+        forecast_results = render_forecast_chart(
+            chart_placeholder, filtered_data, selected_metric, selected_countries,
+            selected_disease, show_forecast, show_confidence, project_to_2025, use_pytorch,
+            use_store=full_date_range
+        )
         
         # Add explanation below chart for 2025 mode
         if project_to_2025:
@@ -678,7 +754,14 @@ def main():
     
     with col2:
         # Insights panel
-        display_insights_panel(filtered_data, selected_disease, selected_countries, selected_metric, project_to_2025, use_pytorch)
+        display_insights_panel(
+            filtered_data, selected_disease, selected_countries, selected_metric, project_to_2025, use_pytorch,
+            forecast_results=None if project_to_2025 else forecast_results
+        )
+        
+        # Precomputed rolling indicators at the end of the selected period
+        st.markdown("---")
+        display_growth_indicators(filtered_data, selected_countries, selected_disease)
         
         # Additional controls and info
         st.markdown("---")
@@ -7,12 +7,19 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
 import warnings
 import os
+import sys
 warnings.filterwarnings('ignore')
 
+# Add utils to path for instrumentation
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.data_loader import load_health_expenditure_data, load_epidemic_access_data
+from utils.health_clustering import get_health_access_clusters, get_cluster_sweep, get_yearly_health_access_clusters
+from utils.instrumentation import timed
+from utils.perf_panel import with_perf_panel
+from utils.profiling import profile_slow_reruns, note_inputs
+
 # Page setup
 st.set_page_config(
     page_title="🎯 Access Clustering",
@@ -20,112 +27,15 @@ st.set_page_config(
     layout="wide"
 )
 
-@st.cache_data
-def load_health_expenditure_data():
-    """
-    Load World Bank health expenditure data and prepare it for clustering.
-    We use 2020-2022 averages to smooth out pandemic-related volatility.
-    """
-    try:
-        # Read the Excel file with health spending data
-        df = pd.read_excel("data/cleaned_health_expenditure.xlsx")
-        
-        # Define column names for recent years (more stable than single year)
-        recent_cols_pct = ['2020 H.E.(% of GDP)', '2021 H.E.(% of GDP)', '2022 H.E.(% of GDP)']
-        recent_cols_per_capita = ['2020 H.E. per capita (USD)', '2021 H.E. per capita (USD)', '2022 H.E. per capita (USD)']
-        recent_cols_gdp = ['2020 GDP(USD) by mil', '2021 GDP(USD) by mil', '2022 GDP(USD) by mil']
-        
-        # Start with basic country info
-        clustering_data = df[['Country Name', 'Country Code']].copy()
-        
-        # Calculate 3-year averages for more stable clustering
-        # Fix: Convert decimal percentages to actual percentages (0.07 becomes 7%)
-        clustering_data['avg_he_pct_gdp'] = df[recent_cols_pct].mean(axis=1) * 100
-        
-        # Average spending per person in USD
-        clustering_data['avg_he_per_capita'] = df[recent_cols_per_capita].mean(axis=1)
-        
-        # Convert GDP from millions to billions (easier to work with)
-        clustering_data['avg_gdp_billions'] = df[recent_cols_gdp].mean(axis=1) / 1000
-        
-        # Clean up the data - keep countries with health spending info
-        initial_count = len(clustering_data)
-        clustering_data = clustering_data.dropna(subset=['avg_he_pct_gdp', 'avg_he_per_capita'])
-        final_count = len(clustering_data)
-        
-        # Debug info for troubleshooting
-        print(f"Data loaded: {initial_count} countries initially, {final_count} countries after cleaning")
-        print(f"Sample data ranges:")
-        print(f"Health Exp % GDP: {clustering_data['avg_he_pct_gdp'].min():.1f}% to {clustering_data['avg_he_pct_gdp'].max():.1f}%")
-        print(f"Health Exp per capita: ${clustering_data['avg_he_per_capita'].min():.0f} to ${clustering_data['avg_he_per_capita'].max():.0f}")
-        
-        return clustering_data, df
-        
-    except Exception as e:
-        st.error(f"Error loading health expenditure data: {e}")
-        return None, None
-
-def perform_health_access_clustering(data, n_clusters=4):
-    """
-    Group countries into 4 healthcare access clusters using K-means.
-    Each cluster represents a different healthcare access pattern.
-    """
-    # The three key metrics for healthcare access
-    features = ['avg_he_pct_gdp', 'avg_he_per_capita', 'avg_gdp_billions']
-    clustering_features = data[features].copy()
-    
-    # Handle any missing values (use median as sensible default)
-    for col in features:
-        clustering_features[col] = clustering_features[col].fillna(clustering_features[col].median())
-    
-    # Standardize all features so they're on the same scale
-    scaler = StandardScaler()
-    scaled_features = scaler.fit_transform(clustering_features)
-    
-    # Run K-means clustering to find 4 groups
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-    data['cluster'] = kmeans.fit_predict(scaled_features)
-    
-    # Calculate average characteristics of each cluster
-    cluster_stats = data.groupby('cluster')[features].mean()
-    
-    # Give each cluster a meaningful name based on its spending patterns
-    cluster_labels = {}
-    for cluster_id in range(n_clusters):
-        stats = cluster_stats.loc[cluster_id]
-        he_per_capita = stats['avg_he_per_capita']
-        he_pct_gdp = stats['avg_he_pct_gdp']
-        gdp = stats['avg_gdp_billions']
-        
-        # Label clusters based on spending patterns (thresholds from global data analysis)
-        if he_per_capita > 1500 and gdp > 100:  # Rich countries with high absolute spending
-            cluster_labels[cluster_id] = "High Access - Advanced Economy"
-        elif he_per_capita > 300 and he_pct_gdp > 6.0:  # Good spending with health priority
-            cluster_labels[cluster_id] = "Medium-High Access - Developing"
-        elif he_pct_gdp > 6.5 and he_per_capita < 400:  # High priority but limited resources
-            cluster_labels[cluster_id] = "High Priority - Limited Resources"
-        else:  # Lower spending across the board
-            cluster_labels[cluster_id] = "Low Access - Resource Constrained"
-    
-    # Add the cluster names to our data
-    data['cluster_label'] = data['cluster'].map(cluster_labels)
-    
-    # Show what we found (useful for debugging)
-    print(f"Cluster distribution:")
-    for cluster_id in range(n_clusters):
-        cluster_data = data[data['cluster'] == cluster_id]
-        label = cluster_labels[cluster_id]
-        print(f"  {label}: {len(cluster_data)} countries")
-        print(f"    Avg spending/capita: ${cluster_data['avg_he_per_capita'].mean():.0f}")
-        print(f"    Avg spending % GDP: {cluster_data['avg_he_pct_gdp'].mean():.1f}%")
-    
-    return data, cluster_stats, scaler, kmeans
-
-def create_cluster_bar_chart(data, metric, title):
-    """Make a bar chart comparing clusters on a specific metric"""
-    # Calculate averages and counts for each cluster
-    cluster_summary = data.groupby('cluster_label')[metric].agg(['mean', 'count']).reset_index()
-    cluster_summary.columns = ['Cluster', 'Average', 'Countries']
+@timed()
+def create_cluster_bar_chart(cluster_summary, metric, title):
+    """Make a bar chart comparing clusters on a specific metric (a cluster summary column)"""
+    # Averages and counts for each cluster, from the cluster summary
+    cluster_summary = pd.DataFrame({
+        'Cluster': cluster_summary.index,
+        'Average': cluster_summary[metric].to_numpy(),
+        'Countries': cluster_summary['countries'].to_numpy()
+    })
     
     # Use consistent colors across all visualizations
     color_map = {
@@ -206,6 +116,7 @@ def create_cluster_bar_chart(data, metric, title):
     
     return fig
 
+@timed()
 def create_scatter_plot(data, x_metric, y_metric, title):
     """Create scatter plot colored by cluster"""
     fig = px.scatter(
@@ -277,7 +188,281 @@ def create_scatter_plot(data, x_metric, y_metric, title):
     
     return fig
 
-def display_cluster_insights(data, cluster_stats):
+@timed()
+def create_cluster_sweep_chart(sweep, current_k):
+    """Elbow chart: inertia, silhouette and Davies-Bouldin for each cluster count"""
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=sweep['n_clusters'], y=sweep['inertia'],
+        mode='lines+markers', name='Inertia (within-cluster SS)',
+        line=dict(color='#3498db', width=3)
+    ))
+    fig.add_trace(go.Scatter(
+        x=sweep['n_clusters'], y=sweep['silhouette'],
+        mode='lines+markers', name='Silhouette (higher is better)',
+        line=dict(color='#2ecc71', width=2, dash='dash'), yaxis='y2'
+    ))
+    fig.add_trace(go.Scatter(
+        x=sweep['n_clusters'], y=sweep['davies_bouldin'],
+        mode='lines+markers', name='Davies-Bouldin (lower is better)',
+        line=dict(color='#e74c3c', width=2, dash='dot'), yaxis='y2'
+    ))
+
+    # Mark the cluster count used by the rest of the page
+    fig.add_vline(x=current_k, line_dash='dash', line_color='gray',
+                  annotation_text=f'k = {current_k} (used)', annotation_position='top')
+
+    fig.update_layout(
+        title=dict(text='Choosing the Number of Clusters', x=0.5, xanchor='center', font_size=16),
+        xaxis=dict(title='Number of Clusters (k)', dtick=1),
+        yaxis=dict(title='Inertia', tickformat=',.0f'),
+        yaxis2=dict(title='Silhouette / Davies-Bouldin', overlaying='y', side='right', showgrid=False),
+        height=500,
+        legend=dict(orientation='h', yanchor='bottom', y=-0.3, xanchor='center', x=0.5),
+        plot_bgcolor='rgba(248,248,248,0.8)',
+        paper_bgcolor='white'
+    )
+
+    return fig
+
+def display_cluster_sweep(data, current_k):
+    """K sweep section: elbow chart plus the quality scores for each k"""
+    st.markdown("---")
+    st.subheader("🔬 Cluster Count Exploration")
+
+    with st.spinner("Fitting K-means for each cluster count..."):
+        sweep = get_cluster_sweep(data)
+
+    if sweep.empty:
+        st.info("Not enough countries to compare cluster counts.")
+        return
+
+    col1, col2 = st.columns([3, 2])
+
+    with col1:
+        st.plotly_chart(create_cluster_sweep_chart(sweep, current_k), use_container_width=True)
+
+    with col2:
+        best_silhouette = int(sweep.loc[sweep['silhouette'].idxmax(), 'n_clusters'])
+        best_db = int(sweep.loc[sweep['davies_bouldin'].idxmin(), 'n_clusters'])
+        st.metric("Best k by Silhouette", best_silhouette)
+        st.metric("Best k by Davies-Bouldin", best_db)
+
+        st.dataframe(
+            sweep.rename(columns={
+                'n_clusters': 'k',
+                'inertia': 'Inertia',
+                'silhouette': 'Silhouette',
+                'davies_bouldin': 'Davies-Bouldin',
+                'smallest_cluster': 'Smallest Cluster'
+            }).style.format({'Inertia': '{:,.1f}', 'Silhouette': '{:.3f}', 'Davies-Bouldin': '{:.3f}'}),
+            use_container_width=True,
+            hide_index=True
+        )
+
+    st.caption(
+        "Look for the bend (elbow) in inertia, a high silhouette and a low Davies-Bouldin score. "
+        "A very small smallest cluster means k is splitting off outliers (e.g. the largest economies). "
+        f"The analysis above uses k = {current_k}."
+    )
+
+# Access tiers from lowest to highest, for ordered axes
+TIER_ORDER = [
+    'Low Access - Resource Constrained',
+    'High Priority - Limited Resources',
+    'Medium-High Access - Developing',
+    'High Access - Advanced Economy'
+]
+
+TIER_COLORS = {
+    'High Access - Advanced Economy': '#2ecc71',
+    'Medium-High Access - Developing': '#f39c12',
+    'High Priority - Limited Resources': '#3498db',
+    'Low Access - Resource Constrained': '#e74c3c'
+}
+
+@timed()
+def create_tier_composition_chart(yearly):
+    """Stacked bars: number of countries in each access tier per year"""
+    counts = yearly.groupby(['year', 'cluster_label']).size().reset_index(name='Countries')
+
+    fig = px.bar(
+        counts,
+        x='year',
+        y='Countries',
+        color='cluster_label',
+        color_discrete_map=TIER_COLORS,
+        category_orders={'cluster_label': TIER_ORDER[::-1]},
+        title='Countries per Access Tier by Year'
+    )
+    fig.update_layout(
+        title=dict(x=0.5, xanchor='center', font_size=16),
+        xaxis=dict(title='Year', dtick=1),
+        legend_title='Access Cluster',
+        height=450,
+        plot_bgcolor='rgba(248,248,248,0.8)',
+        paper_bgcolor='white'
+    )
+    return fig
+
+@timed()
+def create_trajectory_chart(yearly, countries):
+    """Access tier of each selected country over the years"""
+    selected = yearly[yearly['Country Name'].isin(countries)]
+
+    fig = px.line(
+        selected,
+        x='year',
+        y='cluster_label',
+        color='Country Name',
+        markers=True,
+        category_orders={'cluster_label': TIER_ORDER},
+        title='Access Tier Trajectories'
+    )
+    fig.update_layout(
+        title=dict(x=0.5, xanchor='center', font_size=16),
+        xaxis=dict(title='Year', dtick=1),
+        yaxis_title='',
+        height=450,
+        plot_bgcolor='rgba(248,248,248,0.8)',
+        paper_bgcolor='white'
+    )
+    return fig
+
+def display_access_trajectories(raw_data, selected_clusters):
+    """Per-year clustering: tier sizes over time and the countries that moved between tiers"""
+    with st.spinner("Clustering each year..."):
+        yearly, trajectories = get_yearly_health_access_clusters(raw_data)
+
+    st.plotly_chart(create_tier_composition_chart(yearly), use_container_width=True)
+
+    # Countries that started or ended in one of the selected tiers and changed tier at least once
+    movers = trajectories[
+        (trajectories['tier_changes'] > 0) &
+        (trajectories['first_tier'].isin(selected_clusters) | trajectories['latest_tier'].isin(selected_clusters))
+    ].sort_values(['tier_changes', 'Country Name'], ascending=[False, True])
+
+    first_year, last_year = yearly['year'].min(), yearly['year'].max()
+    col1, col2 = st.columns([3, 2])
+
+    with col2:
+        st.metric(f"Countries That Changed Tier ({first_year}-{last_year})", len(movers))
+        st.dataframe(
+            movers[['Country Name', 'first_tier', 'latest_tier', 'tier_changes']].rename(columns={
+                'first_tier': f'{first_year} Tier',
+                'latest_tier': f'{last_year} Tier',
+                'tier_changes': 'Changes'
+            }),
+            use_container_width=True,
+            hide_index=True,
+            height=350
+        )
+
+    with col1:
+        countries = st.multiselect(
+            "Countries to Follow",
+            sorted(trajectories['Country Name']),
+            default=list(movers['Country Name'].head(5)),
+            help="Show how these countries' access tiers changed over time",
+            key="trajectory_countries"
+        )
+        if countries:
+            st.plotly_chart(create_trajectory_chart(yearly, countries), use_container_width=True)
+
+    st.caption(
+        f"Each year from {first_year} to {last_year} is clustered separately on one shared scale, and each year's "
+        "clusters are matched to the same reference clusters by centroid, so tiers are comparable across years."
+    )
+
+@timed()
+def get_outcomes_by_tier(epidemic_access, disease, clusters):
+    """Outbreak totals and death rates per access tier for one disease"""
+    outcomes = epidemic_access.xs(disease, level='disease')
+    outcomes = outcomes[outcomes['cluster_label'].isin(clusters)]
+
+    by_tier = outcomes.groupby('cluster_label').agg(
+        countries=('country', 'size'),
+        total_cases=('total_cases', 'sum'),
+        total_deaths=('total_deaths', 'sum'),
+        median_death_rate=('death_rate', 'median')
+    )
+    by_tier['pooled_death_rate'] = np.where(
+        by_tier['total_cases'] > 0, by_tier['total_deaths'] / by_tier['total_cases'] * 100, np.nan
+    )
+    return by_tier.reset_index()
+
+def display_outcomes_by_tier(disease, clusters):
+    """Outbreak outcomes for the selected disease, compared across access tiers"""
+    st.markdown("---")
+    st.subheader(f"🦠 {disease} Outcomes by Access Tier")
+
+    epidemic_access = load_epidemic_access_data()
+    if epidemic_access is None:
+        return
+
+    by_tier = get_outcomes_by_tier(epidemic_access, disease, clusters)
+    if by_tier.empty:
+        st.info(f"No {disease} data for the selected clusters.")
+        return
+
+    col1, col2 = st.columns([3, 2])
+
+    with col1:
+        chart_data = by_tier.melt(
+            id_vars='cluster_label',
+            value_vars=['median_death_rate', 'pooled_death_rate'],
+            var_name='Measure',
+            value_name='Death Rate (%)'
+        )
+        chart_data['Measure'] = chart_data['Measure'].map({
+            'median_death_rate': 'Median country death rate',
+            'pooled_death_rate': 'Pooled (all deaths / all cases)'
+        })
+        fig = px.bar(
+            chart_data,
+            x='cluster_label',
+            y='Death Rate (%)',
+            color='Measure',
+            barmode='group',
+            title=f'{disease} Death Rate by Access Tier',
+            color_discrete_sequence=['#3498db', '#e74c3c']
+        )
+        fig.update_layout(
+            title=dict(x=0.5, xanchor='center', font_size=16),
+            xaxis_title='Healthcare Access Cluster',
+            height=450,
+            legend=dict(orientation='h', yanchor='bottom', y=-0.45, xanchor='center', x=0.5),
+            plot_bgcolor='rgba(248,248,248,0.8)',
+            paper_bgcolor='white'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        st.dataframe(
+            by_tier.rename(columns={
+                'cluster_label': 'Cluster',
+                'countries': 'Countries',
+                'total_cases': 'Total Cases',
+                'total_deaths': 'Total Deaths',
+                'median_death_rate': 'Median Death Rate (%)',
+                'pooled_death_rate': 'Pooled Death Rate (%)'
+            }).style.format({
+                'Total Cases': '{:,.0f}',
+                'Total Deaths': '{:,.0f}',
+                'Median Death Rate (%)': '{:.2f}',
+                'Pooled Death Rate (%)': '{:.2f}'
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+
+    st.caption(
+        "Countries are matched on ISO3 codes. Death rates are reported deaths over reported cases, "
+        "so they also reflect testing and reporting differences, not only healthcare access."
+    )
+
+def display_cluster_insights(data, cluster_summary):
     """Display insights about each cluster"""
     st.subheader("🔍 Cluster Analysis & Insights")
     
@@ -312,21 +497,18 @@ def display_cluster_insights(data, cluster_stats):
     st.markdown("---")
     
     # Detailed cluster insights
-    for cluster_id in sorted(data['cluster'].unique()):
-        cluster_data = data[data['cluster'] == cluster_id]
-        cluster_label = cluster_data['cluster_label'].iloc[0]
-        
-        # Calculate cluster statistics
-        cluster_size = len(cluster_data)
-        cluster_he_per_capita = cluster_data['avg_he_per_capita'].mean()
-        cluster_he_pct_gdp = cluster_data['avg_he_pct_gdp'].mean()
-        cluster_gdp = cluster_data['avg_gdp_billions'].mean()
+    for cluster_label, cluster in cluster_summary.iterrows():
+        # Cluster statistics from the precomputed summary
+        cluster_size = cluster['countries']
+        cluster_he_per_capita = cluster['avg_he_per_capita']
+        cluster_he_pct_gdp = cluster['avg_he_pct_gdp']
+        cluster_gdp = cluster['avg_gdp_billions']
         
         # Get sample countries
-        sample_countries = cluster_data['Country Name'].head(5).tolist()
+        sample_countries = cluster['sample_members']
         countries_text = ", ".join(sample_countries)
-        if len(cluster_data) > 5:
-            countries_text += f" and {len(cluster_data) - 5} more"
+        if cluster_size > len(sample_countries):
+            countries_text += f" and {cluster_size - len(sample_countries)} more"
         
         # Color coding for different cluster types
         if "High Access" in cluster_label:
@@ -352,6 +534,8 @@ def display_cluster_insights(data, cluster_stats):
         </div>
         """, unsafe_allow_html=True)
 
+@with_perf_panel("Healthcare Access")
+@profile_slow_reruns("Healthcare Access")
 def main():
     # Enhanced header with styling
     st.markdown("""
@@ -465,7 +649,7 @@ def main():
     
     # Perform clustering
     with st.spinner("Performing healthcare access clustering analysis..."):
-        clustered_data, cluster_stats, scaler, kmeans = perform_health_access_clustering(data)
+        clustered_data, cluster_stats, scaler, kmeans, cluster_summary = get_health_access_clusters(data)
     
     # Sidebar for filtering
     st.sidebar.header("🎛️ Cluster Analysis Controls")
@@ -489,8 +673,13 @@ def main():
     # Filter data based on selection
     if selected_clusters:
         filtered_data = clustered_data[clustered_data['cluster_label'].isin(selected_clusters)]
+        filtered_summary = cluster_summary.reindex(selected_clusters)
     else:
         filtered_data = clustered_data
+        filtered_summary = cluster_summary
+    
+    # Country rows per cluster, split once for the per-cluster chart traces
+    cluster_groups = dict(tuple(filtered_data.groupby('cluster_label')))
     
     if filtered_data.empty:
         st.warning("No data available for selected clusters.")
@@ -510,12 +699,21 @@ def main():
         help="Choose which disease to analyze"
     )
     
+    # Cluster count sweep (fits K-means for k = 2..10, cached after the first run)
+    explore_k = st.sidebar.checkbox(
+        "Explore Cluster Count",
+        value=False,
+        help="Compare inertia, silhouette and Davies-Bouldin scores for different numbers of clusters"
+    )
+    
+    note_inputs(clusters=selected_clusters, compare_mode=compare_mode, disease=selected_disease, explore_k=explore_k)
+    
     # Visualization Section
     st.markdown("---")
     st.subheader("📊 Healthcare Access Cluster Visualizations")
     
     # Create tabs for different visualizations
-    tab1, tab2, tab3 = st.tabs(["💰 Health Spending", "🌍 Global Distribution", "📈 Economic Patterns"])
+    tab1, tab2, tab3, tab4 = st.tabs(["💰 Health Spending", "🌍 Global Distribution", "📈 Economic Patterns", "📅 Access Over Time"])
     
     with tab1:
         col1, col2 = st.columns(2)
@@ -523,7 +721,7 @@ def main():
         with col1:
             # Health expenditure per capita by cluster
             fig1 = create_cluster_bar_chart(
-                filtered_data, 
+                filtered_summary, 
                 'avg_he_per_capita', 
                 'Average Health Expenditure per Capita by Access Cluster'
             )
@@ -532,7 +730,7 @@ def main():
         with col2:
             # Health expenditure as % of GDP by cluster
             fig2 = create_cluster_bar_chart(
-                filtered_data, 
+                filtered_summary, 
                 'avg_he_pct_gdp', 
                 'Average Health Expenditure (% of GDP) by Access Cluster'
             )
@@ -602,7 +800,7 @@ def main():
             
             # Add traces for each cluster
             for cluster_label in selected_clusters:
-                cluster_data = data_for_plot[data_for_plot['cluster_label'] == cluster_label]
+                cluster_data = data_for_plot.loc[cluster_groups[cluster_label].index]
                 
                 # Calculate point sizes based on GDP (larger GDP = larger points)
                 gdp_sizes = cluster_data['avg_gdp_billions']
@@ -685,9 +883,8 @@ def main():
             # Add cluster centers if selected
             if show_cluster_centers:
                 for cluster_label in selected_clusters:
-                    cluster_data = filtered_data[filtered_data['cluster_label'] == cluster_label]
-                    center_x = cluster_data['avg_he_per_capita'].mean()
-                    center_y = cluster_data['avg_he_pct_gdp'].mean()
+                    center_x = filtered_summary.loc[cluster_label, 'avg_he_per_capita']
+                    center_y = filtered_summary.loc[cluster_label, 'avg_he_pct_gdp']
                     
                     fig3.add_trace(go.Scatter(
                         x=[center_x],
@@ -713,16 +910,15 @@ def main():
         st.markdown("### 📈 Cluster Summary Statistics")
         
         summary_stats = []
-        for cluster_label in selected_clusters:
-            cluster_data = filtered_data[filtered_data['cluster_label'] == cluster_label]
+        for cluster_label, cluster in filtered_summary.iterrows():
             stats = {
                 'Cluster': cluster_label,
-                'Countries': len(cluster_data),
-                'Avg Health Spending/Capita': f"${cluster_data['avg_he_per_capita'].mean():.0f}",
-                'Avg Health Spending (% GDP)': f"{cluster_data['avg_he_pct_gdp'].mean():.1f}%",
-                'Avg GDP': f"${cluster_data['avg_gdp_billions'].mean():.0f}B",
-                'Health Spending Range': f"${cluster_data['avg_he_per_capita'].min():.0f} - ${cluster_data['avg_he_per_capita'].max():.0f}",
-                'GDP % Range': f"{cluster_data['avg_he_pct_gdp'].min():.1f}% - {cluster_data['avg_he_pct_gdp'].max():.1f}%"
+                'Countries': cluster['countries'],
+                'Avg Health Spending/Capita': f"${cluster['avg_he_per_capita']:.0f}",
+                'Avg Health Spending (% GDP)': f"{cluster['avg_he_pct_gdp']:.1f}%",
+                'Avg GDP': f"${cluster['avg_gdp_billions']:.0f}B",
+                'Health Spending Range': f"${cluster['min_he_per_capita']:.0f} - ${cluster['max_he_per_capita']:.0f}",
+                'GDP % Range': f"{cluster['min_he_pct_gdp']:.1f}% - {cluster['max_he_pct_gdp']:.1f}%"
             }
             summary_stats.append(stats)
         
@@ -733,11 +929,10 @@ def main():
         # Countries by cluster table with better formatting
         st.subheader("🗺️ Countries by Healthcare Access Cluster")
         
-        for cluster_label in selected_clusters:
-            cluster_countries = filtered_data[filtered_data['cluster_label'] == cluster_label]['Country Name'].tolist()
-            cluster_data = filtered_data[filtered_data['cluster_label'] == cluster_label]
-            avg_spending = cluster_data['avg_he_per_capita'].mean()
-            avg_gdp_pct = cluster_data['avg_he_pct_gdp'].mean()
+        for cluster_label, cluster in filtered_summary.iterrows():
+            cluster_countries = cluster['members']
+            avg_spending = cluster['avg_he_per_capita']
+            avg_gdp_pct = cluster['avg_he_pct_gdp']
             
             # Color coding for cluster headers
             if "High Access" in cluster_label:
@@ -787,7 +982,7 @@ def main():
             show_trend_lines = st.checkbox(
                 "Show Trend Lines",
                 value=False,
-                help="Add trend lines for each cluster"
+                help="Add trend lines for each cluster (a log-log fit when the GDP axis uses log scale)"
             )
         
         with col1:
@@ -804,7 +999,7 @@ def main():
             
             # Add traces for each cluster with enhanced visibility
             for cluster_label in selected_clusters:
-                cluster_data = filtered_data[filtered_data['cluster_label'] == cluster_label]
+                cluster_data = cluster_groups[cluster_label]
                 
                 # Calculate point sizes based on health spending % of GDP
                 he_pct_sizes = cluster_data['avg_he_pct_gdp']
@@ -840,39 +1035,25 @@ def main():
                     )
                 ))
                 
-                # Add trend lines if selected
-                if show_trend_lines and len(cluster_data) > 2:
-                    import numpy as np
-                    
-                    # Calculate linear regression
-                    x_vals = cluster_data['avg_gdp_billions'].values
-                    y_vals = cluster_data['avg_he_per_capita'].values
+                # Add trend lines if selected (fitted once per cluster with the clustering);
+                # on the log GDP axis the log-log (power law) fit is shown
+                trend_column = 'loglog_trend_line' if econ_log_scale else 'trend_line'
+                if show_trend_lines and filtered_summary.loc[cluster_label, trend_column] is not None:
+                    x_trend, y_trend = filtered_summary.loc[cluster_label, trend_column]
                     
-                    # Remove any infinite or NaN values
-                    valid_mask = np.isfinite(x_vals) & np.isfinite(y_vals)
-                    x_vals = x_vals[valid_mask]
-                    y_vals = y_vals[valid_mask]
-                    
-                    if len(x_vals) > 1:
-                        z = np.polyfit(x_vals, y_vals, 1)
-                        p = np.poly1d(z)
-                        
-                        x_trend = np.linspace(x_vals.min(), x_vals.max(), 100)
-                        y_trend = p(x_trend)
-                        
-                        fig4.add_trace(go.Scatter(
-                            x=x_trend,
-                            y=y_trend,
-                            mode='lines',
-                            name=f'{cluster_label} Trend',
-                            line=dict(
-                                color=cluster_colors.get(cluster_label, '#666666'),
-                                width=2,
-                                dash='dot'
-                            ),
-                            showlegend=False,
-                            hoverinfo='skip'
-                        ))
+                    fig4.add_trace(go.Scatter(
+                        x=x_trend,
+                        y=y_trend,
+                        mode='lines',
+                        name=f'{cluster_label} Trend',
+                        line=dict(
+                            color=cluster_colors.get(cluster_label, '#666666'),
+                            width=2,
+                            dash='dot'
+                        ),
+                        showlegend=False,
+                        hoverinfo='skip'
+                    ))
             
             # Update layout
             fig4.update_layout(
@@ -931,20 +1112,16 @@ def main():
         
         # Calculate correlations and insights
         insights_data = []
-        for cluster_label in selected_clusters:
-            cluster_data = filtered_data[filtered_data['cluster_label'] == cluster_label]
-            
-            if len(cluster_data) > 1:
-                # Calculate correlation between GDP and health spending per capita
-                gdp_he_corr = cluster_data['avg_gdp_billions'].corr(cluster_data['avg_he_per_capita'])
-                
+        for cluster_label, cluster in filtered_summary.iterrows():
+            if cluster['countries'] > 1:
+                # Correlation between GDP and health spending per capita, from the cluster summary
                 insights_data.append({
                     'Cluster': cluster_label,
-                    'Countries': len(cluster_data),
-                    'GDP-Health Spending Correlation': f"{gdp_he_corr:.3f}",
-                    'Efficiency Ratio': f"{(cluster_data['avg_he_per_capita'] / cluster_data['avg_he_pct_gdp']).mean():.0f}",
-                    'Top Spender': cluster_data.loc[cluster_data['avg_he_per_capita'].idxmax(), 'Country Name'],
-                    'Most Efficient (% GDP)': cluster_data.loc[cluster_data['avg_he_pct_gdp'].idxmax(), 'Country Name']
+                    'Countries': cluster['countries'],
+                    'GDP-Health Spending Correlation': f"{cluster['gdp_he_correlation']:.3f}",
+                    'Efficiency Ratio': f"{cluster['efficiency_ratio']:.0f}",
+                    'Top Spender': cluster['top_spender'],
+                    'Most Efficient (% GDP)': cluster['top_pct_gdp']
                 })
         
         if insights_data:
@@ -960,8 +1137,16 @@ def main():
             - **Most Efficient (% GDP)**: Country dedicating the highest percentage of GDP to health in each cluster
             """)
     
+    with tab4:
+        display_access_trajectories(raw_data, selected_clusters)
+    
+    display_outcomes_by_tier(selected_disease, selected_clusters or available_clusters)
+    
+    if explore_k:
+        display_cluster_sweep(data, len(cluster_stats))
+    
     # Display insights
-    display_cluster_insights(filtered_data, cluster_stats)
+    display_cluster_insights(filtered_data, filtered_summary)
     
     # Data reliability disclaimer
     st.markdown("---")
@@ -0,0 +1,117 @@
+"""
+Canonical ISO3 country codes for joining the datasets.
+
+The epidemic sources spell countries their own way ("South Korea", "Russia",
+"Cape Verde") while the World Bank tables use their own names ("Korea, Rep.",
+"Russian Federation", "Cabo Verde") plus ISO3 codes. Names are resolved against
+the World Bank country list first, then against COUNTRY_ALIASES, which covers
+the epidemic spellings the World Bank doesn't use.
+"""
+
+import pandas as pd
+import os
+
+# Epidemic data spellings -> ISO3 (World Bank names resolve on their own)
+COUNTRY_ALIASES = {
+    'Anguilla': 'AIA',
+    'Bahamas': 'BHS',
+    'Bonaire Sint Eustatius and Saba': 'BES',
+    'Bosnia And Herzegovina': 'BIH',
+    'Brunei': 'BRN',
+    'Cape Verde': 'CPV',
+    'Congo': 'COG',
+    "Cote d'Ivoire": 'CIV',
+    'Curacao': 'CUW',
+    'Curaçao': 'CUW',
+    'Czech Republic': 'CZE',
+    'Democratic Republic of Congo': 'COD',
+    'Egypt': 'EGY',
+    'Faeroe Islands': 'FRO',
+    'Falkland Islands': 'FLK',
+    'Gambia': 'GMB',
+    'Guadeloupe': 'GLP',
+    'Guernsey': 'GGY',
+    'Hong Kong': 'HKG',
+    'Iran': 'IRN',
+    'Jersey': 'JEY',
+    'Kosovo': 'XKX',
+    'Kyrgyzstan': 'KGZ',
+    'Laos': 'LAO',
+    'Macedonia': 'MKD',
+    'Martinique': 'MTQ',
+    'Montserrat': 'MSR',
+    'Palestine': 'PSE',
+    'Republic of Korea': 'KOR',
+    'Republic of the Congo': 'COG',
+    'Russia': 'RUS',
+    'Saint Kitts and Nevis': 'KNA',
+    'Saint Lucia': 'LCA',
+    'Saint Martin (French part)': 'MAF',
+    'Saint Vincent and the Grenadines': 'VCT',
+    'Sao Tome and Principe': 'STP',
+    'Slovakia': 'SVK',
+    'South Korea': 'KOR',
+    'Swaziland': 'SWZ',
+    'Syria': 'SYR',
+    'Taiwan': 'TWN',
+    'Timor': 'TLS',
+    'Turkey': 'TUR',
+    'United States Virgin Islands': 'VIR',
+    'Vatican': 'VAT',
+    'Venezuela': 'VEN',
+    'Vietnam': 'VNM',
+    'Western Sahara': 'ESH',
+    'Yemen': 'YEM'
+}
+
+# Entries in the epidemic data that aren't countries (e.g. cruise ship cases)
+NON_COUNTRIES = {'International'}
+
+# Any World Bank download carries the full country list on this sheet
+WORLD_BANK_COUNTRY_FILE = "GDP [uncleaned].xls"
+
+def load_world_bank_names(data_dir="data"):
+    """
+    World Bank country name -> ISO3, from the 'Metadata - Countries' sheet of a raw download.
+    Reading the .xls needs xlrd; without it this raises rather than quietly returning
+    no names (which would leave only the aliases to match countries on).
+    """
+    path = os.path.join(data_dir, WORLD_BANK_COUNTRY_FILE)
+    if not os.path.exists(path):
+        print(f"⚠️ {path} not found: only the built-in aliases can be matched to ISO3 codes")
+        return {}
+
+    countries = pd.read_excel(path, sheet_name="Metadata - Countries")
+    countries = countries.dropna(subset=['Country Code', 'TableName'])
+    return dict(zip(countries['TableName'], countries['Country Code']))
+
+def build_iso3_lookup(data_dir="data", extra_names=None):
+    """
+    Country name -> ISO3 for every spelling we know: World Bank names, any extra
+    (name -> code) pairs such as the health expenditure table's, and the aliases
+    """
+    lookup = load_world_bank_names(data_dir)
+    if extra_names:
+        lookup.update(extra_names)
+    lookup.update(COUNTRY_ALIASES)
+    return lookup
+
+def to_iso3(names, lookup):
+    """ISO3 code for each name in a Series (missing where the name isn't a known country)"""
+    # Resolve each distinct name once, then broadcast back to the rows
+    unique_names = pd.Series(names.unique())
+    codes = unique_names.map(lambda name: None if name in NON_COUNTRIES else lookup.get(name))
+    return names.map(dict(zip(unique_names, codes)))
+
+def population_by_iso3(table, lookup, code_column='iso_code', name_column='location'):
+    """
+    Latest population per ISO3 code from a table that carries its own codes (such as
+    the OWID COVID-19 data). Rows that aren't countries, or whose name resolves to a
+    different code than the one on the row (the source mislabels a few), are dropped.
+    """
+    resolved = to_iso3(table[name_column], lookup)
+    consistent = resolved.isna() | (resolved == table[code_column])
+    countries = table[consistent & table[code_column].notna() & ~table[name_column].isin(NON_COUNTRIES)]
+    if 'date' in countries.columns:
+        countries = countries.sort_values('date')
+    return countries.groupby(code_column)['population'].last().dropna()
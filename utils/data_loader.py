@@ -0,0 +1,116 @@
+"""
+Cached data loaders shared by the pages and the warmup script.
+
+Streamlit keys st.cache_data/st.cache_resource entries by the function's module
+and source, so keeping the loaders in one importable module lets every page share
+a single cache entry and lets utils/warmup.py fill those caches before the server
+accepts traffic.
+"""
+
+import streamlit as st
+import pandas as pd
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.forecast_store import ForecastStore
+from utils.instrumentation import timed, track_cache
+
+@track_cache("data")
+@st.cache_data
+@timed()
+def load_epidemic_data():
+    """Load processed epidemic data and metadata"""
+    try:
+        # Load unified dataset
+        data = pd.read_csv("data/processed/unified_epidemic_data.csv")
+        data['date'] = pd.to_datetime(data['date'])
+        
+        # Load metadata
+        with open("data/processed/disease_metadata.json", "r") as f:
+            metadata = json.load(f)
+        
+        # Load summary stats
+        with open("data/processed/data_summary.json", "r") as f:
+            summary = json.load(f)
+        
+        return data, metadata, summary
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        return None, None, None
+
+@track_cache("data")
+@st.cache_data
+@timed()
+def filter_data(data, disease, countries, date_range):
+    """Filter data based on user selections"""
+    filtered = data[data['disease'] == disease].copy()
+    
+    if countries:
+        filtered = filtered[filtered['country'].isin(countries)]
+    
+    if date_range:
+        start_date, end_date = date_range
+        filtered = filtered[
+            (filtered['date'] >= pd.to_datetime(start_date)) & 
+            (filtered['date'] <= pd.to_datetime(end_date))
+        ]
+    
+    return filtered
+
+@track_cache("data")
+@st.cache_data
+@timed()
+def load_health_expenditure_data():
+    """
+    Load World Bank health expenditure data prepared for clustering.
+    The 2020-2022 averages (smoothing out pandemic-related volatility) are precomputed
+    by HealthExpenditureProcessor (python utils/data_processor.py).
+    """
+    try:
+        # Read the prebuilt health expenditure table
+        df = pd.read_parquet("data/processed/health_expenditure.parquet")
+        
+        # Country info plus the precomputed 3-year averages
+        clustering_data = df[['Country Name', 'Country Code', 'avg_he_pct_gdp', 'avg_he_per_capita', 'avg_gdp_billions']].copy()
+        
+        # Clean up the data - keep countries with health spending info
+        initial_count = len(clustering_data)
+        clustering_data = clustering_data.dropna(subset=['avg_he_pct_gdp', 'avg_he_per_capita'])
+        final_count = len(clustering_data)
+        
+        # Debug info for troubleshooting
+        print(f"Data loaded: {initial_count} countries initially, {final_count} countries after cleaning")
+        print(f"Sample data ranges:")
+        print(f"Health Exp % GDP: {clustering_data['avg_he_pct_gdp'].min():.1f}% to {clustering_data['avg_he_pct_gdp'].max():.1f}%")
+        print(f"Health Exp per capita: ${clustering_data['avg_he_per_capita'].min():.0f} to ${clustering_data['avg_he_per_capita'].max():.0f}")
+        
+        return clustering_data, df
+        
+    except Exception as e:
+        st.error(f"Error loading health expenditure data: {e}")
+        return None, None
+
+@track_cache("data")
+@st.cache_data
+@timed()
+def load_epidemic_access_data():
+    """
+    Outbreak metrics per country and disease joined with each country's health
+    expenditure averages and access cluster, indexed by (iso3, disease).
+    Built at ingest by EpidemicAccessProcessor (python utils/data_processor.py).
+    """
+    try:
+        return pd.read_parquet("data/processed/epidemic_access.parquet")
+    except Exception as e:
+        st.error(f"Error loading epidemic × access data: {e}")
+        return None
+
+@st.cache_resource
+def get_forecast_store():
+    """Precomputed forecasts for the current processed dataset (written by utils/precompute_forecasts.py)"""
+    try:
+        return ForecastStore()
+    except OSError:
+        return None
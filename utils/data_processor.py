@@ -1,8 +1,13 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
+import argparse
 import json
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.instrumentation import timed
 
 class EpidemicDataProcessor:
     """
@@ -10,10 +15,29 @@ class EpidemicDataProcessor:
     for the epidemic dashboard
     """
     
+    # Metrics also stored per 100,000 people (as '<metric>_per_100k')
+    PER_100K_METRICS = ['total_cases', 'new_cases', 'total_deaths', 'new_deaths']
+    
+    # Calendar alignment rules: cumulative totals are interpolated across missing days,
+    # and daily counts around a gap are re-derived from the filled totals
+    CUMULATIVE_METRICS = ['total_cases', 'total_deaths']
+    DAILY_METRICS = ['new_cases', 'new_deaths']
+    
+    # Series pivoted together during alignment; bounds the dense (days x series) arrays
+    ALIGN_BATCH_SERIES = 2000
+    
+    # Trailing windows (days) for the rolling averages of the daily counts
+    ROLLING_WINDOWS = [7, 14]
+    
+    # Typical serial interval (days) per disease, for the reproduction number proxy
+    SERIAL_INTERVALS = {'COVID-19': 5, 'SARS': 8, 'Monkeypox': 9}
+    DEFAULT_SERIAL_INTERVAL = 5
+    
     def __init__(self, data_dir="data"):
         self.data_dir = data_dir
         self.unified_data = None
         self.metadata = {}
+        self.population = None  # Population by ISO3 code, set by load_covid_data
         
         # Country name standardization mapping
         self.country_mapping = {
@@ -29,6 +53,7 @@ class EpidemicDataProcessor:
             "Republic of Congo": "Republic of the Congo"
         }
     
+    @timed()
     def load_covid_data(self):
         """Load and process COVID-19 dataset"""
         print("Processing COVID-19 data...")
@@ -36,9 +61,13 @@ class EpidemicDataProcessor:
         try:
             covid_df = pd.read_csv(f"{self.data_dir}/cleaned_covid_data.csv")
             
-            # Select relevant columns and rename for consistency
-            covid_processed = covid_df[['location', 'date', 'total_cases', 'new_cases', 
-                                      'total_deaths', 'new_deaths', 'continent']].copy()
+            # Select relevant columns and rename for consistency (population, when the
+            # OWID file carries it, becomes the population dimension for every disease)
+            columns = ['location', 'date', 'total_cases', 'new_cases', 'total_deaths', 'new_deaths', 'continent']
+            if 'population' in covid_df.columns:
+                columns.append('population')
+            covid_processed = covid_df[columns].copy()
+            self.population = self.load_population(covid_df)
             
             # Add disease identifier
             covid_processed['disease'] = 'COVID-19'
@@ -75,6 +104,19 @@ class EpidemicDataProcessor:
             print(f"❌ Error processing COVID-19 data: {e}")
             return pd.DataFrame()
     
+    def load_population(self, covid_df):
+        """
+        Latest population per ISO3 code from the OWID COVID-19 rows, which carry their
+        own codes (country_codes.population_by_iso3 drops the mislabeled ones).
+        None when the file has no codes or population.
+        """
+        from utils.country_codes import build_iso3_lookup, population_by_iso3
+        
+        if not {'iso_code', 'location', 'population'} <= set(covid_df.columns):
+            return None
+        return population_by_iso3(covid_df, build_iso3_lookup(self.data_dir))
+    
+    @timed()
     def load_sars_data(self):
         """Load and process SARS dataset"""
         print("Processing SARS data...")
@@ -183,6 +225,7 @@ class EpidemicDataProcessor:
             print(f"❌ Error processing SARS data: {e}")
             return pd.DataFrame()
     
+    @timed()
     def load_monkeypox_data(self):
         """Load and process Monkeypox dataset"""
         print("Processing Monkeypox data...")
@@ -264,6 +307,7 @@ class EpidemicDataProcessor:
             print(f"❌ Error processing Monkeypox data: {e}")
             return pd.DataFrame()
     
+    @timed()
     def create_unified_dataset(self):
         """Combine all disease datasets into unified format"""
         print("\n🔄 Creating unified epidemic dataset...")
@@ -289,6 +333,15 @@ class EpidemicDataProcessor:
         numeric_cols = ['total_cases', 'new_cases', 'total_deaths', 'new_deaths']
         self.unified_data[numeric_cols] = self.unified_data[numeric_cols].astype(float)
         
+        # One row per series per day, so downstream math can treat rows as equally spaced
+        self.unified_data = self.align_to_daily_calendar(self.unified_data)
+        
+        # Population and per-100k metrics for every disease
+        self.unified_data = self.add_population_metrics(self.unified_data, self.population)
+        
+        # Rolling averages and growth indicators, so pages don't smooth per request
+        self.unified_data = self.add_rolling_metrics(self.unified_data)
+        
         print(f"✅ Unified dataset created: {len(self.unified_data)} total records")
         print(f"📊 Diseases: {self.unified_data['disease'].unique().tolist()}")
         print(f"🌍 Countries: {len(self.unified_data['country'].unique())} unique countries")
@@ -296,6 +349,196 @@ class EpidemicDataProcessor:
         
         return self.unified_data
     
+    @timed()
+    def align_to_daily_calendar(self, unified_data):
+        """
+        Reindex every (disease, country) series onto a dense daily calendar running from
+        its first to its last report, pivoting many series at once:
+        - Reports for the same date (source regions mapped to one country) are summed
+        - Cumulative totals are interpolated linearly across days without a report
+        - Daily counts on those days, and on the report that ends the gap, are the
+          differences of the filled totals (never below zero), so a backlog is spread
+          over the days it covers
+        - Per-series columns (region, population) are carried to the new days
+        - 'reported' marks the rows that came from a source report
+        
+        Run it before the derived columns (per-100k, rolling) are added; they aren't kept.
+        Series are pivoted ALIGN_BATCH_SERIES at a time, which bounds memory on large inputs.
+        """
+        keys = ['disease', 'country']
+        metrics = self.CUMULATIVE_METRICS + self.DAILY_METRICS
+        static_columns = [col for col in ['region', 'population'] if col in unified_data.columns]
+        
+        reports = unified_data.groupby(keys + ['date'], sort=False)[metrics].sum(min_count=1).reset_index()
+        
+        # Days since each series' first report, so one pivot covers every disease's period
+        first_report = reports.groupby(keys)['date'].transform('min')
+        reports['day'] = (reports['date'] - first_report).dt.days
+        reports['reported'] = 1.0
+        
+        # Pivot a batch of series at a time (in key order, so the output stays sorted)
+        series_number = reports.groupby(keys).ngroup()
+        batches = reports.groupby(series_number // self.ALIGN_BATCH_SERIES)
+        aligned = pd.concat([self._fill_daily_calendar(batch, keys, metrics) for _, batch in batches], ignore_index=True)
+        
+        if static_columns:
+            per_series = unified_data.groupby(keys)[static_columns].first()
+            aligned = aligned.join(per_series, on=keys)
+        
+        added = len(aligned) - len(unified_data)
+        print(f"📅 Aligned {series_number.max() + 1} series to a daily calendar ({added:+,} rows)")
+        
+        return aligned[[col for col in unified_data.columns if col in aligned.columns] + ['reported']]
+    
+    def _fill_daily_calendar(self, reports, keys, metrics):
+        """Dense daily rows for the series in reports (one row per source report, with 'day' and 'reported')"""
+        wide = reports.pivot(index='day', columns=keys, values=metrics + ['reported'])
+        wide = wide.reindex(np.arange(wide.index.max() + 1))
+        
+        reported = wide['reported'].notna().to_numpy()
+        n_days = len(wide)
+        
+        # Last report on or before, and next report on or after, every day of every series
+        days = np.arange(n_days)[:, None]
+        previous_report = np.maximum.accumulate(np.where(reported, days, 0), axis=0)
+        next_report = np.minimum.accumulate(np.where(reported, days, n_days)[::-1], axis=0)[::-1]
+        in_series = next_report < n_days
+        next_report = np.minimum(next_report, n_days - 1)
+        
+        # Fill rules: interpolate the totals between reports, then re-derive the daily counts
+        # on the missing days and on the report that ends each gap. A total that drops across
+        # a gap (a source correction) gives no negative days: like the loaders, counts are
+        # clipped at zero
+        span = next_report - previous_report
+        weight = np.divide(days - previous_report, span, out=np.zeros(span.shape), where=span > 0)
+        gap = ~reported
+        rederive = gap | np.vstack([np.zeros((1, gap.shape[1]), dtype=bool), gap[:-1]])
+        columns = np.arange(reported.shape[1])
+        
+        filled = {}
+        for total_metric, daily_metric in zip(self.CUMULATIVE_METRICS, self.DAILY_METRICS):
+            values = wide[total_metric].to_numpy()
+            before, after = values[previous_report, columns], values[next_report, columns]
+            totals = before + (after - before) * weight
+            filled[total_metric] = totals
+            filled[daily_metric] = np.where(rederive, np.maximum(np.diff(totals, axis=0, prepend=np.nan), 0),
+                                            wide[daily_metric].to_numpy())
+        
+        # Back to long rows, series by series and in date order
+        column, day = np.nonzero(in_series.T)
+        series = wide['reported'].columns
+        first_dates = reports.groupby(keys)['date'].min().reindex(series).to_numpy()
+        
+        aligned = pd.DataFrame({
+            'disease': series.get_level_values('disease')[column],
+            'country': series.get_level_values('country')[column],
+            'date': first_dates[column] + pd.to_timedelta(day, unit='D').to_numpy(),
+            **{metric: filled[metric][day, column] for metric in metrics},
+            'reported': reported[day, column]
+        })
+        
+        return aligned
+    
+    @timed()
+    def add_population_metrics(self, unified_data, population=None):
+        """
+        Add a 'population' column and '<metric>_per_100k' columns for PER_100K_METRICS.
+        
+        Population is per country, matched on ISO3 codes so the COVID-19 input's
+        population also covers the SARS and Monkeypox rows (which spell some countries
+        differently). It is taken from the rows that already carry a population unless
+        a Series of population by ISO3 code is passed in; create_unified_dataset passes
+        the one load_population builds from the COVID-19 file's own codes.
+        Entries that aren't countries (NON_COUNTRIES) get no population.
+        """
+        from utils.country_codes import NON_COUNTRIES, build_iso3_lookup, to_iso3
+        
+        unified_data = unified_data.copy()
+        iso3 = to_iso3(unified_data['country'], build_iso3_lookup(self.data_dir))
+        is_country = ~unified_data['country'].isin(NON_COUNTRIES)
+        
+        own_population = unified_data['population'] if 'population' in unified_data.columns else pd.Series(np.nan, index=unified_data.index)
+        own_population = own_population.where(is_country)
+        
+        if population is None:
+            # Names resolve to codes, so non-country rows (no code) never reach the lookup
+            population = own_population.groupby(iso3).last()
+        
+        unified_data['population'] = iso3.map(population).fillna(own_population).astype(float)
+        
+        # Countries without a known population get NaN rather than a misleading rate
+        per_person = 100_000 / unified_data['population'].where(unified_data['population'] > 0)
+        for metric in self.PER_100K_METRICS:
+            unified_data[f'{metric}_per_100k'] = unified_data[metric] * per_person
+        
+        covered = unified_data.loc[unified_data['population'].notna(), 'country'].nunique()
+        print(f"👥 Population matched for {covered} of {unified_data['country'].nunique()} countries")
+        
+        return unified_data
+    
+    @timed()
+    def add_rolling_metrics(self, unified_data):
+        """
+        Add rolling-window columns for every (disease, country) series:
+        - '<metric>_<n>d_avg': trailing n-day mean of new_cases and new_deaths (ROLLING_WINDOWS)
+        - 'cases_wow_growth': change in weekly cases over the week before (0.25 = +25%)
+        - 'doubling_time': days for total cases to double at the past week's growth
+        - 'rt_proxy': weekly case growth scaled to the disease's serial interval
+        
+        Windows are calendar days, so reporting gaps don't stretch a window past its
+        length. Growth columns stay empty for a series' first two weeks and after a
+        week without cases.
+        """
+        unified_data = unified_data.sort_values(['disease', 'country', 'date'])
+        daily_metrics = ['new_cases', 'new_deaths']
+        
+        # Trailing sums over each window, all series at once: each series' running total
+        # minus its running total on the last row at least a window earlier. Series are
+        # numbered in row order and rows keyed by (series, day), so one searchsorted finds
+        # that row for every row.
+        series_keys = unified_data[['disease', 'country']]
+        series_begins = (series_keys != series_keys.shift()).any(axis=1).to_numpy()
+        series_number = np.cumsum(series_begins) - 1
+        day = (unified_data['date'] - unified_data['date'].min()).dt.days.to_numpy()
+        row_key = series_number * (day.max() + 1) + day
+        series_start = np.maximum.accumulate(np.where(series_begins, np.arange(len(unified_data)), 0))
+        
+        running = unified_data[daily_metrics].fillna(0).groupby(series_number).cumsum().to_numpy()
+        reports = unified_data[daily_metrics].notna().groupby(series_number).cumsum().to_numpy()
+        
+        window_sums = {}
+        for days in sorted(set(self.ROLLING_WINDOWS) | {7, 14}):
+            earlier = np.searchsorted(row_key, row_key - days, side='right') - 1
+            in_series = (earlier >= series_start)[:, None]
+            sums = running - np.where(in_series, running[earlier], 0)
+            counts = reports - np.where(in_series, reports[earlier], 0)
+            # Like a rolling sum, a window without any values is empty rather than zero
+            window_sums[days] = pd.DataFrame(np.where(counts > 0, sums, np.nan), index=unified_data.index, columns=daily_metrics)
+        
+        for days in self.ROLLING_WINDOWS:
+            for metric in daily_metrics:
+                unified_data[f'{metric}_{days}d_avg'] = (window_sums[days][metric] / days).round(2)
+        
+        # Rolling sums carry float noise; round so an empty week is exactly zero
+        this_week = window_sums[7]['new_cases'].round(6).clip(lower=0)
+        last_week = (window_sums[14]['new_cases'] - window_sums[7]['new_cases']).round(6).clip(lower=0)
+        history_days = pd.Series(day - day[series_start], index=unified_data.index)
+        weekly_ratio = (this_week / last_week).where((history_days >= 13) & (last_week > 0))
+        
+        unified_data['cases_wow_growth'] = (weekly_ratio - 1).round(4)
+        
+        # Doubling time of the cumulative count, from its growth over the past week
+        week_ago_total = unified_data['total_cases'] - this_week
+        total_ratio = (unified_data['total_cases'] / week_ago_total).where((history_days >= 13) & (week_ago_total > 0))
+        unified_data['doubling_time'] = (7 * np.log(2) / np.log(total_ratio.where(total_ratio > 1))).round(2)
+        
+        # R ~ (weekly growth factor) ^ (serial interval / 7)
+        serial_interval = unified_data['disease'].map(self.SERIAL_INTERVALS).fillna(self.DEFAULT_SERIAL_INTERVAL)
+        unified_data['rt_proxy'] = (weekly_ratio ** (serial_interval / 7)).round(3)
+        
+        return unified_data
+    
+    @timed()
     def save_processed_data(self, output_dir="data/processed"):
         """Save processed datasets and metadata"""
         if self.unified_data is None:
@@ -330,6 +573,7 @@ class EpidemicDataProcessor:
             json.dump(summary, f, indent=2)
         print(f"📈 Summary statistics saved: {summary_path}")
     
+    @timed()
     def generate_summary_stats(self):
         """Generate summary statistics for the dashboard"""
         if self.unified_data is None:
@@ -356,8 +600,289 @@ class EpidemicDataProcessor:
         
         return summary
 
+class HealthExpenditureProcessor:
+    """
+    Builds the health expenditure table used by the Healthcare Access page:
+    World Bank spending and GDP indicators per country, typed, with the
+    clustering features precomputed and saved as Parquet
+    """
+    
+    # Years averaged for the clustering features (smooths pandemic-related volatility)
+    RECENT_YEARS = [2020, 2021, 2022]
+    
+    # Raw World Bank downloads: indicator -> (file, table column template, scale to table units)
+    WORLD_BANK_SOURCES = {
+        'he_pct_gdp': ("Current health expenditure (% of GDP)[Uncleaned].xls", "{year} H.E.(% of GDP)", 0.01),
+        'he_per_capita': ("Current health expenditure per capita (current US$) [Uncleaned].xls", "{year} H.E. per capita (USD)", 1.0),
+        'gdp_mil': ("GDP [uncleaned].xls", "{year} GDP(USD) by mil", 1e-6)
+    }
+    
+    def __init__(self, data_dir="data", years=range(2015, 2023)):
+        self.data_dir = data_dir
+        self.years = list(years)
+        self.health_data = None
+        self.health_long = None
+    
+    @timed()
+    def load_cleaned_workbook(self):
+        """Load the cleaned health expenditure workbook (one row per country, one column per indicator and year)"""
+        print("Processing health expenditure data...")
+        
+        try:
+            health_df = pd.read_excel(f"{self.data_dir}/cleaned_health_expenditure.xlsx")
+            print(f"✅ Health expenditure data: {len(health_df)} countries")
+            return health_df
+        except Exception as e:
+            print(f"❌ Error processing health expenditure data: {e}")
+            return pd.DataFrame()
+    
+    @timed()
+    def load_world_bank_indicator(self, indicator):
+        """Load one raw World Bank indicator sheet as long rows (Country Code, year, indicator, value)"""
+        file_name, _, scale = self.WORLD_BANK_SOURCES[indicator]
+        path = f"{self.data_dir}/{file_name}"
+        
+        # World Bank downloads have a few metadata lines above the header row
+        preview = pd.read_excel(path, sheet_name='Data', header=None, usecols=[0], nrows=20)
+        header_row = int(preview.index[preview.iloc[:, 0] == 'Country Name'][0])
+        wide = pd.read_excel(path, sheet_name='Data', skiprows=header_row)
+        
+        year_cols = [col for col in wide.columns if str(col).isdigit() and int(col) in self.years]
+        long_df = wide.melt(id_vars=['Country Code', 'Country Name'], value_vars=year_cols, var_name='year', value_name='value')
+        long_df['year'] = long_df['year'].astype(int).astype('int16')
+        long_df['value'] = pd.to_numeric(long_df['value'], errors='coerce') * scale
+        long_df['indicator'] = indicator
+        
+        return long_df
+    
+    @timed()
+    def load_world_bank_countries(self):
+        """Country codes from the World Bank metadata sheet; regional and income aggregates have no Region"""
+        file_name = self.WORLD_BANK_SOURCES['he_pct_gdp'][0]
+        countries = pd.read_excel(f"{self.data_dir}/{file_name}", sheet_name='Metadata - Countries')
+        return countries.loc[countries['Region'].notna(), 'Country Code']
+    
+    @timed()
+    def load_world_bank_data(self):
+        """
+        Ingest the raw World Bank indicator sheets and reshape them into the health
+        table layout (one row per country, one column per indicator and year)
+        """
+        print("Processing World Bank health expenditure data...")
+        
+        try:
+            # Long format: one row per (country, year, indicator)
+            self.health_long = pd.concat(
+                [self.load_world_bank_indicator(indicator) for indicator in self.WORLD_BANK_SOURCES], ignore_index=True
+            )
+            countries = self.load_world_bank_countries()
+            self.health_long = self.health_long[self.health_long['Country Code'].isin(countries)]
+            
+            # Join the indicators on Country Code: pivot to (indicator, year) columns
+            wide = self.health_long.pivot_table(index='Country Code', columns=['indicator', 'year'], values='value', aggfunc='first', dropna=False)
+            wide = wide.reindex(columns=pd.MultiIndex.from_product([list(self.WORLD_BANK_SOURCES), self.years]))
+            
+            health_df = self.health_long.drop_duplicates('Country Code').set_index('Country Code')[['Country Name']]
+            for indicator, (_, template, _) in self.WORLD_BANK_SOURCES.items():
+                block = wide[indicator]
+                block.columns = [template.format(year=year) for year in block.columns]
+                health_df = health_df.join(block)
+            
+            # Total health expenditure in USD millions (% of GDP x GDP)
+            for year in self.years:
+                health_df[f'{year} H.E. (USD) by mil'] = health_df[f'{year} H.E.(% of GDP)'] * health_df[f'{year} GDP(USD) by mil']
+            
+            # Countries without any health spending figures are of no use to the page
+            he_cols = [f'{year} H.E.(% of GDP)' for year in self.years] + [f'{year} H.E. per capita (USD)' for year in self.years]
+            health_df = health_df.dropna(subset=he_cols, how='all')
+            
+            health_df = health_df.reset_index()[['Country Name', 'Country Code'] + [col for col in health_df.columns if col != 'Country Name']]
+            print(f"✅ World Bank health expenditure data: {len(health_df)} countries, {self.years[0]}-{self.years[-1]}")
+            return health_df
+            
+        except Exception as e:
+            print(f"❌ Error processing World Bank health expenditure data: {e}")
+            return pd.DataFrame()
+    
+    def add_clustering_features(self, health_df):
+        """Typed columns plus the averages the clustering uses"""
+        health_df = health_df.copy()
+        health_df['Country Name'] = health_df['Country Name'].astype('string')
+        health_df['Country Code'] = health_df['Country Code'].astype('string')
+        
+        value_cols = [col for col in health_df.columns if col[:4].isdigit()]
+        health_df[value_cols] = health_df[value_cols].apply(pd.to_numeric, errors='coerce').astype('float64')
+        
+        recent_cols_pct = [f'{year} H.E.(% of GDP)' for year in self.RECENT_YEARS]
+        recent_cols_per_capita = [f'{year} H.E. per capita (USD)' for year in self.RECENT_YEARS]
+        recent_cols_gdp = [f'{year} GDP(USD) by mil' for year in self.RECENT_YEARS]
+        
+        # % of GDP is stored as a fraction (0.07 becomes 7%)
+        health_df['avg_he_pct_gdp'] = health_df[recent_cols_pct].mean(axis=1) * 100
+        health_df['avg_he_per_capita'] = health_df[recent_cols_per_capita].mean(axis=1)
+        # GDP from millions to billions
+        health_df['avg_gdp_billions'] = health_df[recent_cols_gdp].mean(axis=1) / 1000
+        
+        return health_df
+    
+    @timed()
+    def create_health_table(self, source="workbook"):
+        """
+        Load the health expenditure source and derive the clustering features.
+        source='workbook' reads cleaned_health_expenditure.xlsx; source='world_bank'
+        ingests the raw World Bank indicator downloads directly
+        """
+        if source == "world_bank":
+            health_df = self.load_world_bank_data()
+        else:
+            health_df = self.load_cleaned_workbook()
+        if health_df.empty:
+            return None
+        
+        self.health_data = self.add_clustering_features(health_df)
+        return self.health_data
+    
+    @timed()
+    def save_processed_data(self, output_dir="data/processed"):
+        """Save the health expenditure table as Parquet"""
+        if self.health_data is None:
+            print("❌ No health expenditure data to save. Run create_health_table() first.")
+            return
+        
+        os.makedirs(output_dir, exist_ok=True)
+        
+        health_path = f"{output_dir}/health_expenditure.parquet"
+        self.health_data.to_parquet(health_path, index=False)
+        print(f"💾 Health expenditure table saved: {health_path}")
+        return health_path
+
+class EpidemicAccessProcessor:
+    """
+    Joins each country's outbreak metrics with its health expenditure averages
+    and access cluster, keyed on ISO3 codes, so questions such as "death rate by
+    access tier" are a lookup on one indexed table instead of a merge on names
+    """
+    
+    def __init__(self, data_dir="data"):
+        self.data_dir = data_dir
+        self.joined_data = None
+    
+    def add_iso3(self, epidemic_df, health_df=None):
+        """Epidemic rows with an 'iso3' column; rows whose country can't be resolved are dropped"""
+        from utils.country_codes import build_iso3_lookup, to_iso3
+        
+        extra_names = None
+        if health_df is not None:
+            extra_names = dict(zip(health_df['Country Name'], health_df['Country Code']))
+        lookup = build_iso3_lookup(self.data_dir, extra_names)
+        
+        epidemic_df = epidemic_df.copy()
+        epidemic_df['iso3'] = to_iso3(epidemic_df['country'], lookup)
+        
+        unmatched = sorted(epidemic_df.loc[epidemic_df['iso3'].isna(), 'country'].unique())
+        if unmatched:
+            print(f"⚠️ No ISO3 code for {len(unmatched)} epidemic entries: {', '.join(unmatched)}")
+        
+        return epidemic_df.dropna(subset=['iso3'])
+    
+    def compute_outbreak_metrics(self, epidemic_df):
+        """
+        One row per (iso3, disease): cumulative cases and deaths, death rate,
+        the daily peak and its date, and the first and last reported dates
+        """
+        epidemic_df = epidemic_df.assign(date=pd.to_datetime(epidemic_df['date']))
+        
+        # Sum spellings that resolve to the same code, so there is one series per country and disease
+        daily = (epidemic_df
+                 .groupby(['iso3', 'disease', 'date'], sort=True)
+                 .agg(country=('country', 'first'), region=('region', 'first'),
+                      total_cases=('total_cases', 'sum'), new_cases=('new_cases', 'sum'),
+                      total_deaths=('total_deaths', 'sum'))
+                 .reset_index())
+        
+        grouped = daily.groupby(['iso3', 'disease'], sort=True)
+        metrics = grouped.agg(
+            country=('country', 'first'),
+            region=('region', 'first'),
+            total_cases=('total_cases', 'max'),
+            total_deaths=('total_deaths', 'max'),
+            peak_new_cases=('new_cases', 'max'),
+            first_date=('date', 'min'),
+            last_date=('date', 'max')
+        )
+        
+        # Date of the daily peak
+        peak_rows = grouped['new_cases'].idxmax()
+        metrics['peak_date'] = daily.loc[peak_rows.to_numpy(), 'date'].to_numpy()
+        
+        # First day with a reported case
+        with_cases = daily[daily['total_cases'] > 0]
+        metrics['first_case_date'] = with_cases.groupby(['iso3', 'disease'])['date'].min()
+        
+        # Case fatality rate (%)
+        metrics['death_rate'] = np.where(
+            metrics['total_cases'] > 0, metrics['total_deaths'] / metrics['total_cases'] * 100, np.nan
+        )
+        
+        return metrics
+    
+    def load_access_clusters(self, health_df):
+        """Access cluster per country, from the same persisted model the Healthcare Access page uses"""
+        from utils.health_clustering import FEATURES, load_or_fit_clustering_model, perform_health_access_clustering
+        
+        # Same rows as load_health_expenditure_data, so the cached model matches the page's
+        clustering_data = health_df[['Country Name', 'Country Code'] + FEATURES].dropna(
+            subset=['avg_he_pct_gdp', 'avg_he_per_capita']
+        ).copy()
+        
+        scaler, kmeans = load_or_fit_clustering_model(clustering_data)
+        clustered, *_ = perform_health_access_clustering(clustering_data, scaler=scaler, kmeans=kmeans)
+        return clustered.set_index('Country Code')[['Country Name'] + FEATURES + ['cluster', 'cluster_label']]
+    
+    @timed()
+    def create_joined_table(self, epidemic_df, health_df):
+        """
+        Outbreak metrics for every (iso3, disease) joined with the country's health
+        expenditure averages and access cluster (missing where the World Bank
+        table has no spending data for that country)
+        """
+        print("\n🔗 Joining epidemic outcomes with healthcare access...")
+        
+        epidemic_df = self.add_iso3(epidemic_df, health_df)
+        metrics = self.compute_outbreak_metrics(epidemic_df)
+        access = self.load_access_clusters(health_df)
+        
+        joined = metrics.join(access.rename_axis('iso3'), on='iso3')
+        joined['cluster'] = joined['cluster'].astype('Int64')
+        joined = joined.sort_index()
+        
+        matched = joined['cluster_label'].notna().sum()
+        print(f"✅ Epidemic × access table: {len(joined)} country-disease rows, {matched} with an access cluster")
+        
+        self.joined_data = joined
+        return self.joined_data
+    
+    @timed()
+    def save_processed_data(self, output_dir="data/processed"):
+        """Save the joined table as Parquet, keeping its (iso3, disease) index"""
+        if self.joined_data is None:
+            print("❌ No joined data to save. Run create_joined_table() first.")
+            return
+        
+        os.makedirs(output_dir, exist_ok=True)
+        
+        joined_path = f"{output_dir}/epidemic_access.parquet"
+        self.joined_data.to_parquet(joined_path)
+        print(f"💾 Epidemic × access table saved: {joined_path}")
+        return joined_path
+
 def main():
-    """Main function to process all epidemic data"""
+    """Main function to process all epidemic and health expenditure data"""
+    parser = argparse.ArgumentParser(description="Process epidemic and health expenditure data")
+    parser.add_argument('--health-source', choices=['workbook', 'world_bank'], default='workbook',
+                        help="Build the health table from cleaned_health_expenditure.xlsx (default) or the raw World Bank .xls downloads")
+    args = parser.parse_args()
+    
     print("🦠 EPIDEMIC DATA PROCESSOR")
     print("=" * 50)
     
@@ -381,6 +906,24 @@ def main():
         print("  └── data_summary.json")
     else:
         print("❌ Data processing failed!")
+    
+    # Health expenditure table for the Healthcare Access page
+    health_processor = HealthExpenditureProcessor()
+    health_data = health_processor.create_health_table(args.health_source)
+    
+    if health_data is not None:
+        health_processor.save_processed_data()
+        print("\n✅ Health expenditure processing completed successfully!")
+        print("📁 data/processed/health_expenditure.parquet")
+    else:
+        print("❌ Health expenditure processing failed!")
+    
+    # Outbreak metrics joined with healthcare access, keyed on ISO3
+    if unified_data is not None and health_data is not None:
+        access_processor = EpidemicAccessProcessor()
+        access_processor.create_joined_table(unified_data, health_data)
+        access_processor.save_processed_data()
+        print("📁 data/processed/epidemic_access.parquet")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
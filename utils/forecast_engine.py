@@ -1,27 +1,118 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Iterator, Callable
+from concurrent.futures import ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
+import threading
 import warnings
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.instrumentation import timed, span, attach_run, count_cache, get_current_run
+from utils.model_cache import PYTORCH_MODEL_CACHE
 warnings.filterwarnings('ignore')
 
-# Add PyTorch imports
-import torch
-import torch.nn as nn
+def __getattr__(name):
+    """Load the PyTorch model class on first access (keeps torch out of module import)"""
+    if name == 'EpidemicTimeSeriesModel':
+        from utils.torch_models import EpidemicTimeSeriesModel
+        return EpidemicTimeSeriesModel
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class ForecastCancelled(Exception):
+    """Raised when a background forecast is cancelled while it is running"""
+    pass
+
+class CompactForecast:
+    """
+    Memory-efficient forecast result backed by NumPy arrays.
+
+    Stores the forecast start date plus float32 value/bound arrays, and the history
+    as a datetime64 + float32 array pair. It supports dict-style access with the same
+    keys generate_forecast() returns, so existing callers keep working; Python lists,
+    dates and history records are only built when those keys are actually read.
+    """
+
+    __slots__ = ('success', 'message', 'country', 'disease', 'metric', 'forecast_method',
+                 'forecast_start', 'values', 'lower', 'upper', 'history_dates', 'history_values')
+
+    _array_keys = {'forecast_values': 'values', 'lower_bound': 'lower', 'upper_bound': 'upper'}
+    _keys = ('success', 'message', 'country', 'disease', 'metric', 'last_date', 'forecast_dates',
+             'forecast_values', 'lower_bound', 'upper_bound', 'historical_data', 'n_history', 'forecast_method')
+
+    def __init__(self, country: str, disease: str, metric: str, forecast_start, forecast_values, lower_bound, upper_bound,
+                 forecast_method: str = '', history_dates=None, history_values=None, success: bool = True, message: str = ''):
+        self.success = success
+        self.message = message
+        self.country = country
+        self.disease = disease
+        self.metric = metric
+        self.forecast_method = forecast_method
+        self.forecast_start = np.datetime64(forecast_start, 'D') if forecast_start is not None else None
+        self.values = np.asarray(forecast_values, dtype=np.float32)
+        self.lower = np.asarray(lower_bound, dtype=np.float32)
+        self.upper = np.asarray(upper_bound, dtype=np.float32)
+        self.history_dates = np.asarray(history_dates if history_dates is not None else [], dtype='datetime64[D]')
+        self.history_values = np.asarray(history_values if history_values is not None else [], dtype=np.float32)
 
-class EpidemicTimeSeriesModel(nn.Module):
-    """PyTorch neural network model for epidemic time series forecasting"""
-    def __init__(self, input_size, hidden_size, output_size):
-        super(EpidemicTimeSeriesModel, self).__init__()
-        self.fc1 = nn.Linear(input_size, hidden_size)
-        self.relu = nn.ReLU()
-        self.fc2 = nn.Linear(hidden_size, output_size)
+    @classmethod
+    def failure(cls, country: str, disease: str, metric: str, message: str) -> 'CompactForecast':
+        """Unsuccessful result with empty arrays"""
+        return cls(country, disease, metric, None, [], [], [], success=False, message=message)
 
-    def forward(self, x):
-        out = self.fc1(x)
-        out = self.relu(out)
-        out = self.fc2(out)
-        return out
+    @property
+    def n_history(self) -> int:
+        return len(self.history_values)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the underlying arrays"""
+        return sum(a.nbytes for a in (self.values, self.lower, self.upper, self.history_dates, self.history_values))
+
+    def array(self, key: str) -> np.ndarray:
+        """Underlying float32 array for 'forecast_values', 'lower_bound' or 'upper_bound'"""
+        return getattr(self, self._array_keys[key])
+
+    def __getitem__(self, key: str):
+        if key in self._array_keys:
+            return self.array(key).tolist()
+        if key == 'forecast_dates':
+            if self.forecast_start is None:
+                return []
+            return pd.date_range(pd.Timestamp(self.forecast_start), periods=len(self.values), freq='D').tolist()
+        if key == 'last_date':
+            if self.forecast_start is None:
+                raise KeyError(key)
+            return pd.Timestamp(self.forecast_start - np.timedelta64(1, 'D'))
+        if key == 'historical_data':
+            history = pd.DataFrame({'date': pd.to_datetime(self.history_dates), 'y': self.history_values.astype(float)})
+            return history.to_dict('records')
+        if key in ('success', 'message', 'country', 'disease', 'metric', 'forecast_method', 'n_history'):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: str) -> bool:
+        if not self.success:
+            return key in ('success', 'message', 'forecast_dates', 'forecast_values', 'lower_bound', 'upper_bound')
+        return key in self._keys
+
+    def keys(self) -> List[str]:
+        return [key for key in self._keys if key in self]
+
+    def to_dict(self) -> Dict:
+        """Full generate_forecast()-style dict (materializes every list)"""
+        return {key: self[key] for key in self.keys()}
+
+    def __repr__(self) -> str:
+        status = f"{len(self.values)} days from {self.forecast_start}" if self.success else self.message
+        return f"CompactForecast({self.country!r}, {self.disease!r}, {self.metric!r}, {status})"
 
 class EpidemicForecaster:
     """
@@ -32,11 +123,13 @@ class EpidemicForecaster:
     - PyTorch neural network for complex pattern recognition
     """
     
-    def __init__(self):
+    def __init__(self, use_model_cache: bool = True):
         self.forecast_days = 180  # 6 months
         self.min_data_points = 14  # Minimum 2 weeks of data
-        self.pytorch_models = {}  # Cache for trained PyTorch models
+        self.pytorch_models = PYTORCH_MODEL_CACHE if use_model_cache else None  # Shared cache of trained PyTorch models
+        self.stop_event = None  # Set by BackgroundForecastRunner to abort training early
         
+    @timed()
     def prepare_country_data(self, data: pd.DataFrame, disease: str, country: str, metric: str = 'new_cases') -> pd.DataFrame:
         """Prepare time series data for a specific country and disease"""
         country_data = data[
@@ -47,6 +140,7 @@ class EpidemicForecaster:
         if len(country_data) < self.min_data_points:
             return pd.DataFrame()
             
+        # Processed series are on a dense daily calendar, so rows are equally spaced days
         country_data = country_data.sort_values('date').reset_index(drop=True)
         country_data['date'] = pd.to_datetime(country_data['date'])
         
@@ -55,6 +149,7 @@ class EpidemicForecaster:
         
         return country_data[['date', metric]].rename(columns={metric: 'y'})
     
+    @timed()
     def exponential_smoothing_forecast(self, ts_data: pd.DataFrame, alpha: float = 0.3) -> Tuple[List[float], List[float], List[float]]:
         """Simple exponential smoothing with trend adjustment"""
         values = ts_data['y'].values
@@ -102,6 +197,7 @@ class EpidemicForecaster:
         
         return forecast, lower_bound, upper_bound
     
+    @timed()
     def pytorch_forecast(self, ts_data: pd.DataFrame, input_size: int = 7, hidden_size: int = 16, epochs: int = 100) -> Tuple[List[float], List[float], List[float]]:
         """Generate forecast using a PyTorch neural network for epidemic time series"""
         values = ts_data['y'].values
@@ -115,6 +211,10 @@ class EpidemicForecaster:
             upper_bound = [last_value * 1.3] * self.forecast_days
             return forecast, lower_bound, upper_bound
         
+        # torch is only loaded on first PyTorch use
+        import torch
+        from utils.torch_models import EpidemicTimeSeriesModel
+        
         # Prepare data for PyTorch
         X, y = [], []
         for i in range(len(values) - input_size):
@@ -124,19 +224,30 @@ class EpidemicForecaster:
         X = torch.tensor(X, dtype=torch.float32)
         y = torch.tensor(y, dtype=torch.float32).view(-1, 1)
         
-        # Create and train model
+        # Reuse a model already trained on this exact series and parameters
         model = EpidemicTimeSeriesModel(input_size, hidden_size, 1)
-        criterion = nn.MSELoss()
-        optimizer = torch.optim.Adam(model.parameters(), lr=0.01)
-        
-        # Training loop
-        model.train()
-        for epoch in range(epochs):
-            optimizer.zero_grad()
-            outputs = model(X)
-            loss = criterion(outputs, y)
-            loss.backward()
-            optimizer.step()
+        cached = None
+        if self.pytorch_models is not None:
+            cache_key = self.pytorch_models.make_key(values, input_size, hidden_size, epochs)
+            cached = self.pytorch_models.get(cache_key)
+        
+        if cached is not None:
+            state_dict, mae = cached
+            model.load_state_dict(state_dict)
+        else:
+            criterion = torch.nn.MSELoss()
+            optimizer = torch.optim.Adam(model.parameters(), lr=0.01)
+            
+            # Training loop
+            model.train()
+            for epoch in range(epochs):
+                if self.stop_event is not None and self.stop_event.is_set():
+                    raise ForecastCancelled("Forecast cancelled before training finished")
+                optimizer.zero_grad()
+                outputs = model(X)
+                loss = criterion(outputs, y)
+                loss.backward()
+                optimizer.step()
         
         # Generate forecast
         forecast = []
@@ -159,11 +270,14 @@ class EpidemicForecaster:
             current_input = np.append(current_input[1:], prediction)
         
         # Calculate confidence intervals based on model error
-        model.eval()
-        with torch.no_grad():
-            predictions = model(X).numpy().flatten()
-            actuals = y.numpy().flatten()
-            mae = np.mean(np.abs(predictions - actuals))
+        if cached is None:
+            model.eval()
+            with torch.no_grad():
+                predictions = model(X).numpy().flatten()
+                actuals = y.numpy().flatten()
+                mae = np.mean(np.abs(predictions - actuals))
+            if self.pytorch_models is not None:
+                self.pytorch_models.put(cache_key, model.state_dict(), mae)
         
         # Wider confidence intervals for longer forecasts
         lower_bound = [max(0, f - 1.96 * mae * (1 + i/180)) for i, f in enumerate(forecast)]
@@ -171,11 +285,17 @@ class EpidemicForecaster:
         
         return forecast, lower_bound, upper_bound
     
-    def generate_forecast(self, data: pd.DataFrame, disease: str, country: str, metric: str = 'new_cases', use_pytorch: bool = False) -> Dict:
-        """Generate 6-month forecast for a specific country and disease"""
+    @timed()
+    def generate_forecast(self, data: pd.DataFrame, disease: str, country: str, metric: str = 'new_cases', use_pytorch: bool = False, compact: bool = False) -> Dict:
+        """
+        Generate 6-month forecast for a specific country and disease.
+        With compact=True a CompactForecast is returned instead of a dict of Python lists.
+        """
         ts_data = self.prepare_country_data(data, disease, country, metric)
         
         if ts_data.empty:
+            if compact:
+                return CompactForecast.failure(country, disease, metric, f'Insufficient data for {country} - {disease}')
             return {
                 'success': False,
                 'message': f'Insufficient data for {country} - {disease}',
@@ -193,8 +313,16 @@ class EpidemicForecaster:
             forecast_values, lower_bound, upper_bound = self.exponential_smoothing_forecast(ts_data)
             method = "Exponential Smoothing"
         
-        # Create future dates
         last_date = ts_data['date'].max()
+        
+        if compact:
+            return CompactForecast(
+                country, disease, metric, last_date + timedelta(days=1),
+                forecast_values, lower_bound, upper_bound, method,
+                history_dates=ts_data['date'].values, history_values=ts_data['y'].values
+            )
+        
+        # Create future dates
         forecast_dates = [last_date + timedelta(days=i+1) for i in range(self.forecast_days)]
         
         return {
@@ -211,15 +339,19 @@ class EpidemicForecaster:
             'forecast_method': method
         }
     
-    def batch_forecast(self, data: pd.DataFrame, disease: str, countries: List[str], metric: str = 'new_cases', use_pytorch: bool = False) -> Dict[str, Dict]:
-        """Generate forecasts for multiple countries"""
+    @timed()
+    def batch_forecast(self, data: pd.DataFrame, disease: str, countries: List[str], metric: str = 'new_cases', use_pytorch: bool = False, compact: bool = False) -> Dict[str, Dict]:
+        """Generate forecasts for multiple countries (as CompactForecast objects with compact=True)"""
         results = {}
         
         for country in countries:
             try:
-                forecast = self.generate_forecast(data, disease, country, metric, use_pytorch)
+                forecast = self.generate_forecast(data, disease, country, metric, use_pytorch, compact)
                 results[country] = forecast
             except Exception as e:
+                if compact:
+                    results[country] = CompactForecast.failure(country, disease, metric, f'Error forecasting for {country}: {str(e)}')
+                    continue
                 results[country] = {
                     'success': False,
                     'message': f'Error forecasting for {country}: {str(e)}',
@@ -231,6 +363,7 @@ class EpidemicForecaster:
         
         return results
 
+    @timed()
     def project_to_current_year(self, data: pd.DataFrame, disease: str, country: str, metric: str = 'new_cases', target_year: int = 2025, use_pytorch: bool = False) -> Dict:
         """Project historical epidemic patterns to a target year (e.g., 2025)"""
         ts_data = self.prepare_country_data(data, disease, country, metric)
@@ -298,6 +431,7 @@ class EpidemicForecaster:
             'forecast_method': method
         }
     
+    @timed()
     def batch_project_to_current_year(self, data: pd.DataFrame, disease: str, countries: List[str], metric: str = 'new_cases', target_year: int = 2025, use_pytorch: bool = False) -> Dict[str, Dict]:
         """Project multiple countries to a target year"""
         results = {}
@@ -320,6 +454,95 @@ class EpidemicForecaster:
         
         return results
 
+class ForecastJobs:
+    """
+    Handle for a group of forecasts submitted together to a BackgroundForecastRunner.
+    Results can be consumed in completion order, and the whole group can be
+    cancelled (pending jobs are dropped, running PyTorch training stops early).
+    """
+
+    def __init__(self, futures: Dict[str, Future], stop_event: threading.Event):
+        self.futures = futures
+        self.stop_event = stop_event
+        self._countries = {future: country for country, future in futures.items()}
+
+    def as_completed(self, poll_interval: float = 0.25, on_wait: Optional[Callable[[int, int], None]] = None) -> Iterator[Tuple[str, Dict]]:
+        """
+        Yield (country, result) pairs as each forecast finishes. Waits are at most
+        poll_interval seconds; between them on_wait(finished, total) is called, which
+        gives the caller a chance to be interrupted (a Streamlit rerun only stops the
+        script inside an st call) instead of blocking until the next forecast lands.
+        Stops early once the group is cancelled.
+        """
+        pending = set(self._countries)
+        while pending and not self.stop_event.is_set():
+            finished, pending = wait(pending, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            for future in finished:
+                if not future.cancelled():
+                    yield self._countries[future], future.result()
+            if pending and on_wait is not None:
+                on_wait(len(self._countries) - len(pending), len(self._countries))
+
+    def cancel(self) -> None:
+        """Cancel pending jobs and signal running jobs to stop"""
+        self.stop_event.set()
+        for future in self.futures.values():
+            future.cancel()
+
+    def done(self) -> bool:
+        """True once every job has finished or been cancelled"""
+        return all(future.done() for future in self.futures.values())
+
+class BackgroundForecastRunner:
+    """
+    Runs per-country forecasts on a background worker pool so that callers
+    can render history immediately and add forecasts as they complete
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='forecast')
+
+    def submit(self, data: pd.DataFrame, disease: str, countries: List[str], metric: str = 'new_cases', use_pytorch: bool = False, target_year: Optional[int] = None, store=None) -> ForecastJobs:
+        """
+        Submit one forecast job per country.
+        When target_year is given, jobs run project_to_current_year instead of generate_forecast.
+        When a ForecastStore is given, precomputed forecasts are returned without running a job.
+        """
+        stop_event = threading.Event()
+        forecaster = EpidemicForecaster()
+        forecaster.stop_event = stop_event
+        run = get_current_run()  # Jobs record their spans into the caller's timing run
+
+        futures = {}
+        for country in countries:
+            stored = None
+            if store is not None:
+                stored = store.lookup(disease, metric, country, use_pytorch, target_year)
+                count_cache('forecast_store', hit=stored is not None)
+            if stored is not None:
+                futures[country] = Future()
+                futures[country].set_result(stored)
+                continue
+
+            futures[country] = self.executor.submit(
+                self._run_job, forecaster, data, disease, country, metric, use_pytorch, target_year, run
+            )
+
+        return ForecastJobs(futures, stop_event)
+
+    def _run_job(self, forecaster: EpidemicForecaster, data: pd.DataFrame, disease: str, country: str, metric: str, use_pytorch: bool, target_year: Optional[int], run=None) -> Dict:
+        """Run a single forecast, converting errors into an unsuccessful result"""
+        with attach_run(run), span('forecast_job', country=country):
+            if target_year is not None:
+                results = forecaster.batch_project_to_current_year(data, disease, [country], metric, target_year, use_pytorch)
+            else:
+                results = forecaster.batch_forecast(data, disease, [country], metric, use_pytorch)
+        return results[country]
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the worker pool"""
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+
 class InsightGenerator:
     """
     Generate human-readable insights from forecast data
@@ -338,6 +561,7 @@ class InsightGenerator:
             return {'trend': 'no_forecast', 'confidence': 'low'}
         
         # Calculate trends at different time horizons
+        peak_index = int(np.argmax(forecast_values))
         current_value = forecast_values[0]
         one_month = forecast_values[29] if len(forecast_values) > 29 else forecast_values[-1]
         three_month = forecast_values[89] if len(forecast_values) > 89 else forecast_values[-1]
@@ -357,8 +581,11 @@ class InsightGenerator:
             trend = 'decreasing'
         
         # Calculate confidence based on data quality
-        historical_data = forecast_data.get('historical_data', [])
-        data_points = len(historical_data)
+        # n_history avoids building the history records of a CompactForecast
+        if 'n_history' in forecast_data:
+            data_points = forecast_data['n_history']
+        else:
+            data_points = len(forecast_data.get('historical_data', []))
         
         if data_points >= 30:
             confidence = 'high'
@@ -374,10 +601,123 @@ class InsightGenerator:
             'three_month_change': three_month_change,
             'six_month_change': six_month_change,
             'current_value': current_value,
-            'peak_value': max(forecast_values),
-            'peak_day': forecast_values.index(max(forecast_values)) + 1
+            'peak_value': forecast_values[peak_index],
+            'peak_day': peak_index + 1
         }
     
+    def build_forecast_panel(self, forecast_results: Dict[str, Dict]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Stack forecasts into a (countries x horizon) float array.
+        Unsuccessful or empty forecasts are all-NaN rows; shorter horizons are NaN-padded.
+        Also returns the number of historical data points behind each forecast.
+        """
+        countries = list(forecast_results.keys())
+        series = []
+        n_history = np.zeros(len(countries), dtype=np.int64)
+
+        for i, forecast_data in enumerate(forecast_results.values()):
+            if not forecast_data['success']:
+                series.append(np.empty(0))
+                continue
+
+            if isinstance(forecast_data, CompactForecast):
+                series.append(forecast_data.values)
+            else:
+                series.append(np.asarray(forecast_data['forecast_values'], dtype=float))
+
+            if 'n_history' in forecast_data:
+                n_history[i] = forecast_data['n_history']
+            else:
+                n_history[i] = len(forecast_data.get('historical_data', []))
+
+        horizon = max((len(values) for values in series), default=0)
+        panel = np.full((len(countries), horizon), np.nan)
+        for i, values in enumerate(series):
+            panel[i, :len(values)] = values
+
+        return countries, panel, n_history
+
+    def calculate_panel_metrics(self, panel: np.ndarray, n_history: np.ndarray, success: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Vectorized calculate_trend_metrics over a (countries x horizon) forecast panel.
+        Rows that are entirely NaN have no forecast. Returns one array per metric.
+        """
+        panel = np.asarray(panel, dtype=float)
+        n_rows = panel.shape[0]
+        lengths = np.sum(~np.isnan(panel), axis=1)
+        has_forecast = lengths > 0
+        if success is None:
+            success = has_forecast
+
+        rows = np.arange(n_rows)
+        last_index = np.maximum(lengths - 1, 0)
+        filled = np.where(np.isnan(panel), -np.inf, panel) if panel.shape[1] else np.zeros((n_rows, 1))
+
+        current_value = filled[:, 0]
+        one_month = filled[rows, np.where(lengths > 29, 29, last_index)]
+        three_month = filled[rows, np.where(lengths > 89, 89, last_index)]
+        six_month = filled[rows, last_index]
+
+        # Calculate percentage changes
+        base = np.maximum(current_value, 1)
+        one_month_change = (one_month - current_value) / base * 100
+        three_month_change = (three_month - current_value) / base * 100
+        six_month_change = (six_month - current_value) / base * 100
+
+        # Single pass for the peak (argmax also gives the first peak day)
+        peak_index = np.argmax(filled, axis=1)
+        peak_value = filled[rows, peak_index]
+
+        trend = np.select(
+            [~success, ~has_forecast, np.abs(one_month_change) < self.significance_threshold * 100, one_month_change > 0],
+            ['insufficient_data', 'no_forecast', 'stable', 'increasing'],
+            default='decreasing'
+        )
+        confidence = np.select([n_history >= 30, n_history >= 14], ['high', 'medium'], default='low')
+        confidence = np.where(has_forecast, confidence, 'low')
+
+        # Blank out numeric metrics where there is no forecast
+        def masked(values):
+            return np.where(has_forecast, values, np.nan)
+
+        return {
+            'trend': trend,
+            'confidence': confidence,
+            'one_month_change': masked(one_month_change),
+            'three_month_change': masked(three_month_change),
+            'six_month_change': masked(six_month_change),
+            'current_value': masked(current_value),
+            'peak_value': masked(peak_value),
+            'peak_day': np.where(has_forecast, peak_index + 1, 0)
+        }
+
+    @timed()
+    def calculate_batch_metrics(self, forecast_results: Dict[str, Dict]) -> Dict[str, Dict]:
+        """calculate_trend_metrics for many countries in one NumPy pass"""
+        countries, panel, n_history = self.build_forecast_panel(forecast_results)
+        success = np.array([bool(forecast_data['success']) for forecast_data in forecast_results.values()], dtype=bool)
+        panel_metrics = self.calculate_panel_metrics(panel, n_history, success)
+
+        batch_metrics = {}
+        for i, country in enumerate(countries):
+            trend = str(panel_metrics['trend'][i])
+            if trend in ('insufficient_data', 'no_forecast'):
+                batch_metrics[country] = {'trend': trend, 'confidence': 'low'}
+                continue
+
+            batch_metrics[country] = {
+                'trend': trend,
+                'confidence': str(panel_metrics['confidence'][i]),
+                'one_month_change': float(panel_metrics['one_month_change'][i]),
+                'three_month_change': float(panel_metrics['three_month_change'][i]),
+                'six_month_change': float(panel_metrics['six_month_change'][i]),
+                'current_value': float(panel_metrics['current_value'][i]),
+                'peak_value': float(panel_metrics['peak_value'][i]),
+                'peak_day': int(panel_metrics['peak_day'][i])
+            }
+
+        return batch_metrics
+
     def generate_insight_text(self, country: str, disease: str, metrics: Dict, metric_name: str = 'new cases') -> str:
         """Generate human-readable insight text"""
         if metrics['trend'] == 'insufficient_data':
@@ -415,12 +755,13 @@ class InsightGenerator:
         else:
             return f"{country}: {change_str} {direction} in {disease} {metric_name} forecast for {timeframe}{confidence_text}"
     
+    @timed()
     def generate_batch_insights(self, forecast_results: Dict[str, Dict], disease: str, metric_name: str = 'new cases') -> List[Dict]:
         """Generate insights for multiple countries"""
         insights = []
+        batch_metrics = self.calculate_batch_metrics(forecast_results)
         
-        for country, forecast_data in forecast_results.items():
-            metrics = self.calculate_trend_metrics(forecast_data)
+        for country, metrics in batch_metrics.items():
             insight_text = self.generate_insight_text(country, disease, metrics, metric_name)
             
             insights.append({
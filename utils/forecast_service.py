@@ -0,0 +1,410 @@
+"""
+Local HTTP/JSON forecast service for tools outside the Streamlit pages.
+
+A small HTTP/1.1 server on asyncio streams (no extra dependencies) in front of
+EpidemicForecaster and InsightGenerator:
+
+    GET  /health     service status, dataset version and cache/batching counters
+    POST /forecast   {"disease": "COVID-19", "countries": ["India", "Brazil"],
+                      "metric": "new_cases", "use_pytorch": false,
+                      "target_year": null, "insights": true}
+
+Requests are answered per country from three layers:
+  1. a result cache keyed by dataset version, so a new processed dataset is
+     never served stale forecasts
+  2. request coalescing: a country already being computed for an identical
+     (disease, metric, method) is awaited instead of computed again
+  3. micro-batching: countries requested for the same (disease, metric, method)
+     within a short window are forecast together as one panel on a worker thread
+     (precomputed forecasts from the ForecastStore are used when available)
+
+Usage:
+    python utils/forecast_service.py --port 8765
+    curl -s localhost:8765/forecast -d '{"disease": "COVID-19", "countries": ["India"]}'
+"""
+
+import pandas as pd
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.forecast_engine import EpidemicForecaster, InsightGenerator, CompactForecast
+from utils.forecast_store import ForecastStore, get_dataset_version
+
+METRIC_NAMES = {
+    'new_cases': 'new cases',
+    'total_cases': 'total cases',
+    'new_deaths': 'new deaths',
+    'total_deaths': 'total deaths',
+    'new_cases_per_100k': 'new cases per 100k',
+    'total_cases_per_100k': 'total cases per 100k',
+    'new_deaths_per_100k': 'new deaths per 100k',
+    'total_deaths_per_100k': 'total deaths per 100k',
+    'new_cases_7d_avg': 'new cases (7-day avg)',
+    'new_cases_14d_avg': 'new cases (14-day avg)',
+    'new_deaths_7d_avg': 'new deaths (7-day avg)',
+    'new_deaths_14d_avg': 'new deaths (14-day avg)'
+}
+RESULT_FIELDS = ['success', 'message', 'country', 'disease', 'metric', 'forecast_method', 'last_date', 'n_history',
+                 'forecast_dates', 'forecast_values', 'lower_bound', 'upper_bound', 'target_year', 'original_period',
+                 'projected_dates', 'projected_values', 'duration_days']
+MAX_BODY_BYTES = 1 << 20
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+class RequestError(Exception):
+    """Invalid request; reported to the client with the given HTTP status"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+def to_json_value(value):
+    """JSON-safe version of dates, NumPy scalars and arrays"""
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, np.datetime64):
+        return str(np.datetime_as_string(value, unit='D'))
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [to_json_value(item) for item in value]
+    return value
+
+def serialize_result(result) -> Dict:
+    """JSON-ready forecast/projection result without the (large) history records"""
+    if isinstance(result, CompactForecast) and result.success:
+        # Build date strings directly instead of materializing Timestamps
+        dates = np.datetime_as_string(result.forecast_start + np.arange(len(result.values)), unit='D').tolist()
+        serialized = {key: to_json_value(result[key]) for key in RESULT_FIELDS if key in result and key != 'forecast_dates'}
+        serialized['forecast_dates'] = dates
+        return serialized
+    return {key: to_json_value(result[key]) for key in RESULT_FIELDS if key in result}
+
+class ForecastService:
+    """Coalescing, micro-batching and caching layer around EpidemicForecaster"""
+
+    def __init__(self, data_path: str = "data/processed/unified_epidemic_data.csv", store_dir: str = "data/processed/forecasts",
+                 batch_window_ms: float = 10, max_batch_size: int = 64, cache_size: int = 4096, max_workers: int = 4):
+        self.data_path = data_path
+        self.store_dir = store_dir
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.cache_size = cache_size
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='forecast')
+        self.insight_generator = InsightGenerator()
+
+        self._cache = OrderedDict()   # (version, group, country) -> serialized result
+        self._in_flight = {}          # (group, country) -> asyncio.Future
+        self._pending = {}            # group -> {country: asyncio.Future}
+        self._data_lock = threading.Lock()
+        self._data = None
+        self._store = None
+        self.dataset_version = None
+        self.stats = {'requests': 0, 'countries': 0, 'cache_hits': 0, 'coalesced': 0, 'batches': 0, 'batched_countries': 0}
+        self.started_at = time.time()
+
+    def load_dataset(self):
+        """Current data and forecast store, reloaded if the processed dataset changed"""
+        version = get_dataset_version(self.data_path)
+        with self._data_lock:
+            if version != self.dataset_version:
+                data = pd.read_csv(self.data_path)
+                data['date'] = pd.to_datetime(data['date'])
+                self._data = data
+                self._store = ForecastStore(base_dir=self.store_dir, dataset_version=version)
+                self.dataset_version = version
+                print(f"📦 Dataset version {version} loaded: {len(data)} records")
+            return self._data, self._store, version
+
+    def _cache_get(self, key):
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+        return result
+
+    def _cache_put(self, key, result):
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def forecast(self, disease: str, countries: List[str], metric: str = 'new_cases',
+                       use_pytorch: bool = False, target_year: Optional[int] = None) -> Dict[str, Dict]:
+        """Results for each country, served from cache, an identical in-flight computation, or a new batch"""
+        loop = asyncio.get_running_loop()
+        _, _, version = await loop.run_in_executor(self.executor, self.load_dataset)
+
+        group = (disease, metric, bool(use_pytorch), target_year)
+        self.stats['requests'] += 1
+        self.stats['countries'] += len(countries)
+
+        waiting = {}
+        results = {}
+        for country in countries:
+            cached = self._cache_get((version, group, country))
+            if cached is not None:
+                self.stats['cache_hits'] += 1
+                results[country] = cached
+                continue
+
+            future = self._in_flight.get((group, country))
+            if future is not None:
+                self.stats['coalesced'] += 1
+            else:
+                future = loop.create_future()
+                self._in_flight[(group, country)] = future
+                self._enqueue(group, country, future)
+            waiting[country] = future
+
+        for country, future in waiting.items():
+            results[country] = await future
+        return {country: results[country] for country in countries}
+
+    def _enqueue(self, group, country, future):
+        """Add a country to its group's pending batch, flushing on size or after the batch window"""
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(group)
+        if pending is None:
+            pending = self._pending[group] = {}
+            loop.call_later(self.batch_window, self._flush, group)
+
+        pending[country] = future
+        if len(pending) >= self.max_batch_size:
+            self._flush(group)
+
+    def _flush(self, group):
+        """Start computing a group's pending countries as one batch"""
+        pending = self._pending.pop(group, None)
+        if not pending:
+            return
+
+        self.stats['batches'] += 1
+        self.stats['batched_countries'] += len(pending)
+        loop = asyncio.get_running_loop()
+        task = loop.run_in_executor(self.executor, self._compute_batch, group, list(pending))
+        task.add_done_callback(lambda done: self._resolve(group, pending, done))
+
+    def _resolve(self, group, pending, done):
+        """Hand batch results to every waiting request and cache them"""
+        error = done.exception()
+        if error is None:
+            version, results = done.result()
+        for country, future in pending.items():
+            self._in_flight.pop((group, country), None)
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                self._cache_put((version, group, country), results[country])
+                future.set_result(results[country])
+
+    def _compute_batch(self, group, countries: List[str]):
+        """Forecast a batch of countries (runs on a worker thread)"""
+        disease, metric, use_pytorch, target_year = group
+        data, store, version = self.load_dataset()
+
+        results = {}
+        if store is not None:
+            results = store.lookup_batch(disease, metric, countries, use_pytorch, target_year)
+
+        missing = [country for country in countries if country not in results]
+        if missing:
+            forecaster = EpidemicForecaster()
+            if target_year is not None:
+                results.update(forecaster.batch_project_to_current_year(data, disease, missing, metric, target_year, use_pytorch))
+            else:
+                results.update(forecaster.batch_forecast(data, disease, missing, metric, use_pytorch, compact=True))
+
+        return version, {country: serialize_result(results[country]) for country in countries}
+
+    def insights(self, results: Dict[str, Dict], disease: str, metric: str) -> List[Dict]:
+        """Natural-language insights for a set of serialized forecasts"""
+        return to_json_value(self.insight_generator.generate_batch_insights(results, disease, METRIC_NAMES.get(metric, metric)))
+
+    def health(self) -> Dict:
+        """Service status for GET /health"""
+        return {
+            'status': 'ok',
+            'dataset_version': self.dataset_version,
+            'uptime_s': round(time.time() - self.started_at, 1),
+            'cache_entries': len(self._cache),
+            'in_flight': len(self._in_flight),
+            'stats': self.stats
+        }
+
+def parse_forecast_request(body: bytes) -> Dict:
+    """Validate a POST /forecast body"""
+    try:
+        request = json.loads(body or b'{}')
+    except json.JSONDecodeError as e:
+        raise RequestError(f"Invalid JSON: {e}")
+    if not isinstance(request, dict):
+        raise RequestError("Request body must be a JSON object")
+
+    if 'countries' in request:
+        countries = request['countries']
+        if not isinstance(countries, list) or not all(isinstance(country, str) for country in countries):
+            raise RequestError("'countries' must be a list of country names")
+    else:
+        country = request.get('country')
+        if country is not None and not isinstance(country, str):
+            raise RequestError("'country' must be a country name")
+        countries = [country] if country else []
+    if not isinstance(request.get('disease'), str) or not request['disease'] or not countries:
+        raise RequestError("'disease' and 'countries' (or 'country') are required")
+    if request.get('metric', 'new_cases') not in METRIC_NAMES:
+        raise RequestError(f"'metric' must be one of {sorted(METRIC_NAMES)}")
+
+    return {
+        'disease': request['disease'],
+        'countries': countries,
+        'metric': request.get('metric', 'new_cases'),
+        'use_pytorch': bool(request.get('use_pytorch', False)),
+        'target_year': parse_target_year(request.get('target_year')),
+        'insights': bool(request.get('insights', False))
+    }
+
+def parse_target_year(value) -> Optional[int]:
+    """The optional 'target_year' as an int (a JSON number or numeric string)"""
+    if value is None:
+        return None
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    raise RequestError("'target_year' must be a year, e.g. 2025")
+
+async def read_request(reader: asyncio.StreamReader):
+    """Read one HTTP request; returns None when the client closed the connection"""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+
+    try:
+        method, target, version = request_line.decode('latin-1').strip().split(' ', 2)
+    except ValueError:
+        raise RequestError("Malformed request line")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get('content-length', 0) or 0)
+    if length > MAX_BODY_BYTES:
+        raise RequestError("Request body too large", status=413)
+    body = await reader.readexactly(length) if length else b''
+
+    keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+    return method.upper(), target.split('?', 1)[0], body, keep_alive
+
+async def write_response(writer: asyncio.StreamWriter, status: int, payload: Dict, keep_alive: bool):
+    """Send a JSON response"""
+    body = json.dumps(payload).encode()
+    head = (f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode('latin-1') + body)
+    await writer.drain()
+
+async def handle_request(service: ForecastService, method: str, path: str, body: bytes):
+    """Route a request; returns (status, payload)"""
+    if path == '/health':
+        if method != 'GET':
+            raise RequestError("Use GET /health", status=405)
+        return 200, service.health()
+
+    if path == '/forecast':
+        if method != 'POST':
+            raise RequestError("Use POST /forecast", status=405)
+        request = parse_forecast_request(body)
+        results = await service.forecast(request['disease'], request['countries'], request['metric'],
+                                         request['use_pytorch'], request['target_year'])
+        payload = {'dataset_version': service.dataset_version, 'results': results}
+        if request['insights']:
+            payload['insights'] = service.insights(results, request['disease'], request['metric'])
+        return 200, payload
+
+    raise RequestError(f"Unknown path: {path}", status=404)
+
+def make_connection_handler(service: ForecastService):
+    """asyncio.start_server callback serving requests on one connection (keep-alive aware)"""
+    async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    method, path, body, keep_alive = request
+                    status, payload = await handle_request(service, method, path, body)
+                except RequestError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except asyncio.IncompleteReadError:
+                    break
+                except Exception as e:
+                    status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+
+                await write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return handle_connection
+
+async def serve(service: ForecastService, host: str = '127.0.0.1', port: int = 8765):
+    """Run the service until cancelled"""
+    server = await asyncio.start_server(make_connection_handler(service), host, port)
+    print(f"🚀 Forecast service listening on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    """Start the local forecast service"""
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON forecast service")
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port (default 8765)')
+    parser.add_argument('--data-path', default='data/processed/unified_epidemic_data.csv', help='Unified dataset')
+    parser.add_argument('--store-dir', default='data/processed/forecasts', help='Forecast store directory')
+    parser.add_argument('--batch-window-ms', type=float, default=10, help='How long to collect countries into one batch (default 10)')
+    parser.add_argument('--max-batch-size', type=int, default=64, help='Countries per batch before flushing early (default 64)')
+    parser.add_argument('--workers', type=int, default=4, help='Forecast worker threads (default 4)')
+    args = parser.parse_args()
+
+    print("🔮 FORECAST SERVICE")
+    print("=" * 50)
+
+    service = ForecastService(args.data_path, args.store_dir, args.batch_window_ms, args.max_batch_size, max_workers=args.workers)
+    service.load_dataset()
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 Forecast service stopped")
+    finally:
+        service.executor.shutdown(wait=False, cancel_futures=True)
+
+if __name__ == "__main__":
+    main()
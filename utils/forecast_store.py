@@ -0,0 +1,254 @@
+import pandas as pd
+import numpy as np
+import hashlib
+import os
+import sys
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.forecast_engine import EpidemicForecaster, CompactForecast
+from utils.instrumentation import timed
+
+# Every metric the Trends page can chart: raw counts, per-100k rates and rolling averages
+FORECAST_METRICS = [
+    'total_cases', 'new_cases', 'total_deaths', 'new_deaths',
+    'total_cases_per_100k', 'new_cases_per_100k', 'total_deaths_per_100k', 'new_deaths_per_100k',
+    'new_cases_7d_avg', 'new_cases_14d_avg', 'new_deaths_7d_avg', 'new_deaths_14d_avg'
+]
+
+# Version hashes are cached per (path, mtime, size) so lookups don't rehash the file
+_version_cache = {}
+
+def get_dataset_version(data_path: str = "data/processed/unified_epidemic_data.csv") -> str:
+    """Short content hash identifying the processed dataset that forecasts were built from"""
+    stat = os.stat(data_path)
+    cache_key = (os.path.abspath(data_path), stat.st_mtime_ns, stat.st_size)
+
+    if cache_key not in _version_cache:
+        digest = hashlib.sha1()
+        with open(data_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        _version_cache[cache_key] = digest.hexdigest()[:12]
+
+    return _version_cache[cache_key]
+
+class ForecastStore:
+    """
+    Persistent store of precomputed forecasts.
+
+    One compact Parquet file is written per (dataset version, disease, metric, method),
+    with one row per country and the forecast series stored as float32 lists:
+
+        data/processed/forecasts/<version>/<disease>__<metric>__<method>.parquet
+
+    Pages look forecasts up by country instead of computing them on every rerun.
+    """
+
+    def __init__(self, base_dir: str = "data/processed/forecasts", dataset_version: Optional[str] = None,
+                 data_path: str = "data/processed/unified_epidemic_data.csv"):
+        self.base_dir = base_dir
+        self.dataset_version = dataset_version or get_dataset_version(data_path)
+        self._tables = {}  # In-memory cache of loaded files, keyed by file path
+
+    @staticmethod
+    def method_slug(use_pytorch: bool = False, target_year: Optional[int] = None) -> str:
+        """File-name component for a forecasting method (and projection year)"""
+        slug = "pytorch" if use_pytorch else "exponential_smoothing"
+        if target_year is not None:
+            slug += f"__proj{target_year}"
+        return slug
+
+    def get_path(self, disease: str, metric: str, use_pytorch: bool = False, target_year: Optional[int] = None) -> str:
+        """Location of the file holding one (disease, metric, method) combination"""
+        disease_slug = disease.lower().replace('-', '_')
+        file_name = f"{disease_slug}__{metric}__{self.method_slug(use_pytorch, target_year)}.parquet"
+        return os.path.join(self.base_dir, self.dataset_version, file_name)
+
+    def has(self, disease: str, metric: str, use_pytorch: bool = False, target_year: Optional[int] = None) -> bool:
+        """True if forecasts for this combination have been precomputed"""
+        return os.path.exists(self.get_path(disease, metric, use_pytorch, target_year))
+
+    @staticmethod
+    def _series(result, key: str) -> np.ndarray:
+        """Forecast series as float32, without building lists for CompactForecast results"""
+        if isinstance(result, CompactForecast):
+            return result.array(key)
+        return np.asarray(result[key], dtype=np.float32)
+
+    @staticmethod
+    def _forecast_start(result):
+        """First forecast date of a result (NaT if unsuccessful)"""
+        if not result['success']:
+            return pd.NaT
+        if isinstance(result, CompactForecast):
+            return pd.Timestamp(result.forecast_start)
+        return pd.Timestamp(result['forecast_dates'][0])
+
+    def build_table(self, results: Dict[str, Dict], target_year: Optional[int] = None) -> pd.DataFrame:
+        """One row per country from batch_forecast / batch_project_to_current_year results"""
+        rows = []
+        for country, result in results.items():
+            row = {
+                'country': country,
+                'success': bool(result['success']),
+                'message': result.get('message', ''),
+                'forecast_method': result.get('forecast_method', ''),
+                'forecast_values': self._series(result, 'forecast_values'),
+                'lower_bound': self._series(result, 'lower_bound'),
+                'upper_bound': self._series(result, 'upper_bound'),
+                'forecast_start': self._forecast_start(result)
+            }
+
+            if target_year is None:
+                row['last_date'] = pd.Timestamp(result['last_date']) if result['success'] else pd.NaT
+                if not result['success']:
+                    row['n_history'] = 0
+                elif 'n_history' in result:
+                    row['n_history'] = result['n_history']
+                else:
+                    row['n_history'] = len(result['historical_data'])
+            else:
+                row['projected_values'] = np.asarray(result['projected_values'], dtype=np.float32)
+                row['original_period'] = result.get('original_period', '')
+                row['duration_days'] = result.get('duration_days', 0)
+
+            rows.append(row)
+
+        return pd.DataFrame(rows)
+
+    @staticmethod
+    def write_table(table: pd.DataFrame, path: str) -> str:
+        """Write a table atomically: readers (and resumed runs) never see a partial file"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        table.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        return path
+
+    @timed()
+    def write(self, disease: str, metric: str, results: Dict[str, Dict], use_pytorch: bool = False, target_year: Optional[int] = None) -> str:
+        """Save batch_forecast / batch_project_to_current_year results and return the file path"""
+        table = self.build_table(results, target_year)
+        path = self.write_table(table, self.get_path(disease, metric, use_pytorch, target_year))
+        self._tables[path] = table.set_index('country', drop=False)
+        return path
+
+    def load(self, disease: str, metric: str, use_pytorch: bool = False, target_year: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """Load the stored table for a combination (None if not precomputed)"""
+        path = self.get_path(disease, metric, use_pytorch, target_year)
+
+        if path not in self._tables:
+            if not os.path.exists(path):
+                return None
+            self._tables[path] = pd.read_parquet(path).set_index('country', drop=False)
+
+        return self._tables[path]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the tables loaded so far"""
+        return int(sum(table.memory_usage(deep=True).sum() for table in list(self._tables.values())))
+
+    def lookup(self, disease: str, metric: str, country: str, use_pytorch: bool = False, target_year: Optional[int] = None, compact: bool = False) -> Optional[Dict]:
+        """
+        Return a stored forecast in the same shape generate_forecast/project_to_current_year return.
+        With compact=True (forecasts only) a CompactForecast without history is returned.
+        """
+        table = self.load(disease, metric, use_pytorch, target_year)
+        if table is None or country not in table.index:
+            return None
+
+        row = table.loc[country]
+
+        if compact and target_year is None:
+            if not row['success']:
+                return CompactForecast.failure(country, disease, metric, row['message'])
+            return CompactForecast(
+                country, disease, metric, row['forecast_start'],
+                row['forecast_values'], row['lower_bound'], row['upper_bound'], row['forecast_method']
+            )
+
+        if not row['success']:
+            result = {
+                'success': False,
+                'message': row['message'],
+                'forecast_dates': [],
+                'forecast_values': [],
+                'lower_bound': [],
+                'upper_bound': []
+            }
+            if target_year is not None:
+                result['projected_dates'] = []
+                result['projected_values'] = []
+            return result
+
+        forecast_values = row['forecast_values'].tolist()
+        forecast_start = row['forecast_start'].to_pydatetime()
+
+        result = {
+            'success': True,
+            'country': country,
+            'disease': disease,
+            'metric': metric,
+            'forecast_dates': [forecast_start + timedelta(days=i) for i in range(len(forecast_values))],
+            'forecast_values': forecast_values,
+            'lower_bound': row['lower_bound'].tolist(),
+            'upper_bound': row['upper_bound'].tolist(),
+            'forecast_method': row['forecast_method']
+        }
+
+        if target_year is None:
+            result['last_date'] = row['last_date']
+            result['n_history'] = int(row['n_history'])
+        else:
+            projected_values = row['projected_values'].tolist()
+            projected_start = forecast_start - timedelta(days=len(projected_values))
+            result.update({
+                'target_year': target_year,
+                'original_period': row['original_period'],
+                'projected_dates': [projected_start + timedelta(days=i) for i in range(len(projected_values))],
+                'projected_values': projected_values,
+                'duration_days': int(row['duration_days'])
+            })
+
+        return result
+
+    @timed()
+    def lookup_batch(self, disease: str, metric: str, countries: List[str], use_pytorch: bool = False, target_year: Optional[int] = None) -> Dict[str, Dict]:
+        """Look up several countries; countries without a stored forecast are left out"""
+        results = {}
+        for country in countries:
+            result = self.lookup(disease, metric, country, use_pytorch, target_year)
+            if result is not None:
+                results[country] = result
+        return results
+
+    @timed()
+    def precompute(self, data: pd.DataFrame, diseases: Optional[List[str]] = None, metrics: Optional[List[str]] = None,
+                   use_pytorch: bool = False, target_year: Optional[int] = None) -> List[str]:
+        """
+        Forecast every country for each (disease, metric) in this process and write the
+        results. Meant for a few combinations (e.g. warmup); utils/precompute_forecasts.py
+        fills the whole store in parallel.
+        """
+        forecaster = EpidemicForecaster()
+        diseases = diseases or sorted(data['disease'].unique())
+        metrics = metrics or FORECAST_METRICS
+        written = []
+
+        for disease in diseases:
+            countries = sorted(data.loc[data['disease'] == disease, 'country'].unique())
+
+            for metric in metrics:
+                if target_year is not None:
+                    results = forecaster.batch_project_to_current_year(data, disease, countries, metric, target_year, use_pytorch)
+                else:
+                    results = forecaster.batch_forecast(data, disease, countries, metric, use_pytorch, compact=True)
+
+                path = self.write(disease, metric, results, use_pytorch, target_year)
+                written.append(path)
+                print(f"💾 {disease} / {metric}: {len(results)} forecasts saved to {path}")
+
+        return written
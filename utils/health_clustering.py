@@ -0,0 +1,495 @@
+"""
+K-means clustering of countries into healthcare access groups.
+
+sweep_cluster_counts fits K-means for a range of cluster counts and scores each
+(inertia, silhouette, Davies-Bouldin) for the elbow chart on the Healthcare Access page.
+
+cluster_health_access_by_year clusters every expenditure year (2015-2022) on one
+shared scale and aligns each year's clusters to a pooled reference by centroid
+matching, so a country's tier can be followed across years. The yearly result is
+persisted next to the models and cached.
+
+Fitted models (scaler and KMeans centroids) are persisted with joblib under
+data/processed/clustering/, keyed by a hash of the input features plus the
+feature list, n_clusters and random_state, so the fit only reruns when the data
+or the parameters change, including across server restarts.
+"""
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import hashlib
+import joblib
+from joblib import Parallel, delayed
+from sklearn.cluster import KMeans, kmeans_plusplus
+from sklearn.preprocessing import StandardScaler
+from scipy.optimize import linear_sum_assignment
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.instrumentation import timed, track_cache, count_cache
+
+# The three key metrics for healthcare access
+FEATURES = ['avg_he_pct_gdp', 'avg_he_per_capita', 'avg_gdp_billions']
+MODEL_DIR = "data/processed/clustering"
+
+# Expenditure years available per country, and their column in the health table
+YEARS = list(range(2015, 2023))
+YEARLY_COLUMNS = {
+    'avg_he_pct_gdp': "{year} H.E.(% of GDP)",
+    'avg_he_per_capita': "{year} H.E. per capita (USD)",
+    'avg_gdp_billions': "{year} GDP(USD) by mil"
+}
+
+def prepare_features(data, features=FEATURES):
+    """Feature matrix for clustering, missing values filled with the column median"""
+    clustering_features = data[features].copy()
+
+    # Handle any missing values (use median as sensible default)
+    for col in features:
+        clustering_features[col] = clustering_features[col].fillna(clustering_features[col].median())
+
+    return clustering_features
+
+def get_data_version(data, features=FEATURES):
+    """Short content hash of the countries and feature values a model is fitted on"""
+    digest = hashlib.sha1()
+    digest.update(pd.util.hash_pandas_object(data['Country Code'], index=False).values.tobytes())
+    digest.update(np.ascontiguousarray(data[features].to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()[:12]
+
+def get_model_path(data_version, features=FEATURES, n_clusters=4, random_state=42, model_dir=MODEL_DIR):
+    """Location of the persisted model for one (data version, features, n_clusters, random_state)"""
+    features_slug = hashlib.sha1(','.join(features).encode()).hexdigest()[:8]
+    return os.path.join(model_dir, data_version, f"kmeans__{features_slug}__k{n_clusters}__rs{random_state}.joblib")
+
+@timed()
+def fit_clustering_model(clustering_features, n_clusters=4, random_state=42):
+    """Standardize the features and fit K-means; returns (scaler, kmeans)"""
+    # Standardize all features so they're on the same scale
+    scaler = StandardScaler()
+    scaled_features = scaler.fit_transform(clustering_features)
+
+    # Run K-means clustering to find the groups
+    kmeans = KMeans(n_clusters=n_clusters, random_state=random_state, n_init=10)
+    kmeans.fit(scaled_features)
+
+    return scaler, kmeans
+
+@timed()
+def load_or_fit_clustering_model(data, features=FEATURES, n_clusters=4, random_state=42, model_dir=MODEL_DIR):
+    """Persisted (scaler, kmeans) for this data and parameters, fitting and saving it if missing"""
+    path = get_model_path(get_data_version(data, features), features, n_clusters, random_state, model_dir)
+
+    if os.path.exists(path):
+        try:
+            model = joblib.load(path)
+            count_cache('clustering_model', hit=True)
+            return model['scaler'], model['kmeans']
+        except Exception as e:
+            print(f"⚠️ Could not load clustering model {path}, refitting: {e}")
+
+    count_cache('clustering_model', hit=False)
+    scaler, kmeans = fit_clustering_model(prepare_features(data, features), n_clusters, random_state)
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        joblib.dump({'scaler': scaler, 'kmeans': kmeans, 'features': list(features),
+                     'n_clusters': n_clusters, 'random_state': random_state}, tmp_path)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ Could not save clustering model to {path}: {e}")
+
+    return scaler, kmeans
+
+def get_cluster_labels(cluster_stats):
+    """Access tier name for each cluster (a Series indexed like cluster_stats), from the cluster's mean features"""
+    he_per_capita = cluster_stats['avg_he_per_capita']
+    he_pct_gdp = cluster_stats['avg_he_pct_gdp']
+    gdp = cluster_stats['avg_gdp_billions']
+
+    # Label clusters based on spending patterns (thresholds from global data analysis); first match wins
+    conditions = [
+        (he_per_capita > 1500) & (gdp > 100),       # Rich countries with high absolute spending
+        (he_per_capita > 300) & (he_pct_gdp > 6.0),  # Good spending with health priority
+        (he_pct_gdp > 6.5) & (he_per_capita < 400)   # High priority but limited resources
+    ]
+    choices = [
+        "High Access - Advanced Economy",
+        "Medium-High Access - Developing",
+        "High Priority - Limited Resources"
+    ]
+    # Lower spending across the board
+    labels = np.select(conditions, choices, default="Low Access - Resource Constrained")
+    return pd.Series(labels, index=cluster_stats.index, dtype=object)
+
+def fit_trend_lines(mean_x, mean_y, mean_xx, mean_xy, x_min, x_max, fit, log=False, n_points=100):
+    """
+    Least-squares line of y on x for every cluster at once, from per-cluster
+    moments, evaluated at n_points across each cluster's x range. With log=True
+    the inputs are moments of log10 x and log10 y and the result is the power
+    law y = 10^a * x^b. Returns one (x, y) pair of arrays per cluster, or None
+    where `fit` is False.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = (mean_xy - mean_x * mean_y) / (mean_xx - mean_x ** 2)
+    intercept = mean_y - slope * mean_x
+
+    steps = np.linspace(0, 1, n_points)
+    xs = x_min.to_numpy()[:, None] + (x_max - x_min).to_numpy()[:, None] * steps
+    ys = intercept.to_numpy()[:, None] + slope.to_numpy()[:, None] * xs
+    if log:
+        xs, ys = 10 ** xs, 10 ** ys
+
+    return [(x, y) if ok else None for x, y, ok in zip(xs, ys, fit)]
+
+def summarize_clusters(data, by='cluster_label', n_samples=5):
+    """
+    Everything the Healthcare Access page shows per cluster, in one groupby:
+    size, feature means and ranges, GDP vs spending correlation and trend lines
+    (linear and log-log), efficiency ratio (spending per capita / % of GDP),
+    top countries and members
+    """
+    x = data['avg_gdp_billions']
+    y = data['avg_he_per_capita']
+
+    # Moments for the per-cluster Pearson correlation and linear trend, over countries with both values
+    both = x.notna() & y.notna()
+    x, y = x.where(both), y.where(both)
+
+    # Same in log10 space for the log-log (power law) trend, over countries with both values positive
+    positive = both & (x > 0) & (y > 0)
+    log_x = np.log10(x.where(positive))
+    log_y = np.log10(y.where(positive))
+
+    work = pd.DataFrame({
+        by: data[by],
+        'Country Name': data['Country Name'],
+        **{feature: data[feature] for feature in FEATURES},
+        'efficiency_ratio': data['avg_he_per_capita'] / data['avg_he_pct_gdp'],
+        '_x': x, '_y': y, '_xx': x * x, '_yy': y * y, '_xy': x * y,
+        '_lx': log_x, '_ly': log_y, '_lxx': log_x * log_x, '_lxy': log_x * log_y
+    })
+
+    # One groupby; each reduction runs over all its columns at once
+    grouped = work.groupby(by)
+    moments = ['_x', '_y', '_xx', '_yy', '_xy', '_lx', '_ly', '_lxx', '_lxy']
+    means = grouped[FEATURES + ['efficiency_ratio'] + moments].mean()
+    lows = grouped[['avg_he_per_capita', 'avg_he_pct_gdp', '_x', '_lx']].min()
+    highs = grouped[['avg_he_per_capita', 'avg_he_pct_gdp', '_x', '_lx']].max()
+    pairs = grouped[['_x', '_lx']].count()
+    top_rows = grouped[['avg_he_per_capita', 'avg_he_pct_gdp']].idxmax()
+    members = grouped['Country Name'].agg(list)
+
+    summary = pd.DataFrame({
+        'countries': grouped.size(),
+        'avg_he_per_capita': means['avg_he_per_capita'],
+        'min_he_per_capita': lows['avg_he_per_capita'],
+        'max_he_per_capita': highs['avg_he_per_capita'],
+        'avg_he_pct_gdp': means['avg_he_pct_gdp'],
+        'min_he_pct_gdp': lows['avg_he_pct_gdp'],
+        'max_he_pct_gdp': highs['avg_he_pct_gdp'],
+        'avg_gdp_billions': means['avg_gdp_billions'],
+        'efficiency_ratio': means['efficiency_ratio'],
+        # idxmax gives row labels; look up the country names
+        'top_spender': work.loc[top_rows['avg_he_per_capita'], 'Country Name'].to_numpy(),
+        'top_pct_gdp': work.loc[top_rows['avg_he_pct_gdp'], 'Country Name'].to_numpy(),
+        'members': members,
+        'sample_members': members.str[:n_samples]
+    })
+
+    covariance = means['_xy'] - means['_x'] * means['_y']
+    variance = (means['_xx'] - means['_x'] ** 2) * (means['_yy'] - means['_y'] ** 2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        summary['gdp_he_correlation'] = covariance / np.sqrt(variance)
+
+    # Trend of spending per capita on GDP; clusters need 3+ countries and 2+ usable points
+    enough = summary['countries'] > 2
+    summary['trend_line'] = fit_trend_lines(
+        means['_x'], means['_y'], means['_xx'], means['_xy'], lows['_x'], highs['_x'],
+        enough & (pairs['_x'] > 1) & (highs['_x'] > lows['_x'])
+    )
+    summary['loglog_trend_line'] = fit_trend_lines(
+        means['_lx'], means['_ly'], means['_lxx'], means['_lxy'], lows['_lx'], highs['_lx'],
+        enough & (pairs['_lx'] > 1) & (highs['_lx'] > lows['_lx']), log=True
+    )
+
+    return summary
+
+@timed()
+def perform_health_access_clustering(data, n_clusters=4, random_state=42, scaler=None, kmeans=None):
+    """
+    Group countries into 4 healthcare access clusters using K-means.
+    Each cluster represents a different healthcare access pattern.
+    A previously fitted scaler and kmeans can be passed in to skip the fit.
+    Returns (data, cluster_stats, scaler, kmeans, cluster_summary); cluster_summary
+    has one row per access tier (see summarize_clusters).
+    """
+    features = FEATURES
+    clustering_features = prepare_features(data, features)
+
+    if scaler is None or kmeans is None:
+        scaler, kmeans = fit_clustering_model(clustering_features, n_clusters, random_state)
+
+    # Assign each country to its nearest centroid
+    data['cluster'] = kmeans.predict(scaler.transform(clustering_features))
+
+    # Calculate average characteristics of each cluster
+    cluster_stats = data.groupby('cluster')[features].mean()
+    cluster_sizes = data['cluster'].value_counts()
+
+    # Give each cluster a meaningful name based on its spending patterns
+    cluster_labels = get_cluster_labels(cluster_stats)
+
+    # Add the cluster names to our data
+    data['cluster_label'] = data['cluster'].map(cluster_labels)
+
+    # Per-tier summary reused by every tab of the Healthcare Access page
+    cluster_summary = summarize_clusters(data)
+
+    # Show what we found (useful for debugging)
+    print(f"Cluster distribution:")
+    for cluster_id, stats in cluster_stats.iterrows():
+        print(f"  {cluster_labels[cluster_id]}: {cluster_sizes.get(cluster_id, 0)} countries")
+        print(f"    Avg spending/capita: ${stats['avg_he_per_capita']:.0f}")
+        print(f"    Avg spending % GDP: {stats['avg_he_pct_gdp']:.1f}%")
+
+    return data, cluster_stats, scaler, kmeans, cluster_summary
+
+@track_cache("clustering")
+@st.cache_data
+@timed()
+def get_health_access_clusters(data, n_clusters=4, random_state=42):
+    """
+    Cached clustering: reruns and new sessions reuse the result, and the fitted
+    model is loaded from disk unless the data or parameters changed
+    """
+    scaler, kmeans = load_or_fit_clustering_model(data, FEATURES, n_clusters, random_state)
+    return perform_health_access_clustering(data, n_clusters, random_state, scaler, kmeans)
+
+def pairwise_distances(X):
+    """Euclidean distance matrix (the standardized feature matrix is small: ~200 countries)"""
+    squared_norms = (X ** 2).sum(axis=1)
+    squared = squared_norms[:, None] + squared_norms[None, :] - 2 * X @ X.T
+    np.maximum(squared, 0, out=squared)
+    return np.sqrt(squared)
+
+def silhouette(distances, labels, n_clusters):
+    """Mean silhouette coefficient from a precomputed distance matrix, without a per-point loop"""
+    n_points = len(labels)
+    rows = np.arange(n_points)
+    membership = np.eye(n_clusters)[labels]
+    counts = membership.sum(axis=0)
+
+    # Summed distance from every point to every cluster
+    cluster_sums = distances @ membership
+    own_counts = counts[labels]
+
+    a = cluster_sums[rows, labels] / np.maximum(own_counts - 1, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_to_clusters = cluster_sums / counts
+    mean_to_clusters[rows, labels] = np.inf
+    b = mean_to_clusters.min(axis=1)
+
+    scores = (b - a) / np.maximum(a, b)
+    scores[own_counts == 1] = 0  # Singletons score 0 by convention
+    return float(scores.mean())
+
+def davies_bouldin(X, labels, centers):
+    """Davies-Bouldin index (lower is better)"""
+    n_clusters = len(centers)
+    to_center = np.linalg.norm(X - centers[labels], axis=1)
+    scatter = np.bincount(labels, weights=to_center, minlength=n_clusters) / np.bincount(labels, minlength=n_clusters)
+
+    separation = pairwise_distances(centers)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = (scatter[:, None] + scatter[None, :]) / separation
+    np.fill_diagonal(ratios, -np.inf)
+    return float(ratios.max(axis=1).mean())
+
+def fit_cluster_count(X, n_clusters, seedings, distances):
+    """Best of one K-means fit per warm start for a given k, with its quality scores"""
+    best = None
+    for seeding in seedings:
+        kmeans = KMeans(n_clusters=n_clusters, init=seeding[:n_clusters], n_init=1).fit(X)
+        if best is None or kmeans.inertia_ < best.inertia_:
+            best = kmeans
+
+    labels = best.labels_
+    return {
+        'n_clusters': n_clusters,
+        'inertia': float(best.inertia_),
+        'silhouette': silhouette(distances, labels, n_clusters),
+        'davies_bouldin': davies_bouldin(X, labels, best.cluster_centers_),
+        'smallest_cluster': int(np.bincount(labels).min())
+    }
+
+@timed()
+def sweep_cluster_counts(data, k_values=range(2, 11), random_state=42, n_init=10, n_jobs=-1):
+    """
+    Fit K-means for every k in k_values (in parallel) on the same standardized
+    features perform_health_access_clustering uses, and score each fit.
+
+    Warm starts: n_init k-means++ seedings of max(k) centres are drawn once; the
+    first k centres of a seeding are a k-means++ seeding for k, so every k starts
+    from the same well-spread centres instead of reseeding.
+
+    Only k values from 2 up to one less than the number of countries can be fitted;
+    others are skipped, and with none left the sweep is empty.
+    """
+    X = StandardScaler().fit_transform(prepare_features(data))
+    k_values = [k for k in k_values if 2 <= k < len(X)]
+    if not k_values:
+        return pd.DataFrame(columns=['n_clusters', 'inertia', 'silhouette', 'davies_bouldin', 'smallest_cluster'])
+
+    rng = np.random.RandomState(random_state)
+    seedings = [kmeans_plusplus(X, max(k_values), random_state=rng.randint(np.iinfo(np.int32).max))[0] for _ in range(n_init)]
+    distances = pairwise_distances(X)
+
+    # Tiny fits: threads avoid process start-up and copying X
+    results = Parallel(n_jobs=n_jobs, prefer='threads')(
+        delayed(fit_cluster_count)(X, k, seedings, distances) for k in k_values
+    )
+    return pd.DataFrame(results)
+
+@track_cache("clustering")
+@st.cache_data
+@timed()
+def get_cluster_sweep(data, k_min=2, k_max=10, random_state=42):
+    """Cached sweep_cluster_counts, so the elbow chart redraws instantly"""
+    return sweep_cluster_counts(data, range(k_min, k_max + 1), random_state)
+
+def get_yearly_features(raw_data, years=YEARS):
+    """
+    One row per country and year with the clustering features for that single year
+    (same column names and units as the 2020-2022 averages). Country-years without
+    health spending data are dropped; a missing GDP is filled with that year's median.
+    """
+    n_countries = len(raw_data)
+    yearly = pd.DataFrame({
+        'Country Name': np.repeat(raw_data['Country Name'].to_numpy(), len(years)),
+        'Country Code': np.repeat(raw_data['Country Code'].to_numpy(), len(years)),
+        'year': np.tile(years, n_countries)
+    })
+    for feature, template in YEARLY_COLUMNS.items():
+        columns = [template.format(year=year) for year in years]
+        yearly[feature] = raw_data[columns].to_numpy(dtype=np.float64).ravel()
+
+    # % of GDP is stored as a fraction, GDP in millions
+    yearly['avg_he_pct_gdp'] *= 100
+    yearly['avg_gdp_billions'] /= 1000
+
+    yearly = yearly.dropna(subset=['avg_he_pct_gdp', 'avg_he_per_capita']).reset_index(drop=True)
+    yearly['avg_gdp_billions'] = yearly['avg_gdp_billions'].fillna(
+        yearly.groupby('year')['avg_gdp_billions'].transform('median')
+    )
+    return yearly
+
+def align_clusters(reference_centers, centers):
+    """
+    Map each cluster in `centers` to a reference cluster id by centroid matching:
+    the one-to-one assignment with the smallest total centroid distance (Hungarian)
+    """
+    cost = np.linalg.norm(centers[:, None, :] - reference_centers[None, :, :], axis=2)
+    rows, cols = linear_sum_assignment(cost)
+    mapping = np.empty(len(centers), dtype=int)
+    mapping[rows] = cols
+    return mapping
+
+def fit_year(X, n_clusters, random_state, reference_centers):
+    """K-means for one year, with its labels renumbered to the reference clusters"""
+    kmeans = KMeans(n_clusters=n_clusters, random_state=random_state, n_init=10).fit(X)
+    mapping = align_clusters(reference_centers, kmeans.cluster_centers_)
+    return mapping[kmeans.labels_]
+
+@timed()
+def cluster_health_access_by_year(raw_data, years=YEARS, n_clusters=4, random_state=42, n_jobs=-1):
+    """
+    Cluster countries separately for every year.
+
+    All country-years share one scaler, so a year's clusters are comparable with
+    any other's (rising spending moves countries up a tier rather than being
+    standardized away). A K-means fit on the pooled country-years gives the
+    reference clusters and their tier names; each year is fitted on its own, in
+    parallel, and its clusters renumbered to the matching reference cluster.
+    Returns the country-year table with 'cluster' and 'cluster_label' added.
+    """
+    yearly = get_yearly_features(raw_data, years)
+    X = StandardScaler().fit_transform(yearly[FEATURES])
+
+    reference = KMeans(n_clusters=n_clusters, random_state=random_state, n_init=10).fit(X)
+    reference_stats = yearly.groupby(reference.labels_)[FEATURES].mean()
+    cluster_labels = get_cluster_labels(reference_stats)
+
+    year_rows = [np.flatnonzero(yearly['year'].to_numpy() == year) for year in years]
+    year_rows = [rows for rows in year_rows if len(rows) >= n_clusters]
+    labels = Parallel(n_jobs=n_jobs, prefer='threads')(
+        delayed(fit_year)(X[rows], n_clusters, random_state, reference.cluster_centers_) for rows in year_rows
+    )
+
+    yearly['cluster'] = -1
+    for rows, year_labels in zip(year_rows, labels):
+        yearly.loc[rows, 'cluster'] = year_labels
+    yearly = yearly[yearly['cluster'] >= 0].reset_index(drop=True)
+    yearly['cluster_label'] = yearly['cluster'].map(cluster_labels)
+
+    return yearly
+
+def get_yearly_clusters_path(data_version, years=YEARS, n_clusters=4, random_state=42, model_dir=MODEL_DIR):
+    """Location of the persisted per-year clustering for one data version and parameters"""
+    return os.path.join(model_dir, data_version, f"yearly__{years[0]}-{years[-1]}__k{n_clusters}__rs{random_state}.parquet")
+
+@timed()
+def load_or_compute_yearly_clusters(raw_data, years=YEARS, n_clusters=4, random_state=42, model_dir=MODEL_DIR):
+    """Persisted per-year clustering for this data and parameters, computing and saving it if missing"""
+    yearly_columns = [template.format(year=year) for template in YEARLY_COLUMNS.values() for year in years]
+    path = get_yearly_clusters_path(get_data_version(raw_data, yearly_columns), years, n_clusters, random_state, model_dir)
+
+    if os.path.exists(path):
+        try:
+            yearly = pd.read_parquet(path)
+            count_cache('yearly_clusters', hit=True)
+            return yearly
+        except Exception as e:
+            print(f"⚠️ Could not load yearly clusters {path}, recomputing: {e}")
+
+    count_cache('yearly_clusters', hit=False)
+    yearly = cluster_health_access_by_year(raw_data, years, n_clusters, random_state)
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        yearly.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ Could not save yearly clusters to {path}: {e}")
+
+    return yearly
+
+def get_cluster_trajectories(yearly):
+    """
+    One row per country: its access tier in each year (columns are years), the
+    number of tier changes, and the first and latest tier
+    """
+    yearly = yearly.sort_values(['Country Name', 'year'])
+    tiers = yearly.pivot(index='Country Name', columns='year', values='cluster_label')
+
+    # A change is a year whose tier differs from the same country's previous year
+    previous = yearly.groupby('Country Name')['cluster_label'].shift()
+    changed = previous.notna() & (yearly['cluster_label'] != previous)
+    grouped = yearly.groupby('Country Name')['cluster_label']
+
+    tiers['tier_changes'] = changed.groupby(yearly['Country Name']).sum()
+    tiers['first_tier'] = grouped.first()
+    tiers['latest_tier'] = grouped.last()
+    return tiers.reset_index()
+
+@track_cache("clustering")
+@st.cache_data
+@timed()
+def get_yearly_health_access_clusters(raw_data, n_clusters=4, random_state=42):
+    """Cached per-year clustering and country trajectories: (yearly, trajectories)"""
+    yearly = load_or_compute_yearly_clusters(raw_data, YEARS, n_clusters, random_state)
+    return yearly, get_cluster_trajectories(yearly)
@@ -0,0 +1,301 @@
+"""
+Lightweight timing instrumentation for the dashboard hot paths.
+
+Tracing is off unless EPIACCESS_TRACE=1 is set (or enable() is called). When off,
+span() returns a shared no-op context manager and @timed functions call straight
+through, so the overhead is one flag check per call.
+
+When on, spans are grouped into one record per page rerun (page_run) and appended
+as a JSON line to logs/timings.jsonl (override with EPIACCESS_TRACE_FILE). Spans
+opened outside a page run, e.g. in the data processor CLI or a background forecast
+thread, are written as their own record when the outermost span closes.
+
+A page run can also be recorded without writing to the trace file (page_run's
+record argument), which is how the in-app performance panel times a single
+session. Worker threads join the caller's run with attach_run(), and cache
+lookups are tallied per run with count_cache().
+
+    @timed()
+    def load_epidemic_data(): ...
+
+    with span("aggregate", rows=len(data)):
+        ...
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import ContextDecorator, contextmanager
+from datetime import datetime
+
+TRACE_ENV = "EPIACCESS_TRACE"
+TRACE_FILE_ENV = "EPIACCESS_TRACE_FILE"
+DEFAULT_TRACE_FILE = "logs/timings.jsonl"
+
+_enabled = os.environ.get(TRACE_ENV, "").lower() in ("1", "true", "yes", "on")
+_local = threading.local()
+_write_lock = threading.Lock()
+_cache_totals = {}  # Process-wide cache hits/misses, keyed by cache name
+_totals_lock = threading.Lock()
+
+def is_enabled():
+    """True if spans are currently being recorded"""
+    return _enabled
+
+def enable():
+    """Start recording spans (same as setting EPIACCESS_TRACE=1)"""
+    global _enabled
+    _enabled = True
+
+def disable():
+    """Stop recording spans"""
+    global _enabled
+    _enabled = False
+
+def get_trace_file():
+    """Path of the JSONL file timing records are appended to"""
+    return os.environ.get(TRACE_FILE_ENV, DEFAULT_TRACE_FILE)
+
+def _stack():
+    """Open spans of the current thread, innermost last"""
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+def _write_record(record):
+    """Append one timing record to the trace file; tracing must never break a page"""
+    path = get_trace_file()
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        line = json.dumps(record, default=str)
+        with _write_lock, open(path, "a") as f:
+            f.write(line + "\n")
+    except OSError as e:
+        print(f"⚠️ Could not write timing record to {path}: {e}")
+
+class TimingRun:
+    """All spans recorded during one page rerun (or one top-level span outside a rerun)"""
+
+    def __init__(self, page=None, write=True):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.page = page
+        self.write = write  # False for runs only shown in the performance panel
+        self.started_at = datetime.now().isoformat(timespec="milliseconds")
+        self.thread = threading.current_thread().name
+        self.spans = []
+        self.caches = {}
+        self.total_ms = None
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def elapsed_ms(self):
+        """Time since the run started (the final total once finished)"""
+        if self.total_ms is not None:
+            return self.total_ms
+        return (time.perf_counter() - self._start) * 1000
+
+    def add_span(self, entry):
+        """Record a finished span (may be called from worker threads)"""
+        with self._lock:
+            self.spans.append(entry)
+
+    def count_cache(self, cache, hit):
+        """Tally one cache lookup for this run"""
+        with self._lock:
+            counts = self.caches.setdefault(cache, {"hits": 0, "misses": 0})
+            counts["hits" if hit else "misses"] += 1
+
+    def finish(self):
+        """Stop the run clock and return the record written to the trace file"""
+        self.total_ms = (time.perf_counter() - self._start) * 1000
+        return {
+            "run_id": self.run_id,
+            "page": self.page,
+            "started_at": self.started_at,
+            "pid": os.getpid(),
+            "thread": self.thread,
+            "total_ms": round(self.total_ms, 3),
+            "spans": self.spans,
+            "caches": self.caches
+        }
+
+class Span:
+    """Times a block and records it in the current run when it closes"""
+
+    __slots__ = ("name", "attrs", "depth", "parent", "owned_run", "_start")
+
+    def __init__(self, name, attrs=None):
+        self.name = name
+        self.attrs = attrs or {}
+        self.owned_run = None
+
+    def __enter__(self):
+        stack = _stack()
+        self.depth = len(stack)
+        self.parent = stack[-1].name if stack else None
+
+        # Outside a page run, the outermost span gets a run of its own
+        if getattr(_local, "run", None) is None and not stack:
+            self.owned_run = _local.run = TimingRun()
+
+        stack.append(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed_ms = (time.perf_counter() - self._start) * 1000
+        _stack().pop()
+
+        entry = {"name": self.name, "ms": round(elapsed_ms, 3), "depth": self.depth, "parent": self.parent}
+        if self.attrs:
+            entry["attrs"] = self.attrs
+        if exc_type is not None:
+            entry["error"] = exc_type.__name__
+
+        run = getattr(_local, "run", None)
+        if run is not None:
+            thread = threading.current_thread().name
+            if thread != run.thread:
+                entry["thread"] = thread
+            run.add_span(entry)
+
+        if self.owned_run is not None:
+            _local.run = None
+            _write_record(self.owned_run.finish())
+        return False
+
+    def set(self, **attrs):
+        """Attach attributes discovered inside the block (e.g. row counts)"""
+        self.attrs.update(attrs)
+
+class _NullSpan:
+    """Shared no-op span returned while tracing is disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+def _recording():
+    """True if spans should be recorded on this thread"""
+    return _enabled or getattr(_local, "run", None) is not None
+
+def span(name, **attrs):
+    """Context manager timing a block: `with span("filter_data", rows=len(data)):`"""
+    if not _recording():
+        return _NULL_SPAN
+    return Span(name, attrs)
+
+def timed(name=None):
+    """Decorator recording a span around every call (named after the function by default)"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _recording():
+                return func(*args, **kwargs)
+            with Span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def get_current_run():
+    """The run being recorded on this thread (None if tracing is off or no run is open)"""
+    return getattr(_local, "run", None)
+
+@contextmanager
+def attach_run(run):
+    """Record this thread's spans into another thread's run (e.g. a page's background jobs)"""
+    previous = getattr(_local, "run", None)
+    _local.run = run
+    try:
+        yield run
+    finally:
+        _local.run = previous
+
+def count_cache(cache, hit):
+    """Tally a cache lookup in the current run and in the process-wide totals"""
+    with _totals_lock:
+        counts = _cache_totals.setdefault(cache, {"hits": 0, "misses": 0})
+        counts["hits" if hit else "misses"] += 1
+
+    run = getattr(_local, "run", None)
+    if run is not None:
+        run.count_cache(cache, hit)
+
+def get_cache_totals():
+    """Process-wide cache hits/misses since startup"""
+    with _totals_lock:
+        return {cache: dict(counts) for cache, counts in _cache_totals.items()}
+
+def track_cache(cache):
+    """
+    Count hits and misses of a Streamlit-cached function. Goes above @st.cache_data,
+    with @timed() below it: a call that opened the inner span was a miss.
+    """
+    def decorator(cached_func):
+        span_name = cached_func.__qualname__
+
+        @functools.wraps(cached_func)
+        def wrapper(*args, **kwargs):
+            run = getattr(_local, "run", None)
+            if run is None:
+                return cached_func(*args, **kwargs)
+
+            start = len(run.spans)
+            result = cached_func(*args, **kwargs)
+            missed = any(entry["name"] == span_name for entry in run.spans[start:])
+            count_cache(cache, hit=not missed)
+            return result
+
+        # Keep st.cache_data's clear() reachable through the wrapper
+        if hasattr(cached_func, "clear"):
+            wrapper.clear = cached_func.clear
+        return wrapper
+    return decorator
+
+class page_run(ContextDecorator):
+    """
+    Groups every span of one page rerun into a single record, written when the rerun ends.
+    Use as a decorator on a page's main() or as a context manager.
+
+    record (a bool, or a callable checked at the start of each rerun) records the
+    run even while tracing is disabled; such runs are kept in memory for the
+    performance panel and not written to the trace file.
+    """
+
+    def __init__(self, page, record=False):
+        self.page = page
+        self.record = record
+        self.run = None
+
+    def _recreate_cm(self):
+        # Fresh instance per decorated call, so concurrent sessions don't share state
+        return page_run(self.page, self.record)
+
+    def __enter__(self):
+        record = self.record() if callable(self.record) else self.record
+        if (_enabled or record) and get_current_run() is None:
+            self.run = _local.run = TimingRun(self.page, write=_enabled)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.run is not None:
+            _local.run = None
+            record = self.run.finish()
+            if exc_type is not None:
+                record["error"] = exc_type.__name__
+            if self.run.write:
+                _write_record(record)
+            self.run = None
+        return False
@@ -0,0 +1,70 @@
+"""
+Shared cache of trained PyTorch forecasting models.
+
+EpidemicForecaster.pytorch_forecast looks models up here before training, so
+reruns over the same series and parameters skip training. Pass
+use_model_cache=False to EpidemicForecaster to always train (e.g. when timing it).
+"""
+
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, Tuple
+import hashlib
+import threading
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.instrumentation import count_cache
+
+class ModelCache:
+    """
+    Thread-safe LRU cache of trained PyTorch models, keyed by a hash of the
+    training series and the model parameters, so reruns over the same data
+    skip training. Shared by all EpidemicForecaster instances.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(values: np.ndarray, input_size: int, hidden_size: int, epochs: int) -> Tuple:
+        """Cache key for a training series and model parameters"""
+        digest = hashlib.sha1(np.ascontiguousarray(values, dtype=np.float64).tobytes()).hexdigest()
+        return (digest, input_size, hidden_size, epochs)
+
+    def get(self, key: Tuple):
+        """Cached (state_dict, mae) for a key, or None"""
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+        count_cache('pytorch_models', hit=entry is not None)
+        return entry
+
+    def put(self, key: Tuple, state_dict: Dict, mae: float) -> None:
+        """Store a trained model, evicting the least recently used beyond max_entries"""
+        state_dict = {name: tensor.detach().clone() for name, tensor in state_dict.items()}
+        with self._lock:
+            self._models[key] = (state_dict, mae)
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_entries:
+                self._models.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the cached model weights"""
+        with self._lock:
+            entries = list(self._models.values())
+        return sum(tensor.element_size() * tensor.nelement() for state_dict, _ in entries for tensor in state_dict.values())
+
+PYTORCH_MODEL_CACHE = ModelCache()
@@ -0,0 +1,141 @@
+"""
+Opt-in sidebar panel showing what the current page rerun cost: per-stage timings,
+cache hits/misses and memory held by cached objects.
+
+Switched on per session with the sidebar toggle or the ?perf=1 query parameter.
+Timings come from utils/instrumentation.py, so the stages shown are the @timed
+functions and spans the page ran.
+"""
+
+import functools
+import os
+import sys
+
+import pandas as pd
+import streamlit as st
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.instrumentation import page_run, get_current_run, get_cache_totals
+
+PERF_PANEL_KEY = "show_perf_panel"
+
+def perf_panel_requested():
+    """True if the performance panel is switched on for this session"""
+    if st.session_state.get(PERF_PANEL_KEY):
+        return True
+    return st.query_params.get("perf") == "1"
+
+def format_bytes(n_bytes):
+    """Human-readable size"""
+    for unit in ("B", "KB", "MB"):
+        if n_bytes < 1024:
+            return f"{n_bytes:.0f} {unit}"
+        n_bytes /= 1024
+    return f"{n_bytes:.1f} GB"
+
+def get_data_cache_memory():
+    """Bytes held by each st.cache_data function (empty if Streamlit's stats API is unavailable)"""
+    try:
+        from streamlit.runtime.caching import get_data_cache_stats_provider
+        stats = get_data_cache_stats_provider().get_stats()
+    except Exception:
+        return {}
+
+    # Newer Streamlit versions group stats by family
+    if isinstance(stats, dict):
+        stats = [stat for family_stats in stats.values() for stat in family_stats]
+
+    memory = {}
+    for stat in stats:
+        name = stat.cache_name.rsplit('.', 1)[-1]
+        memory[name] = memory.get(name, 0) + stat.byte_length
+    return memory
+
+def build_stage_table(run):
+    """One row per recorded span, nested stages indented"""
+    rows = []
+    for entry in run.spans:
+        attrs = entry.get('attrs', {})
+        rows.append({
+            'Stage': '· ' * entry['depth'] + entry['name'],
+            'ms': round(entry['ms'], 1),
+            'Detail': ', '.join(f"{key}={value}" for key, value in attrs.items()),
+            'Thread': entry.get('thread', '')
+        })
+    return pd.DataFrame(rows, columns=['Stage', 'ms', 'Detail', 'Thread'])
+
+def build_cache_table(run):
+    """Hits/misses for this rerun next to the totals since the server started"""
+    totals = get_cache_totals()
+    rows = []
+    for cache in sorted(set(run.caches) | set(totals)):
+        rerun = run.caches.get(cache, {})
+        total = totals.get(cache, {})
+        rows.append({
+            'Cache': cache,
+            'Hits': rerun.get('hits', 0),
+            'Misses': rerun.get('misses', 0),
+            'Total hits': total.get('hits', 0),
+            'Total misses': total.get('misses', 0)
+        })
+    return pd.DataFrame(rows, columns=['Cache', 'Hits', 'Misses', 'Total hits', 'Total misses'])
+
+def render_perf_panel(cached_objects=None):
+    """Sidebar toggle plus, when switched on, the timings of the current rerun"""
+    st.sidebar.markdown("---")
+    st.sidebar.checkbox(
+        "⏱️ Performance panel",
+        key=PERF_PANEL_KEY,
+        help="Show per-stage timings, cache hits and cache memory for each rerun"
+    )
+
+    if not perf_panel_requested():
+        return
+
+    run = get_current_run()
+    if run is None:
+        st.sidebar.caption("Timings start with the next rerun.")
+        return
+
+    with st.sidebar.expander("⏱️ This Rerun", expanded=True):
+        st.metric("Rerun time", f"{run.elapsed_ms():,.0f} ms")
+
+        stages = build_stage_table(run)
+        if stages.empty:
+            st.caption("No timed stages ran (all results came from cache).")
+        else:
+            st.dataframe(stages, hide_index=True, use_container_width=True)
+
+        st.markdown("**Caches**")
+        caches = build_cache_table(run)
+        if caches.empty:
+            st.caption("No cache lookups recorded yet.")
+        else:
+            st.dataframe(caches, hide_index=True, use_container_width=True)
+
+        st.markdown("**Cached Memory**")
+        memory = get_data_cache_memory()
+        memory.update(cached_objects or {})
+        if memory:
+            memory_table = pd.DataFrame(
+                [{'Object': name, 'Size': format_bytes(n_bytes)} for name, n_bytes in sorted(memory.items(), key=lambda item: -item[1])]
+            )
+            st.dataframe(memory_table, hide_index=True, use_container_width=True)
+        else:
+            st.caption("Nothing cached yet.")
+
+def with_perf_panel(page, cached_objects=None):
+    """
+    Decorator for a page's main(): records the rerun (page_run) and renders the
+    performance panel once main() has finished. cached_objects is an optional
+    callable returning {name: bytes} for caches the page owns.
+    """
+    def decorator(main):
+        @functools.wraps(main)
+        def wrapper(*args, **kwargs):
+            with page_run(page, record=perf_panel_requested):
+                result = main(*args, **kwargs)
+                render_perf_panel(cached_objects() if cached_objects else None)
+            return result
+        return wrapper
+    return decorator
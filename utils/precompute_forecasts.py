@@ -0,0 +1,196 @@
+"""
+Headless batch precomputation of forecasts into the ForecastStore.
+
+Every (disease, metric, method) combination is split into chunks of countries,
+and the chunks are forecast in parallel worker processes. Each finished chunk is
+written as a part file next to the final store file:
+
+    data/processed/forecasts/<version>/<disease>__<metric>__<method>.parts/part-00003.parquet
+
+Once all parts of a combination exist they are merged into the store file and the
+parts are removed. An interrupted run picks up where it stopped: finished store
+files and finished parts are skipped (--force recomputes everything).
+
+Usage:
+    python utils/precompute_forecasts.py                          # all diseases/metrics + 2025 projections
+    python utils/precompute_forecasts.py --diseases COVID-19 --metrics new_cases --workers 8
+    python utils/precompute_forecasts.py --pytorch --project-years  # PyTorch forecasts, no projections
+"""
+
+import pandas as pd
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.forecast_engine import EpidemicForecaster
+from utils.forecast_store import FORECAST_METRICS, ForecastStore, get_dataset_version
+
+# Loaded once per worker process by init_worker
+_worker_data = None
+
+def load_data(data_path):
+    """Load the unified dataset"""
+    data = pd.read_csv(data_path)
+    data['date'] = pd.to_datetime(data['date'])
+    return data
+
+def init_worker(data_path, use_pytorch):
+    """Worker initializer: load the dataset once per process"""
+    global _worker_data
+    _worker_data = load_data(data_path)
+
+    if use_pytorch:
+        # One intra-op thread per worker; the pool already uses every core
+        import torch
+        torch.set_num_threads(1)
+
+def forecast_chunk(task):
+    """Forecast one chunk of countries and write it as a part file (runs in a worker)"""
+    start = time.perf_counter()
+    forecaster = EpidemicForecaster()
+
+    if task['target_year'] is not None:
+        results = forecaster.batch_project_to_current_year(
+            _worker_data, task['disease'], task['countries'], task['metric'], task['target_year'], task['use_pytorch']
+        )
+    else:
+        results = forecaster.batch_forecast(
+            _worker_data, task['disease'], task['countries'], task['metric'], task['use_pytorch'], compact=True
+        )
+
+    store = ForecastStore(base_dir=task['base_dir'], dataset_version=task['dataset_version'])
+    ForecastStore.write_table(store.build_table(results, task['target_year']), task['part_path'])
+    return task, time.perf_counter() - start
+
+def get_parts_dir(final_path):
+    """Directory holding the part files of one store file"""
+    return final_path[:-len('.parquet')] + '.parts'
+
+def plan_combination(store, data, disease, metric, use_pytorch, target_year, chunk_size, force):
+    """
+    Chunk plan for one (disease, metric, method) combination, or None if its store
+    file already exists. The plan is saved with the parts so a resumed run uses the
+    same chunks even if --chunk-size changed.
+    """
+    final_path = store.get_path(disease, metric, use_pytorch, target_year)
+    parts_dir = get_parts_dir(final_path)
+
+    if force:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+    elif os.path.exists(final_path):
+        return None
+
+    plan_path = os.path.join(parts_dir, 'plan.json')
+    if os.path.exists(plan_path):
+        with open(plan_path, 'r') as f:
+            chunks = json.load(f)['chunks']
+    else:
+        countries = sorted(data.loc[data['disease'] == disease, 'country'].unique())
+        chunks = [countries[i:i + chunk_size] for i in range(0, len(countries), chunk_size)]
+        os.makedirs(parts_dir, exist_ok=True)
+        with open(plan_path, 'w') as f:
+            json.dump({'disease': disease, 'metric': metric, 'use_pytorch': use_pytorch,
+                       'target_year': target_year, 'chunks': chunks}, f, indent=2)
+
+    tasks = []
+    for index, countries in enumerate(chunks):
+        tasks.append({
+            'disease': disease,
+            'metric': metric,
+            'use_pytorch': use_pytorch,
+            'target_year': target_year,
+            'countries': countries,
+            'part_path': os.path.join(parts_dir, f'part-{index:05d}.parquet'),
+            'base_dir': store.base_dir,
+            'dataset_version': store.dataset_version
+        })
+
+    return {'final_path': final_path, 'parts_dir': parts_dir, 'tasks': tasks}
+
+def merge_parts(combination):
+    """Merge the part files of a finished combination into its store file"""
+    part_paths = [task['part_path'] for task in combination['tasks']]
+    table = pd.concat([pd.read_parquet(path) for path in part_paths], ignore_index=True)
+    table = table.sort_values('country').reset_index(drop=True)
+
+    ForecastStore.write_table(table, combination['final_path'])
+    shutil.rmtree(combination['parts_dir'], ignore_errors=True)
+    return len(table)
+
+def main():
+    """Precompute forecasts for every (disease, country, metric) combination"""
+    parser = argparse.ArgumentParser(description="Precompute forecasts into the forecast store")
+    parser.add_argument('--data-path', default='data/processed/unified_epidemic_data.csv', help='Unified dataset to forecast')
+    parser.add_argument('--output-dir', default='data/processed/forecasts', help='Forecast store directory')
+    parser.add_argument('--diseases', nargs='+', help='Diseases to forecast (default: all)')
+    parser.add_argument('--metrics', nargs='+', default=FORECAST_METRICS, help='Metrics to forecast (default: every metric the Trends page charts)')
+    parser.add_argument('--pytorch', action='store_true', help='Use the PyTorch model instead of exponential smoothing')
+    parser.add_argument('--project-years', type=int, nargs='*', default=[2025], help='Also precompute projections to these years (default 2025; pass none to skip)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=25, help='Countries per work unit (default 25)')
+    parser.add_argument('--force', action='store_true', help='Recompute even if results already exist')
+    args = parser.parse_args()
+
+    print("🔮 BATCH FORECAST PRECOMPUTATION")
+    print("=" * 50)
+
+    data = load_data(args.data_path)
+    store = ForecastStore(base_dir=args.output_dir, dataset_version=get_dataset_version(args.data_path))
+    diseases = args.diseases or sorted(data['disease'].unique())
+    print(f"📦 Dataset version: {store.dataset_version}")
+
+    combinations = []
+    skipped = 0
+    for target_year in [None] + list(args.project_years):
+        for disease in diseases:
+            for metric in args.metrics:
+                combination = plan_combination(store, data, disease, metric, args.pytorch, target_year, args.chunk_size, args.force)
+                if combination is None:
+                    skipped += 1
+                else:
+                    combinations.append(combination)
+
+    pending = [task for combination in combinations for task in combination['tasks'] if not os.path.exists(task['part_path'])]
+    total_tasks = sum(len(combination['tasks']) for combination in combinations)
+    print(f"⏭️ {skipped} combinations already precomputed")
+    print(f"🧮 {len(combinations)} combinations to build: {len(pending)} of {total_tasks} chunks remaining")
+
+    failed = 0
+    if pending:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=context,
+                                 initializer=init_worker, initargs=(args.data_path, args.pytorch)) as executor:
+            futures = [executor.submit(forecast_chunk, task) for task in pending]
+            for done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    task, elapsed = future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"❌ [{done}/{len(pending)}] Chunk failed: {e}")
+                    continue
+
+                method = ForecastStore.method_slug(task['use_pytorch'], task['target_year'])
+                print(f"✅ [{done}/{len(pending)}] {task['disease']} / {task['metric']} / {method} "
+                      f"{os.path.basename(task['part_path'])}: {len(task['countries'])} countries in {elapsed:.1f}s")
+
+    # Merge every combination whose parts are all present
+    for combination in combinations:
+        if all(os.path.exists(task['part_path']) for task in combination['tasks']):
+            n_rows = merge_parts(combination)
+            print(f"💾 {n_rows} forecasts saved to {combination['final_path']}")
+
+    if failed:
+        print(f"\n⚠️ {failed} chunks failed; rerun the same command to retry them")
+        return 1
+
+    print("\n✅ Forecast precomputation completed successfully!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+Profiling hook that captures a trace when a page rerun is slow.
+
+Enabled with EPIACCESS_PROFILE=1 (or the ?profile=1 query parameter). Every rerun
+is then profiled, and reruns slower than EPIACCESS_PROFILE_THRESHOLD seconds
+(default 5) are written to profiles/ (EPIACCESS_PROFILE_DIR overrides):
+
+    <stamp>_<page>_<ms>ms.prof     cProfile stats of the script thread (snakeviz, pstats)
+    <stamp>_<page>_<ms>ms.folded   sampled stacks of the script and forecast threads
+                                   (flamegraph.pl / speedscope collapsed format)
+    <stamp>_<page>_<ms>ms.json     the page's filter inputs, timings and top functions
+
+cProfile only sees the thread it runs on, so a stack sampler also covers the
+background forecast workers where PyTorch training happens. EPIACCESS_PROFILE=cprofile
+or =sample picks just one of the two.
+"""
+
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+PROFILE_ENV = "EPIACCESS_PROFILE"
+THRESHOLD_ENV = "EPIACCESS_PROFILE_THRESHOLD"
+PROFILE_DIR_ENV = "EPIACCESS_PROFILE_DIR"
+DEFAULT_THRESHOLD_SECONDS = 5.0
+DEFAULT_PROFILE_DIR = "profiles"
+SAMPLED_THREAD_PREFIXES = ("forecast",)  # BackgroundForecastRunner workers
+
+_local = threading.local()
+
+def get_profile_mode():
+    """'both', 'cprofile', 'sample' or None when profiling is off"""
+    value = os.environ.get(PROFILE_ENV, "").lower()
+    if value in ("cprofile", "sample"):
+        return value
+    if value in ("1", "true", "yes", "on", "both"):
+        return "both"
+
+    # Per-session opt-in from the URL when running under Streamlit
+    try:
+        import streamlit as st
+        if st.query_params.get("profile") == "1":
+            return "both"
+    except Exception:
+        pass
+    return None
+
+def get_threshold_seconds():
+    """Rerun duration above which a profile is written"""
+    try:
+        return float(os.environ.get(THRESHOLD_ENV, DEFAULT_THRESHOLD_SECONDS))
+    except ValueError:
+        return DEFAULT_THRESHOLD_SECONDS
+
+def note_inputs(**inputs):
+    """Record the filter inputs of the current rerun, saved alongside its profile"""
+    session = getattr(_local, "session", None)
+    if session is not None:
+        session.inputs.update(inputs)
+
+class StackSampler:
+    """
+    Samples the Python stacks of selected threads at a fixed interval
+    (py-spy style, but in-process) and counts identical stacks.
+    """
+
+    def __init__(self, target_thread_id, interval=0.01, thread_prefixes=SAMPLED_THREAD_PREFIXES):
+        self.target_thread_id = target_thread_id
+        self.interval = interval
+        self.thread_prefixes = thread_prefixes
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _sampled_threads(self):
+        """ident -> name of the threads to sample"""
+        names = {}
+        for thread in threading.enumerate():
+            if thread.ident == self.target_thread_id or thread.name.startswith(self.thread_prefixes):
+                names[thread.ident] = "script" if thread.ident == self.target_thread_id else thread.name
+        return names
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            names = self._sampled_threads()
+            frames = sys._current_frames()
+            for ident, name in names.items():
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(name)
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def to_folded(self):
+        """Collapsed stacks, one 'frame;frame;frame count' line per distinct stack"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+class ProfileSession:
+    """Profiles one rerun and writes the results if it ran longer than the threshold"""
+
+    def __init__(self, page, mode="both", threshold_seconds=None, output_dir=None):
+        self.page = page
+        self.mode = mode
+        self.threshold_seconds = get_threshold_seconds() if threshold_seconds is None else threshold_seconds
+        self.output_dir = output_dir or os.environ.get(PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR)
+        self.inputs = {}
+        self.profiler = cProfile.Profile() if mode in ("both", "cprofile") else None
+        self.sampler = StackSampler(threading.get_ident()) if mode in ("both", "sample") else None
+        self.duration = None
+        self.written = []
+
+    def __enter__(self):
+        _local.session = self
+        self._start = time.perf_counter()
+        if self.sampler is not None:
+            self.sampler.start()
+        if self.profiler is not None:
+            self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.profiler is not None:
+            self.profiler.disable()
+        if self.sampler is not None:
+            self.sampler.stop()
+        self.duration = time.perf_counter() - self._start
+        _local.session = None
+
+        if self.duration >= self.threshold_seconds:
+            try:
+                self.write(exc_type)
+            except OSError as e:
+                print(f"⚠️ Could not write profile to {self.output_dir}: {e}")
+        return False
+
+    def top_functions(self, limit=25):
+        """Slowest functions by cumulative time, from the cProfile stats"""
+        if self.profiler is None:
+            return []
+        stats = pstats.Stats(self.profiler, stream=io.StringIO())
+        rows = []
+        for (file_name, line, func_name), (_, n_calls, total_time, cumulative_time, _) in stats.stats.items():
+            rows.append({
+                "function": f"{func_name} ({os.path.basename(file_name)}:{line})",
+                "calls": n_calls,
+                "total_s": round(total_time, 4),
+                "cumulative_s": round(cumulative_time, 4)
+            })
+        rows.sort(key=lambda row: row["cumulative_s"], reverse=True)
+        return rows[:limit]
+
+    def write(self, exc_type=None):
+        """Write the .prof/.folded traces and the inputs JSON; returns the written paths"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        page_slug = re.sub(r"[^a-z0-9]+", "_", self.page.lower()).strip("_")
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base = os.path.join(self.output_dir, f"{stamp}_{page_slug}_{self.duration * 1000:.0f}ms")
+
+        if self.profiler is not None:
+            self.profiler.dump_stats(f"{base}.prof")
+            self.written.append(f"{base}.prof")
+
+        if self.sampler is not None:
+            with open(f"{base}.folded", "w") as f:
+                f.write(self.sampler.to_folded())
+            self.written.append(f"{base}.folded")
+
+        summary = {
+            "page": self.page,
+            "captured_at": datetime.now().isoformat(timespec="seconds"),
+            "duration_s": round(self.duration, 3),
+            "threshold_s": self.threshold_seconds,
+            "mode": self.mode,
+            "error": exc_type.__name__ if exc_type is not None else None,
+            "inputs": self.inputs,
+            "samples": self.sampler.samples if self.sampler is not None else 0,
+            "top_functions": self.top_functions(),
+            "files": [os.path.basename(path) for path in self.written]
+        }
+        with open(f"{base}.json", "w") as f:
+            json.dump(summary, f, indent=2, default=str)
+        self.written.append(f"{base}.json")
+
+        print(f"🐢 Slow rerun of {self.page} ({self.duration:.1f}s): profile saved to {base}.*")
+        return self.written
+
+def profile_slow_reruns(page):
+    """
+    Decorator for a page's main(): profiles each rerun while profiling is enabled and
+    saves the trace when the rerun is slower than the threshold
+    """
+    def decorator(main):
+        @functools.wraps(main)
+        def wrapper(*args, **kwargs):
+            mode = get_profile_mode()
+            if mode is None:
+                return main(*args, **kwargs)
+            with ProfileSession(page, mode):
+                return main(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,233 @@
+import pandas as pd
+import numpy as np
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.data_processor import EpidemicDataProcessor
+
+UNIFIED_COLUMNS = ['disease', 'country', 'date', 'total_cases', 'new_cases', 'total_deaths', 'new_deaths', 'region',
+                   'population']
+REGIONS = ['Asia', 'Europe', 'Africa', 'North America', 'South America', 'Oceania']
+BASE_DISEASES = ['COVID-19', 'SARS', 'Monkeypox']
+
+class SyntheticEpidemicGenerator:
+    """
+    Generates synthetic epidemic data in the unified schema for scale testing.
+
+    Each series (disease x country or sub-national unit) follows a seasonally forced
+    SIRS model, so curves rise, peak and come back in later years. Reported values
+    then get multiplicative noise, missing report days (the backlog lands on the next
+    reported day) and occasional negative corrections to the cumulative totals. Like
+    the processed data, the result is then aligned to a daily calendar by default,
+    which fills those gaps; generate(align=False) (--raw) keeps them.
+    """
+
+    def __init__(self, n_diseases=3, n_countries=200, n_subnational=0, years=1, start_date="2020-01-22",
+                 noise=0.2, gap_rate=0.03, correction_rate=0.002, seed=42):
+        self.n_diseases = n_diseases
+        self.n_countries = n_countries
+        self.n_subnational = n_subnational  # Units per country; 0 = national series only
+        self.years = years
+        self.start_date = pd.Timestamp(start_date)
+        self.noise = noise                    # Std dev of the log-normal reporting noise
+        self.gap_rate = gap_rate              # Share of days with no report
+        self.correction_rate = correction_rate  # Share of days with a downward revision
+        self.rng = np.random.default_rng(seed)
+        self.metadata = {}
+
+    def disease_names(self):
+        """Bundled disease names first, then numbered synthetic diseases"""
+        extra = [f"Synthetic-{i + 1}" for i in range(max(0, self.n_diseases - len(BASE_DISEASES)))]
+        return (BASE_DISEASES + extra)[:self.n_diseases]
+
+    def locations(self):
+        """Country (or 'Country / Unit') names, their regions and populations"""
+        countries = np.array([f"Country {i + 1:04d}" for i in range(self.n_countries)], dtype=object)
+        regions = np.array([REGIONS[i % len(REGIONS)] for i in range(self.n_countries)], dtype=object)
+        populations = self.rng.lognormal(np.log(5e6), 1.5, self.n_countries).clip(5e4, 1.5e9)
+
+        if not self.n_subnational:
+            return countries, regions, populations
+
+        # Sub-national units are named inside the country column ("Country 0001 / Unit 03")
+        units = np.array([f"Unit {j + 1:02d}" for j in range(self.n_subnational)], dtype=object)
+        names = np.repeat(countries, self.n_subnational) + " / " + np.tile(units, self.n_countries)
+        shares = self.rng.dirichlet(np.ones(self.n_subnational), self.n_countries).ravel()
+        return names, np.repeat(regions, self.n_subnational), np.repeat(populations, self.n_subnational) * shares
+
+    def simulate_sirs(self, populations, n_days):
+        """
+        Daily infections for each series (rows) from a seasonally forced SIRS model,
+        simulated for all series at once.
+        """
+        n_series = len(populations)
+        r0 = self.rng.uniform(1.3, 3.5, n_series)
+        gamma = 1 / self.rng.uniform(5, 14, n_series)       # Recovery rate
+        beta = r0 * gamma
+        waning = 1 / self.rng.uniform(180, 540, n_series)   # Immunity loss rate
+        amplitude = self.rng.uniform(0.1, 0.4, n_series)    # Seasonal forcing
+        phase = self.rng.uniform(0, 365, n_series)
+        onset = self.rng.integers(0, max(1, min(120, n_days // 3)), n_series)
+        importation = self.rng.uniform(0.1, 2.0, n_series)  # Imported infections per day after onset
+
+        susceptible = populations.copy()
+        infected = np.zeros(n_series)
+        recovered = np.zeros(n_series)
+        infections = np.zeros((n_series, n_days))
+
+        for day in range(n_days):
+            # Seed a handful of cases on each series' onset day, then a trickle of importations
+            # that restarts transmission once waning immunity has refilled the susceptibles
+            seeding = np.where(onset == day, self.rng.uniform(1, 20, n_series), 0.0)
+            seeding += np.where(onset < day, importation, 0.0)
+            infected += seeding
+
+            forcing = 1 + amplitude * np.cos(2 * np.pi * (day - phase) / 365)
+            new_infections = np.minimum(beta * forcing * susceptible * infected / populations, susceptible)
+            new_recoveries = gamma * infected
+            lost_immunity = waning * recovered
+
+            susceptible += lost_immunity - new_infections
+            infected += new_infections - new_recoveries
+            recovered += new_recoveries - lost_immunity
+            infections[:, day] = new_infections + seeding
+
+        return infections
+
+    def report(self, infections, ascertainment):
+        """Reported cumulative cases with noise and corrections, plus the missing-report-day mask"""
+        n_series, n_days = infections.shape
+
+        # Only a fraction of infections are reported, with multiplicative noise
+        reported = infections * ascertainment[:, None]
+        reported = np.round(reported * self.rng.lognormal(-self.noise ** 2 / 2, self.noise, reported.shape))
+        totals = np.cumsum(reported, axis=1)
+
+        # Downward revisions (e.g. removed duplicates): 1-5% of the running total is taken off
+        # that day and every later one, which shows up as a negative daily count
+        corrections = np.where(
+            self.rng.random(reported.shape) < self.correction_rate,
+            np.round(totals * self.rng.uniform(0.01, 0.05, reported.shape)), 0.0
+        )
+        totals = np.clip(totals - np.cumsum(corrections, axis=1), 0, None)
+
+        # Missing report days
+        gaps = self.rng.random(reported.shape) < self.gap_rate
+        gaps[:, 0] = False
+        return totals, gaps
+
+    @staticmethod
+    def carry_forward(totals, gaps):
+        """Hold totals flat over missing report days so the backlog lands on the next report"""
+        reported_totals = pd.DataFrame(np.where(gaps, np.nan, totals).T).ffill().to_numpy().T
+        return reported_totals, np.diff(reported_totals, axis=1, prepend=0)
+
+    def generate_disease(self, disease, names, regions, populations, dates):
+        """Unified-schema rows for one disease across all locations"""
+        n_series, n_days = len(names), len(dates)
+
+        infections = self.simulate_sirs(populations, n_days)
+        case_totals, gaps = self.report(infections, self.rng.uniform(0.1, 0.6, n_series))
+
+        # Deaths follow cases after a lag, at a per-series fatality ratio
+        lag = int(self.rng.integers(7, 21))
+        fatality = self.rng.uniform(0.002, 0.04, n_series)[:, None]
+        daily_cases = np.clip(np.diff(case_totals, axis=1, prepend=0), 0, None)
+        lagged_cases = np.pad(daily_cases, ((0, 0), (lag, 0)))[:, :n_days]
+        death_totals = np.cumsum(self.rng.binomial(lagged_cases.astype(np.int64), fatality), axis=1).astype(float)
+
+        total_cases, new_cases = self.carry_forward(case_totals, gaps)
+        total_deaths, new_deaths = self.carry_forward(death_totals, gaps)
+
+        keep = ~gaps.ravel()
+        disease_data = pd.DataFrame({
+            'disease': disease,
+            'country': np.repeat(names, n_days)[keep],
+            'date': np.tile(dates.values, n_series)[keep],
+            'total_cases': total_cases.ravel()[keep],
+            'new_cases': new_cases.ravel()[keep],
+            'total_deaths': total_deaths.ravel()[keep],
+            'new_deaths': new_deaths.ravel()[keep],
+            'region': np.repeat(regions, n_days)[keep],
+            'population': np.repeat(populations, n_days)[keep]
+        })
+
+        self.metadata[disease] = {
+            'start_date': dates[0].strftime('%Y-%m-%d'),
+            'end_date': dates[-1].strftime('%Y-%m-%d'),
+            'countries': names.tolist(),
+            'total_records': len(disease_data),
+            'synthetic': True
+        }
+        return disease_data
+
+    def generate(self, align=True):
+        """
+        Generate the full synthetic dataset in the unified schema. With align=True the
+        series go through the ingest calendar alignment, so the output has no reporting
+        gaps (filled days have reported=False); align=False keeps the gaps as generated.
+        """
+        names, regions, populations = self.locations()
+        dates = pd.date_range(self.start_date, periods=int(self.years * 365), freq='D')
+
+        print(f"🧪 Generating {self.n_diseases} diseases x {len(names)} locations x {len(dates)} days...")
+        datasets = [self.generate_disease(disease, names, regions, populations, dates) for disease in self.disease_names()]
+
+        data = pd.concat(datasets, ignore_index=True)[UNIFIED_COLUMNS]
+
+        # Same layout as the processed data: daily calendar, then per-100k and rolling columns
+        processor = EpidemicDataProcessor()
+        if align:
+            data = processor.align_to_daily_calendar(data)
+        data = processor.add_population_metrics(data)
+        data = processor.add_rolling_metrics(data)
+        print(f"✅ Synthetic dataset created: {len(data)} records")
+        return data
+
+    def save_csv(self, data, path):
+        """Write the dataset as a single unified CSV"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        data.to_csv(path, index=False)
+        print(f"💾 Synthetic dataset saved: {path}")
+
+    def save_processed(self, data, output_dir):
+        """Write the dataset in the data/processed layout the pages read"""
+        processor = EpidemicDataProcessor()
+        processor.unified_data = data
+        processor.metadata = self.metadata
+        processor.save_processed_data(output_dir=output_dir)
+
+def main():
+    """Generate a synthetic dataset from the command line"""
+    parser = argparse.ArgumentParser(description="Generate synthetic epidemic data for scale testing")
+    parser.add_argument('--diseases', type=int, default=3, help='Number of diseases (default 3)')
+    parser.add_argument('--countries', type=int, default=200, help='Number of countries (default 200)')
+    parser.add_argument('--subnational', type=int, default=0, help='Sub-national units per country (default 0)')
+    parser.add_argument('--years', type=float, default=1, help='Years of daily data (default 1)')
+    parser.add_argument('--start-date', default='2020-01-22', help='First date (default 2020-01-22)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default 42)')
+    parser.add_argument('--raw', action='store_true', help='Keep the reporting gaps (skip the daily calendar alignment)')
+    parser.add_argument('--csv', help='Write the unified CSV to this path')
+    parser.add_argument('--processed-dir', help='Write the data/processed layout to this directory')
+    args = parser.parse_args()
+
+    print("🧪 SYNTHETIC EPIDEMIC DATA GENERATOR")
+    print("=" * 50)
+
+    generator = SyntheticEpidemicGenerator(
+        n_diseases=args.diseases, n_countries=args.countries, n_subnational=args.subnational,
+        years=args.years, start_date=args.start_date, seed=args.seed
+    )
+    data = generator.generate(align=not args.raw)
+
+    if args.csv:
+        generator.save_csv(data, args.csv)
+    if args.processed_dir:
+        generator.save_processed(data, args.processed_dir)
+    if not args.csv and not args.processed_dir:
+        generator.save_csv(data, "data/synthetic/unified_epidemic_data.csv")
+
+if __name__ == "__main__":
+    main()
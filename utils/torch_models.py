@@ -0,0 +1,23 @@
+"""
+PyTorch models used by the forecasting engine.
+
+Kept separate from utils/forecast_engine.py so torch is only imported the first
+time a PyTorch forecast runs, not on page startup or for exponential smoothing.
+"""
+
+import torch
+import torch.nn as nn
+
+class EpidemicTimeSeriesModel(nn.Module):
+    """PyTorch neural network model for epidemic time series forecasting"""
+    def __init__(self, input_size, hidden_size, output_size):
+        super(EpidemicTimeSeriesModel, self).__init__()
+        self.fc1 = nn.Linear(input_size, hidden_size)
+        self.relu = nn.ReLU()
+        self.fc2 = nn.Linear(hidden_size, output_size)
+
+    def forward(self, x):
+        out = self.fc1(x)
+        out = self.relu(out)
+        out = self.fc2(out)
+        return out
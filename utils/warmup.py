@@ -0,0 +1,156 @@
+"""
+Cold-start warmup for the Streamlit deployment.
+
+Fills the data, aggregate, clustering and forecast caches for the default view of
+each page, so the first visitor after a deploy doesn't pay for data parsing,
+the KMeans fit or forecasting, and reports how long each step took.
+
+Streamlit caches live in the server process, so to serve warm caches the warmup
+has to run in that process: --serve warms up and then starts the app in-process
+(the equivalent of `streamlit run Home.py`, which only starts accepting traffic
+after warmup has finished). Without --serve the steps just run and are timed,
+which also writes any missing precomputed forecasts to the forecast store on disk.
+
+Usage:
+    python utils/warmup.py                      # time the warmup steps
+    python utils/warmup.py --pytorch            # also import torch and train the default PyTorch models
+    python utils/warmup.py --serve --server.port 8501   # warm up, then serve (options go to streamlit run)
+"""
+
+import argparse
+import contextlib
+import importlib
+import logging
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+
+DEFAULT_DISEASE = 'COVID-19'
+DEFAULT_TRENDS_METRIC = 'total_cases'
+
+class WarmupReport:
+    """Runs warmup steps, timing each one and carrying on past failures"""
+
+    def __init__(self, quiet=True):
+        self.quiet = quiet
+        self.steps = []
+
+    def run(self, name, func, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            # The loaders print diagnostics; keep the report readable
+            with contextlib.redirect_stdout(open(os.devnull, 'w')) if self.quiet else contextlib.nullcontext():
+                result = func(*args, **kwargs)
+            error = None
+        except Exception as e:
+            result, error = None, f"{type(e).__name__}: {e}"
+
+        elapsed = time.perf_counter() - start
+        self.steps.append({'step': name, 'seconds': elapsed, 'error': error})
+        status = f"❌ {error}" if error else "✅"
+        print(f"{status} {name}: {elapsed:.2f}s")
+        return result
+
+    @property
+    def failed(self):
+        return [step for step in self.steps if step['error']]
+
+    @property
+    def total_seconds(self):
+        return sum(step['seconds'] for step in self.steps)
+
+def warm_caches(use_pytorch=False, precompute=True, quiet=True):
+    """
+    Populate the caches behind the default view of every page.
+    Returns the WarmupReport with the time taken by each step.
+    """
+    if quiet:
+        # Outside a running server Streamlit warns about bare mode on every cached call.
+        # Config is parsed first, since parsing applies its own log level (`streamlit run`
+        # reparses it when --serve starts the app, restoring the configured level).
+        import streamlit.config
+        import streamlit.logger
+        streamlit.config.get_config_options()
+        streamlit.logger.set_log_level(logging.ERROR)
+
+    from utils.data_loader import (load_epidemic_data, filter_data, load_health_expenditure_data,
+                                   load_epidemic_access_data, get_forecast_store)
+    from utils.health_clustering import get_health_access_clusters, get_yearly_health_access_clusters
+    from utils.forecast_engine import EpidemicForecaster
+
+    report = WarmupReport(quiet)
+
+    # Data: unified epidemic CSV (Trends, Map), health expenditure table and epidemic × access join (Healthcare Access)
+    data, _, _ = report.run("load_epidemic_data", load_epidemic_data) or (None, None, None)
+    health = report.run("load_health_expenditure_data", load_health_expenditure_data)
+    report.run("load_epidemic_access_data", load_epidemic_access_data)
+
+    # Aggregates: the Trends page's default selection (all countries, full date range)
+    filtered = None
+    if data is not None:
+        disease_data = data[data['disease'] == DEFAULT_DISEASE]
+        date_range = (disease_data['date'].min().date(), disease_data['date'].max().date())
+        filtered = report.run("filter_data", filter_data, data, DEFAULT_DISEASE, [], date_range)
+
+    # Clustering: KMeans fit and per-year clusters for the Healthcare Access page
+    if health is not None and health[0] is not None:
+        report.run("get_health_access_clusters", get_health_access_clusters, health[0])
+        report.run("get_yearly_health_access_clusters", get_yearly_health_access_clusters, health[1])
+
+    # Forecasts: the default view is served from the forecast store
+    store = report.run("get_forecast_store", get_forecast_store)
+    if store is not None and data is not None:
+        if precompute and not store.has(DEFAULT_DISEASE, DEFAULT_TRENDS_METRIC):
+            report.run("precompute_forecasts", store.precompute, data, [DEFAULT_DISEASE], [DEFAULT_TRENDS_METRIC])
+        report.run("load_forecast_store", store.load, DEFAULT_DISEASE, DEFAULT_TRENDS_METRIC)
+
+    if use_pytorch:
+        report.run("import_torch", importlib.import_module, 'torch')
+        if filtered is not None:
+            # Train the default chart countries so the PyTorch model cache is warm
+            countries = list(filtered['country'].unique()[:5])
+            report.run("pytorch_models", EpidemicForecaster().batch_forecast, filtered, DEFAULT_DISEASE, countries,
+                       DEFAULT_TRENDS_METRIC, True, True)
+
+    return report
+
+def serve(streamlit_args):
+    """Start the Streamlit app in this process so it shares the warmed caches"""
+    from streamlit.web import cli as stcli
+
+    print("🚀 Starting Streamlit with warm caches...")
+    # Same as `streamlit run Home.py [options]`, but in this (warm) process
+    sys.argv = ['streamlit', 'run', os.path.join(REPO_ROOT, 'Home.py')] + list(streamlit_args)
+    return stcli.main()
+
+def main():
+    """Warm the caches for the default views and optionally start the app"""
+    parser = argparse.ArgumentParser(description="Warm the dashboard caches before serving traffic")
+    parser.add_argument('--pytorch', action='store_true', help='Also import torch and train the default PyTorch models')
+    parser.add_argument('--no-precompute', action='store_true', help="Don't write missing default forecasts to the forecast store")
+    parser.add_argument('--verbose', action='store_true', help='Show the output of the warmed functions')
+    parser.add_argument('--serve', action='store_true', help='Start the Streamlit app in this process once warm')
+    args, streamlit_args = parser.parse_known_args()
+
+    # Loaders use paths relative to the app root
+    os.chdir(REPO_ROOT)
+
+    print("🔥 CACHE WARMUP")
+    print("=" * 50)
+
+    report = warm_caches(args.pytorch, not args.no_precompute, not args.verbose)
+    print(f"\n⏱️ Warmup finished in {report.total_seconds:.2f}s")
+
+    if args.serve:
+        return serve(streamlit_args)
+
+    if report.failed:
+        print(f"⚠️ {len(report.failed)} warmup steps failed")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())